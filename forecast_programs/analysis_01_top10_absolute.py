@@ -5,7 +5,7 @@ Menghitung top 10 kabupaten dengan peningkatan traffic ABSOLUT tertinggi
 (dalam TB) berdasarkan hasil forecast individual per kabupaten.
 
 Input:
-  - forecast_results/04_kabupaten/[kabupaten]_forecast.csv (119 files)
+  - forecast_results/forecast_store/kabupaten.parquet (forecast semua kabupaten)
   - Traffic_VLR_Java_2024-2025.xlsx
 
 Output:
@@ -22,86 +22,30 @@ import pandas as pd
 import numpy as np
 from pathlib import Path
 
+from forecast_core import load_cube
+from forecast_core.summary import growth_summary
+
+SUMMARY_COLUMNS = ['Kabupaten', 'Region', 'Province', 'Historical_Avg', 'Historical_Total',
+                   'Forecast_Avg', 'Forecast_Total', 'Change_Avg_TB', 'Change_Total_TB',
+                   'Growth_Rate', 'Data_Days']
+
 def load_kabupaten_forecast_data():
-    """Load historical dan forecast data untuk setiap kabupaten"""
+    """Ringkasan historis + forecast semua kabupaten (satu join ter-vektorisasi)"""
     
     print("\n📂 Membaca data forecast per kabupaten...")
     
-    forecast_dir = Path("forecast_results/04_kabupaten")
+    # Statistik historis per kabupaten dari cube ⋈ statistik forecast dari store
+    df = growth_summary(load_cube(), 'kabupaten')
     
-    if not forecast_dir.exists():
-        print("❌ Error: Folder forecast_kabupaten tidak ditemukan!")
-        print("💡 Jalankan '1d_run_forecast_by_kabupaten.py' terlebih dahulu")
+    if len(df) == 0:
+        print("❌ Error: Forecast kabupaten tidak ditemukan di forecast store!")
+        print("💡 Jalankan 'forecast_04_by_kabupaten.py' terlebih dahulu")
         return None
     
-    # Get all CSV files
-    csv_files = list(forecast_dir.glob("*.csv"))
-    
-    if len(csv_files) == 0:
-        print("❌ Error: Tidak ada file forecast ditemukan!")
-        print("💡 Jalankan '1d_run_forecast_by_kabupaten.py' terlebih dahulu")
-        return None
-    
-    print(f"✓ Ditemukan {len(csv_files)} file forecast kabupaten")
-    
-    # Load original data for historical
-    df = pd.read_excel("Traffic_VLR_Java_2024-2025.xlsx", sheet_name=0)
-    df['Date'] = pd.to_datetime(df['Date'])
-    
-    kabupaten_summary = []
+    print(f"✓ Ditemukan forecast {len(df)} kabupaten")
     
-    for csv_file in csv_files:
-        kabupaten_name = csv_file.stem.replace('_', ' ').upper()
-        
-        # Load forecast
-        df_forecast = pd.read_csv(csv_file)
-        fore_mean = df_forecast['Traffic_Total(TB)'].mean()
-        fore_total = df_forecast['Traffic_Total(TB)'].sum()
-        
-        # Get historical data
-        df_kab = df[df['KABUPATEN IOH'] == kabupaten_name].copy()
-        
-        if len(df_kab) == 0:
-            # Try original case
-            for kab in df['KABUPATEN IOH'].unique():
-                if kab.lower().replace(' ', '_') == csv_file.stem:
-                    df_kab = df[df['KABUPATEN IOH'] == kab].copy()
-                    kabupaten_name = kab
-                    break
-        
-        if len(df_kab) > 0:
-            # Get region and province
-            region = df_kab['REGION IOH'].iloc[0]
-            province = df_kab['PROVINCE'].iloc[0]
-            
-            # Calculate historical stats
-            daily_data = df_kab.groupby('Date')['Traffic_Total(TB)'].sum()
-            hist_mean = daily_data.mean()
-            hist_total = daily_data.sum()
-            hist_std = daily_data.std()
-            
-            # Calculate changes (ABSOLUT)
-            change_avg = fore_mean - hist_mean
-            change_total = fore_total - hist_total
-            growth_rate = (change_avg / hist_mean) * 100 if hist_mean > 0 else 0
-            
-            kabupaten_summary.append({
-                'Kabupaten': kabupaten_name,
-                'Region': region,
-                'Province': province,
-                'Historical_Avg': hist_mean,
-                'Historical_Total': hist_total,
-                'Forecast_Avg': fore_mean,
-                'Forecast_Total': fore_total,
-                'Change_Avg_TB': change_avg,  # Absolut change per hari
-                'Change_Total_TB': change_total,  # Absolut change total
-                'Growth_Rate': growth_rate,
-                'Data_Days': len(daily_data)
-            })
-    
-    df_summary = pd.DataFrame(kabupaten_summary)
-    
-    return df_summary
+    return df.rename(columns={'Name': 'Kabupaten', 'Change_Avg': 'Change_Avg_TB',
+                              'Change_Total': 'Change_Total_TB'})[SUMMARY_COLUMNS]
 
 def create_visualization_top10(df_top10, output_file):
     """Create visualization untuk top 10 kabupaten"""
@@ -253,9 +197,9 @@ def main():
     
     print(f"\n✓ Berhasil memproses {len(df_summary)} kabupaten")
     
-    # Sort by absolute change (descending)
-    df_sorted = df_summary.sort_values('Change_Avg_TB', ascending=False)
-    df_top10 = df_sorted.head(10)
+    # Ranking by absolute change: top-N via nlargest, urutan lengkap untuk sheet All
+    df_top10 = df_summary.nlargest(10, 'Change_Avg_TB')
+    df_top10_pct = df_summary.nlargest(10, 'Growth_Rate')
     
     # Display results
     print("\n" + "="*80)
@@ -300,21 +244,21 @@ def main():
         df_top10.to_excel(writer, sheet_name='Top 10 Absolute', index=False)
         
         # Top 20 by absolute change
-        df_top20 = df_sorted.head(20)
+        df_top20 = df_summary.nlargest(20, 'Change_Avg_TB')
         df_top20.to_excel(writer, sheet_name='Top 20 Absolute', index=False)
         
         # Top 10 by percentage (for comparison)
-        df_top10_pct = df_summary.nlargest(10, 'Growth_Rate')
         df_top10_pct.to_excel(writer, sheet_name='Top 10 Percentage', index=False)
         
         # All kabupaten sorted by absolute change
-        df_sorted.to_excel(writer, sheet_name='All Kabupaten', index=False)
+        df_summary.sort_values('Change_Avg_TB', ascending=False).to_excel(
+            writer, sheet_name='All Kabupaten', index=False)
         
         # Summary comparison
         comparison_data = []
         
         # Top 10 Absolute
-        top10_abs = df_sorted.head(10)
+        top10_abs = df_top10
         comparison_data.append({
             'Metric': 'Top 10 by Absolute Change',
             'Total_Change_TB': top10_abs['Change_Avg_TB'].sum(),
@@ -325,7 +269,7 @@ def main():
         })
         
         # Top 10 Percentage
-        top10_pct = df_summary.nlargest(10, 'Growth_Rate')
+        top10_pct = df_top10_pct
         comparison_data.append({
             'Metric': 'Top 10 by Growth Rate %',
             'Total_Change_TB': top10_pct['Change_Avg_TB'].sum(),
@@ -5,7 +5,7 @@ Menghitung top 10 kabupaten dengan peningkatan traffic tertinggi
 berdasarkan growth rate dari forecast regional masing-masing.
 
 Input:
-  - forecast_results/02_regional/*.csv (3 files)
+  - forecast_results/forecast_store/regional.parquet (forecast semua regional)
   - Traffic_VLR_Java_2024-2025.xlsx
 
 Output:
@@ -14,96 +14,52 @@ Output:
 Fungsi:
   - Gunakan % peningkatan dari forecast regional untuk proyeksi
   - Ranking berdasarkan % peningkatan tertinggi
-  - Pengelompokan berdasarkan regional
+  - Pengelompokan berdasarkan regional (jumlah regional mengikuti data)
 """
 
 import pandas as pd
-import numpy as np
 from pathlib import Path
 
-def get_regional_growth_rates():
-    """Get growth rates dari hasil forecast regional"""
-    
-    regional_data = {}
-    regional_dir = Path("forecast_results/02_regional")
-    
-    # Load data untuk setiap regional
-    regions = ['BALI NUSRA', 'CENTRAL JAVA', 'EAST JAVA']
-    
-    for region in regions:
-        # Load historical
-        df = pd.read_excel("Traffic_VLR_Java_2024-2025.xlsx", sheet_name=0)
-        df['Date'] = pd.to_datetime(df['Date'])
-        
-        df_region = df[df['REGION IOH'] == region].copy()
-        daily_historical = df_region.groupby('Date')['Traffic_Total(TB)'].sum()
-        hist_mean = daily_historical.mean()
-        
-        # Load forecast
-        forecast_file = regional_dir / f"{region.lower().replace(' ', '_')}.csv"
-        if forecast_file.exists():
-            df_forecast = pd.read_csv(forecast_file)
-            fore_mean = df_forecast['Traffic_Total(TB)'].mean()
-            
-            # Calculate growth rate
-            growth_rate = ((fore_mean - hist_mean) / hist_mean) * 100
-            
-            regional_data[region] = {
-                'historical_mean': hist_mean,
-                'forecast_mean': fore_mean,
-                'growth_rate': growth_rate
-            }
-            
-            print(f"{region:15} : {growth_rate:+.2f}% growth")
-    
-    return regional_data
+from forecast_core import load_cube
+from forecast_core.summary import growth_summary, historical_summary, node_ancestors
 
-def calculate_kabupaten_projections(regional_data):
+def get_regional_growth_rates(cube):
+    """
+    Growth rate semua regional yang punya forecast (jumlah regional
+    mengikuti data): rata-rata historis harian dari cube ⋈ rata-rata
+    forecast dari results store.
+    """
+    
+    regional_df = (growth_summary(cube, 'regional')
+                   .rename(columns={'Name': 'Region', 'Historical_Avg': 'Historical_Mean',
+                                    'Forecast_Avg': 'Forecast_Mean'})
+                   [['Region', 'Historical_Mean', 'Forecast_Mean', 'Growth_Rate']])
+    
+    for region, growth_rate in zip(regional_df['Region'], regional_df['Growth_Rate']):
+        print(f"{region:15} : {growth_rate:+.2f}% growth")
+    
+    return regional_df
+
+def calculate_kabupaten_projections(cube, regional_df):
     """Calculate proyeksi untuk setiap kabupaten berdasarkan regional growth"""
     
     print("\n" + "="*80)
     print("Menghitung proyeksi per kabupaten...")
     print("="*80)
     
-    # Load data
-    df = pd.read_excel("Traffic_VLR_Java_2024-2025.xlsx", sheet_name=0)
-    df['Date'] = pd.to_datetime(df['Date'])
+    # Historical per kabupaten dari cube (hanya kabupaten yang punya data)
+    history = historical_summary(cube, 'kabupaten')
+    kabupaten_stats = (node_ancestors(cube, 'kabupaten')[['Name', 'Region']]
+                       .merge(history[history['Data_Days'] > 0], on='Name'))
     
-    # Calculate historical average per kabupaten
-    kabupaten_summary = []
+    # Satu merge dengan growth rate regional (kabupaten tanpa forecast regional dilewati)
+    df_summary = (kabupaten_stats.rename(columns={'Name': 'Kabupaten'})
+                  .merge(regional_df[['Region', 'Growth_Rate']], on='Region', how='inner', sort=False))
+    df_summary['Forecast_Avg'] = df_summary['Historical_Avg'] * (1 + df_summary['Growth_Rate'] / 100)
+    df_summary['Change'] = df_summary['Forecast_Avg'] - df_summary['Historical_Avg']
     
-    for kabupaten in df['KABUPATEN IOH'].unique():
-        df_kab = df[df['KABUPATEN IOH'] == kabupaten].copy()
-        
-        # Get region
-        region = df_kab['REGION IOH'].iloc[0]
-        
-        # Calculate historical stats
-        daily_data = df_kab.groupby('Date')['Traffic_Total(TB)'].sum()
-        hist_mean = daily_data.mean()
-        hist_total = daily_data.sum()
-        
-        # Get regional growth rate
-        if region in regional_data:
-            growth_rate = regional_data[region]['growth_rate']
-            
-            # Calculate forecast
-            fore_mean = hist_mean * (1 + growth_rate / 100)
-            change = fore_mean - hist_mean
-            
-            kabupaten_summary.append({
-                'Kabupaten': kabupaten,
-                'Region': region,
-                'Historical_Avg': hist_mean,
-                'Forecast_Avg': fore_mean,
-                'Change': change,
-                'Growth_Rate': growth_rate,
-                'Historical_Total': hist_total
-            })
-    
-    df_summary = pd.DataFrame(kabupaten_summary)
-    
-    return df_summary
+    return df_summary[['Kabupaten', 'Region', 'Historical_Avg', 'Forecast_Avg', 'Change',
+                       'Growth_Rate', 'Historical_Total']]
 
 def main():
     """Main function"""
@@ -115,13 +71,21 @@ def main():
     # Get regional growth rates
     print("📊 Regional Growth Rates:")
     print("-" * 80)
-    regional_data = get_regional_growth_rates()
+    cube = load_cube()
+    regional_df = get_regional_growth_rates(cube)
+    
+    if len(regional_df) == 0:
+        print("❌ Error: Forecast regional tidak ditemukan di forecast store!")
+        print("💡 Jalankan 'forecast_03_by_regional.py' terlebih dahulu")
+        return
     
     # Calculate per kabupaten
-    df_summary = calculate_kabupaten_projections(regional_data)
+    df_summary = calculate_kabupaten_projections(cube, regional_df)
     
-    # Sort by growth rate (descending)
-    df_top10 = df_summary.nlargest(10, 'Growth_Rate')
+    # Sort by growth rate (descending); satu regional = growth rate sama,
+    # jadi urutan di dalamnya ditentukan oleh perubahan absolut
+    df_sorted = df_summary.sort_values(['Growth_Rate', 'Change'], ascending=False)
+    df_top10 = df_sorted.head(10)
     
     # Display results
     print("\n" + "="*80)
@@ -145,19 +109,9 @@ def main():
         df_top10.to_excel(writer, sheet_name='Top 10', index=False)
         
         # All kabupaten sorted
-        df_sorted = df_summary.sort_values('Growth_Rate', ascending=False)
         df_sorted.to_excel(writer, sheet_name='All Kabupaten', index=False)
         
         # Regional summary
-        regional_df = pd.DataFrame([
-            {
-                'Region': region,
-                'Historical_Mean': data['historical_mean'],
-                'Forecast_Mean': data['forecast_mean'],
-                'Growth_Rate': data['growth_rate']
-            }
-            for region, data in regional_data.items()
-        ])
         regional_df.to_excel(writer, sheet_name='Regional Growth', index=False)
     
     print("\n" + "="*80)
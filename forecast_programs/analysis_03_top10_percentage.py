@@ -5,7 +5,7 @@ Menghitung top 10 kabupaten dengan peningkatan traffic tertinggi
 berdasarkan hasil forecast individual masing-masing kabupaten.
 
 Input:
-  - forecast_results/04_kabupaten/[kabupaten]_forecast.csv (119 files)
+  - forecast_results/forecast_store/kabupaten.parquet (forecast semua kabupaten)
   - Traffic_VLR_Java_2024-2025.xlsx
 
 Output:
@@ -23,85 +23,29 @@ import pandas as pd
 import numpy as np
 from pathlib import Path
 
+from forecast_core import load_cube
+from forecast_core.summary import growth_summary
+
+SUMMARY_COLUMNS = ['Kabupaten', 'Region', 'Province', 'Historical_Avg', 'Historical_Std',
+                   'Forecast_Avg', 'Change_Avg', 'Growth_Rate', 'Historical_Total',
+                   'Forecast_Total', 'Data_Days']
+
 def load_kabupaten_forecast_data():
-    """Load historical dan forecast data untuk setiap kabupaten"""
+    """Ringkasan historis + forecast semua kabupaten (satu join ter-vektorisasi)"""
     
     print("\n📂 Membaca data forecast per kabupaten...")
     
-    forecast_dir = Path("forecast_results/04_kabupaten")
+    # Statistik historis per kabupaten dari cube ⋈ statistik forecast dari store
+    df = growth_summary(load_cube(), 'kabupaten')
     
-    if not forecast_dir.exists():
-        print("❌ Error: Folder forecast_kabupaten tidak ditemukan!")
-        print("💡 Jalankan '1d_run_forecast_by_kabupaten.py' terlebih dahulu")
+    if len(df) == 0:
+        print("❌ Error: Forecast kabupaten tidak ditemukan di forecast store!")
+        print("💡 Jalankan 'forecast_04_by_kabupaten.py' terlebih dahulu")
         return None
     
-    # Get all CSV files
-    csv_files = list(forecast_dir.glob("*.csv"))
-    
-    if len(csv_files) == 0:
-        print("❌ Error: Tidak ada file forecast ditemukan!")
-        print("💡 Jalankan '1d_run_forecast_by_kabupaten.py' terlebih dahulu")
-        return None
-    
-    print(f"✓ Ditemukan {len(csv_files)} file forecast kabupaten")
-    
-    # Load original data for historical
-    df = pd.read_excel("Traffic_VLR_Java_2024-2025.xlsx", sheet_name=0)
-    df['Date'] = pd.to_datetime(df['Date'])
-    
-    kabupaten_summary = []
+    print(f"✓ Ditemukan forecast {len(df)} kabupaten")
     
-    for csv_file in csv_files:
-        kabupaten_name = csv_file.stem.replace('_', ' ').upper()
-        
-        # Load forecast
-        df_forecast = pd.read_csv(csv_file)
-        fore_mean = df_forecast['Traffic_Total(TB)'].mean()
-        fore_total = df_forecast['Traffic_Total(TB)'].sum()
-        
-        # Get historical data
-        df_kab = df[df['KABUPATEN IOH'] == kabupaten_name].copy()
-        
-        if len(df_kab) == 0:
-            # Try original case
-            for kab in df['KABUPATEN IOH'].unique():
-                if kab.lower().replace(' ', '_') == csv_file.stem:
-                    df_kab = df[df['KABUPATEN IOH'] == kab].copy()
-                    kabupaten_name = kab
-                    break
-        
-        if len(df_kab) > 0:
-            # Get region and province
-            region = df_kab['REGION IOH'].iloc[0]
-            province = df_kab['PROVINCE'].iloc[0]
-            
-            # Calculate historical stats
-            daily_data = df_kab.groupby('Date')['Traffic_Total(TB)'].sum()
-            hist_mean = daily_data.mean()
-            hist_total = daily_data.sum()
-            hist_std = daily_data.std()
-            
-            # Calculate changes
-            change = fore_mean - hist_mean
-            growth_rate = (change / hist_mean) * 100 if hist_mean > 0 else 0
-            
-            kabupaten_summary.append({
-                'Kabupaten': kabupaten_name,
-                'Region': region,
-                'Province': province,
-                'Historical_Avg': hist_mean,
-                'Historical_Std': hist_std,
-                'Forecast_Avg': fore_mean,
-                'Change_Avg': change,
-                'Growth_Rate': growth_rate,
-                'Historical_Total': hist_total,
-                'Forecast_Total': fore_total,
-                'Data_Days': len(daily_data)
-            })
-    
-    df_summary = pd.DataFrame(kabupaten_summary)
-    
-    return df_summary
+    return df.rename(columns={'Name': 'Kabupaten'})[SUMMARY_COLUMNS]
 
 def create_visualization_top10(df_top10, output_file):
     """Create visualization untuk top 10 kabupaten"""
@@ -247,9 +191,8 @@ def main():
     
     print(f"\n✓ Berhasil memproses {len(df_summary)} kabupaten")
     
-    # Sort by growth rate (descending)
-    df_sorted = df_summary.sort_values('Growth_Rate', ascending=False)
-    df_top10 = df_sorted.head(10)
+    # Ranking by growth rate: top-N via nlargest, urutan lengkap untuk sheet All
+    df_top10 = df_summary.nlargest(10, 'Growth_Rate')
     
     # Display results
     print("\n" + "="*80)
@@ -281,11 +224,12 @@ def main():
         df_top10.to_excel(writer, sheet_name='Top 10', index=False)
         
         # Top 20
-        df_top20 = df_sorted.head(20)
+        df_top20 = df_summary.nlargest(20, 'Growth_Rate')
         df_top20.to_excel(writer, sheet_name='Top 20', index=False)
         
         # All kabupaten sorted
-        df_sorted.to_excel(writer, sheet_name='All Kabupaten', index=False)
+        df_summary.sort_values('Growth_Rate', ascending=False).to_excel(
+            writer, sheet_name='All Kabupaten', index=False)
         
         # Regional summary
         regional_summary = df_summary.groupby('Region').agg({
@@ -0,0 +1,78 @@
+"""
+ANALYSIS BACKTEST - AKURASI FORECAST
+=====================================
+Mengukur akurasi ensemble forecast (MA + WMA + ES) dengan rolling-origin
+backtest atas history 2024-2025 untuk semua level hierarki sekaligus.
+
+Input:
+  - Traffic_VLR_Java_2024-2025.xlsx
+
+Output:
+  - forecast_results/05_analysis/backtest_metrics.csv
+    (MAPE, sMAPE, bias, coverage per series × horizon)
+  - forecast_results/05_analysis/backtest_summary.csv (rata-rata per level)
+
+Fungsi:
+  - Forecast ulang dari setiap origin harian (training = data sebelum origin)
+  - Bandingkan forecast 1-75 hari ke depan dengan data aktual
+  - Ringkasan akurasi per level (total, regional, provinsi, kabupaten)
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+from forecast_core import load_cube
+from forecast_core.backtest import backtest_origins, rolling_origin_backtest, summarize_backtest
+
+OUTPUT_DIR = Path("forecast_results/05_analysis")
+
+def main(horizon=75, min_train=60, step=1):
+    """Main function"""
+    print("="*80)
+    print("  BACKTEST AKURASI FORECAST (ROLLING ORIGIN)")
+    print("="*80)
+
+    print("\nMembaca data...")
+    cube = load_cube()
+    n_origins = len(backtest_origins(len(cube.dates), min_train, step))
+    print(f"  {len(cube.nodes)} series × {n_origins} origin × {horizon} hari horizon")
+
+    start = time.perf_counter()
+    metrics = rolling_origin_backtest(cube, horizon=horizon, min_train=min_train, step=step)
+    summary = summarize_backtest(metrics)
+    print(f"  Backtest selesai dalam {time.perf_counter() - start:.1f} detik")
+
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    metrics_file = OUTPUT_DIR / "backtest_metrics.csv"
+    summary_file = OUTPUT_DIR / "backtest_summary.csv"
+    metrics.to_csv(metrics_file, index=False, float_format='%.4f')
+    summary.to_csv(summary_file, index=False, float_format='%.4f')
+
+    print("\n" + "="*80)
+    print("  RINGKASAN AKURASI PER LEVEL")
+    print("="*80)
+    print(f"\n{'Level':<12} {'Series':>7} {'MAPE':>9} {'sMAPE':>9} {'Bias':>9} {'Coverage':>10}")
+    print("-"*80)
+    for _, row in summary.iterrows():
+        print(f"{row['Level']:<12} {row['Series']:>7} {row['MAPE']:>8.2f}% {row['sMAPE']:>8.2f}% "
+              f"{row['Bias']:>+8.2f}% {row['Coverage']:>9.1f}%")
+
+    print("\n" + "="*80)
+    print("✅ SELESAI!")
+    print("="*80)
+    print(f"\nHasil disimpan:")
+    print(f"  - {metrics_file}")
+    print(f"  - {summary_file}")
+    print("\n" + "="*80)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rolling-origin backtest semua level forecast")
+    parser.add_argument('--horizon', type=int, default=75,
+                        help="Panjang horizon forecast per origin (default: 75 hari)")
+    parser.add_argument('--min-train', type=int, default=60,
+                        help="Jumlah hari history minimum sebelum origin pertama (default: 60)")
+    parser.add_argument('--step', type=int, default=1,
+                        help="Jarak antar origin dalam hari (default: 1)")
+    args = parser.parse_args()
+    main(horizon=args.horizon, min_train=args.min_train, step=args.step)
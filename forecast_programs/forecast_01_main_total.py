@@ -11,38 +11,36 @@ Output:
   - forecast_results/01_main/forecast_data.csv
   - forecast_results/01_main/forecast_results.xlsx
   - forecast_results/01_main/comparison_statistics_2025_vs_2026.csv
+  - forecast_results/forecast_store/total.parquet (store kolumnar)
 
 Fungsi:
   - Forecast total traffic gabungan semua provinsi
   - Analisis perbandingan statistik 2025 vs 2026
 """
 
+import argparse
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 from pathlib import Path
 import warnings
+
+from forecast_core import TOTAL_NAME, entity_key, forecast, level_event_options, load_cube
+from forecast_core.engine import grouped_components
+from forecast_core.params import node_params
+from forecast_core.results import write_results
+
 warnings.filterwarnings('ignore')
 
-# Set random seed untuk hasil yang konsisten
-np.random.seed(42)
+TARGET_DATE = pd.Timestamp('2026-01-05')
+DEFAULT_HORIZON = 75  # sama dengan forecast provinsi/regional/kabupaten
 
 def load_and_prepare_data(filename):
     """Load dan prepare data untuk forecasting"""
     print("📂 Membaca data...")
-    df = pd.read_excel(filename, sheet_name=0)
-    df['Date'] = pd.to_datetime(df['Date'])
-    
-    # Agregasi harian
-    daily_data = df.groupby('Date').agg({
-        'Traffic_H3I (TB)': 'sum',
-        'Traffic_IM3 (TB)': 'sum',
-        'Traffic_Total(TB)': 'sum',
-        'VLR_3ID_subs': 'sum',
-        'VLR_IM3_subs': 'sum'
-    }).reset_index()
     
-    daily_data = daily_data.sort_values('Date').reset_index(drop=True)
+    # Agregasi harian (node total dari cube hierarki)
+    daily_data = load_cube(filename).daily_frame('total', TOTAL_NAME)
     
     print(f"✓ Data dimuat: {len(daily_data)} hari")
     print(f"  Dari: {daily_data['Date'].min().strftime('%d %B %Y')}")
@@ -133,117 +131,27 @@ def analyze_new_year_pattern(df):
         'pattern_data': None
     }
 
-def moving_average_forecast(df, window=7):
-    """Simple Moving Average dengan trend"""
-    recent_data = df.tail(window)['Traffic_Total(TB)'].values
-    ma = np.mean(recent_data)
-    x = np.arange(len(recent_data))
-    coeffs = np.polyfit(x, recent_data, 1)
-    trend = coeffs[0]
-    return ma, trend
-
-def weighted_moving_average(df, window=14):
-    """Weighted Moving Average"""
-    recent_data = df.tail(window)['Traffic_Total(TB)'].values
-    weights = np.exp(np.linspace(-1, 0, window))
-    weights = weights / weights.sum()
-    wma = np.sum(recent_data * weights)
-    x = np.arange(len(recent_data))
-    coeffs = np.polyfit(x, recent_data, 1)
-    trend = coeffs[0]
-    return wma, trend
-
-def exponential_smoothing(df, alpha=0.3):
-    """Exponential Smoothing"""
-    data = df['Traffic_Total(TB)'].values
-    smoothed = [data[0]]
-    for i in range(1, len(data)):
-        smoothed.append(alpha * data[i] + (1 - alpha) * smoothed[i-1])
-    recent_smooth = smoothed[-30:]
-    x = np.arange(len(recent_smooth))
-    coeffs = np.polyfit(x, recent_smooth, 1)
-    trend = coeffs[0]
-    return smoothed[-1], trend
-
-def create_forecast(df, ny_pattern, forecast_days=71):
-    """Buat forecast dengan event-based logic"""
+def create_forecast(df, ny_pattern, forecast_days=71, intervals='fixed'):
+    """Buat forecast dengan event-based logic (engine bersama forecast_core)"""
     print("\n📊 Membuat forecast dengan New Year Pattern...")
     
-    last_date = df['Date'].max()
-    forecast_dates = pd.date_range(start=last_date + timedelta(days=1), 
-                                   periods=forecast_days, freq='D')
-    
-    # Ensemble forecasting
-    ma_base, ma_trend = moving_average_forecast(df, window=7)
-    wma_base, wma_trend = weighted_moving_average(df, window=14)
-    es_base, es_trend = exponential_smoothing(df, alpha=0.3)
-    
-    base_value = (ma_base + wma_base + es_base) / 3
-    trend = (ma_trend + wma_trend + es_trend) / 3
-    baseline = ny_pattern.get('baseline', base_value)
+    # Komponen ensemble (MA + WMA + ES) untuk ringkasan, dengan parameter
+    # node total yang sama dengan forecast (hasil tuning jika ada)
+    params = node_params([entity_key('total', TOTAL_NAME)])
+    base_value, trend = grouped_components(df['Traffic_Total(TB)'].values[np.newaxis, :], params)
+    baseline = ny_pattern.get('baseline', base_value[0])
     
-    print(f"  ✓ Base value: {base_value:.2f} TB")
+    print(f"  ✓ Base value: {base_value[0]:.2f} TB")
     print(f"  ✓ Baseline normal: {baseline:.2f} TB")
-    print(f"  ✓ Trend: {trend:.4f} TB/hari")
+    print(f"  ✓ Trend: {trend[0]:.4f} TB/hari")
     print(f"  ✓ NYE ratio (31 Des): {ny_pattern.get('nye_ratio', 1.03):.2f}x")
     print(f"  ✓ NY ratio (1 Jan): {ny_pattern.get('ny_ratio', 1.09):.2f}x")
     
-    # Event Calendar - gunakan faktor dari pattern analysis
-    daily_patterns = ny_pattern.get('daily_pattern', {})
-    ny_event_factors = {
-        pd.Timestamp('2025-12-25'): daily_patterns.get(pd.Timestamp('2024-12-25'), {}).get('factor', 1.01),
-        pd.Timestamp('2025-12-26'): daily_patterns.get(pd.Timestamp('2024-12-26'), {}).get('factor', 1.02),
-        pd.Timestamp('2025-12-27'): daily_patterns.get(pd.Timestamp('2024-12-27'), {}).get('factor', 1.01),
-        pd.Timestamp('2025-12-28'): daily_patterns.get(pd.Timestamp('2024-12-28'), {}).get('factor', 1.04),
-        pd.Timestamp('2025-12-29'): daily_patterns.get(pd.Timestamp('2024-12-29'), {}).get('factor', 1.06),
-        pd.Timestamp('2025-12-30'): daily_patterns.get(pd.Timestamp('2024-12-30'), {}).get('factor', 1.00),
-        pd.Timestamp('2025-12-31'): ny_pattern.get('nye_ratio', 1.03),
-        pd.Timestamp('2026-01-01'): ny_pattern.get('ny_ratio', 1.09),
-        pd.Timestamp('2026-01-02'): daily_patterns.get(pd.Timestamp('2025-01-02'), {}).get('factor', 0.96),
-        pd.Timestamp('2026-01-03'): daily_patterns.get(pd.Timestamp('2025-01-03'), {}).get('factor', 0.95),
-        pd.Timestamp('2026-01-04'): daily_patterns.get(pd.Timestamp('2025-01-04'), {}).get('factor', 0.97),
-        pd.Timestamp('2026-01-05'): daily_patterns.get(pd.Timestamp('2025-01-05'), {}).get('factor', 0.99),
-        pd.Timestamp('2026-01-06'): daily_patterns.get(pd.Timestamp('2025-01-06'), {}).get('factor', 0.91),
-        pd.Timestamp('2026-01-07'): daily_patterns.get(pd.Timestamp('2025-01-07'), {}).get('factor', 0.90),
-    }
-    
-    # Generate forecast
-    forecast_values = []
-    
-    for i, date in enumerate(forecast_dates):
-        if date in ny_event_factors:
-            base_forecast = baseline
-        else:
-            smoothed_trend = trend * 0.5
-            base_forecast = base_value + (smoothed_trend * i)
-        
-        # Weekly seasonality
-        day_of_week = date.dayofweek
-        weekly_factor = 1.05 if day_of_week in [4, 5, 6] else 1.0
-        
-        # Event factor
-        ny_factor = ny_event_factors.get(date, 1.0)
-        
-        # Combine factors
-        forecast = base_forecast * weekly_factor * ny_factor
-        
-        # Add noise (dengan random seed, hasilnya akan konsisten)
-        noise_level = 0.01 if ny_factor > 1.0 else 0.02
-        noise = np.random.normal(0, base_forecast * noise_level)
-        forecast += noise
-        forecast = max(forecast, 0)
-        
-        forecast_values.append(forecast)
-    
-    # Buat DataFrame
-    forecast_df = pd.DataFrame({
-        'Date': forecast_dates,
-        'Traffic_Total(TB)': forecast_values,
-        'Type': 'Forecast'
-    })
-    
-    forecast_df['Lower_Bound'] = forecast_df['Traffic_Total(TB)'] * 0.9
-    forecast_df['Upper_Bound'] = forecast_df['Traffic_Total(TB)'] * 1.1
+    # Hari event: baseline normal 1-24 Des × faktor tanggal yang sama tahun lalu
+    # Noise dari stream random node total (seed tetap, hasil konsisten)
+    forecast_df = forecast('total', horizon=forecast_days, intervals=intervals,
+                           **level_event_options('total'))[TOTAL_NAME]
+    forecast_df.insert(2, 'Type', 'Forecast')
     
     return forecast_df
 
@@ -324,6 +232,18 @@ def create_comparison_statistics(historical_df, forecast_df, ny_pattern, output_
     
     return comparison_df
 
+def confidence_interval_label(forecast_df):
+    """Keterangan interval forecast: ±10% tetap, atau quantile bootstrap yang dipakai"""
+    quantile_columns = [column for column in forecast_df.columns
+                        if column.startswith('P') and column[1:].replace('.', '').isdigit()]
+    if not quantile_columns:
+        return '±10%'
+    point = forecast_df['Traffic_Total(TB)']
+    lower = (forecast_df['Lower_Bound'] / point - 1).mean() * 100
+    upper = (forecast_df['Upper_Bound'] / point - 1).mean() * 100
+    return (f"{quantile_columns[0]}-{quantile_columns[-1]} bootstrap "
+            f"(rata-rata {lower:+.1f}% / {upper:+.1f}%)")
+
 def save_forecast_to_excel(historical_df, forecast_df, ny_pattern, output_folder="forecast_results/01_main"):
     """Save hasil forecast ke Excel"""
     print("\n💾 Menyimpan hasil ke Excel...")
@@ -332,7 +252,7 @@ def save_forecast_to_excel(historical_df, forecast_df, ny_pattern, output_folder
     
     with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
         # Forecast Results
-        forecast_export = forecast_df[['Date', 'Traffic_Total(TB)', 'Lower_Bound', 'Upper_Bound']].copy()
+        forecast_export = forecast_df.drop(columns='Type').copy()
         forecast_export['Date'] = forecast_export['Date'].dt.strftime('%Y-%m-%d')
         forecast_export.to_excel(writer, sheet_name='Forecast', index=False)
         
@@ -349,7 +269,7 @@ def save_forecast_to_excel(historical_df, forecast_df, ny_pattern, output_folder
                 'NYE Ratio (31 Des)', 'NY Ratio (1 Jan)', 'Baseline Normal', 'Confidence Interval'
             ],
             'Value': [
-                '23 Okt 2025 - 05 Jan 2026',
+                f"{forecast_df['Date'].min():%d %b %Y} - {forecast_df['Date'].max():%d %b %Y}",
                 len(forecast_df),
                 forecast_df['Date'].min().strftime('%Y-%m-%d'),
                 forecast_df['Date'].max().strftime('%Y-%m-%d'),
@@ -359,7 +279,7 @@ def save_forecast_to_excel(historical_df, forecast_df, ny_pattern, output_folder
                 f"{ny_pattern['nye_ratio']:.2f}x",
                 f"{ny_pattern['ny_ratio']:.2f}x",
                 f"{ny_pattern['baseline']:.2f} TB",
-                '±10%'
+                confidence_interval_label(forecast_df)
             ]
         }
         pd.DataFrame(summary_data).to_excel(writer, sheet_name='Summary', index=False)
@@ -370,8 +290,13 @@ def save_forecast_to_excel(historical_df, forecast_df, ny_pattern, output_folder
     forecast_csv = f"{output_folder}/forecast_data.csv"
     forecast_df.to_csv(forecast_csv, index=False)
     print(f"  ✓ Forecast data CSV: {forecast_csv}")
+    
+    # Store kolumnar (format long, sama untuk semua level)
+    store_path = write_results('total', {TOTAL_NAME: forecast_df.drop(columns='Type')},
+                               replace_all=True)
+    print(f"  ✓ Forecast store: {store_path}")
 
-def main():
+def main(intervals='fixed'):
     """Main function"""
     print("=" * 70)
     print("  PROGRAM 1: TRAFFIC FORECASTING - HINGGA TAHUN BARU 2026")
@@ -394,14 +319,18 @@ def main():
     
     # Forecast
     last_date = df['Date'].max()
-    target_date = pd.Timestamp('2026-01-05')
+    target_date = TARGET_DATE
     forecast_days = (target_date - last_date).days
+    if forecast_days < 1:
+        # Data (misal dari ingest_daily.py) sudah melewati target: horizon default
+        forecast_days = DEFAULT_HORIZON
+        target_date = last_date + timedelta(days=forecast_days)
     
     print(f"\n📅 Periode forecast: {forecast_days} hari")
     print(f"  Dari: {(last_date + timedelta(days=1)).strftime('%d %B %Y')}")
     print(f"  Sampai: {target_date.strftime('%d %B %Y')}")
     
-    forecast_df = create_forecast(df, ny_pattern, forecast_days)
+    forecast_df = create_forecast(df, ny_pattern, forecast_days, intervals)
     
     # Comparison statistics
     comparison_df = create_comparison_statistics(df, forecast_df, ny_pattern)
@@ -435,4 +364,8 @@ def main():
     print("=" * 70)
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Forecast total traffic hingga Tahun Baru 2026")
+    parser.add_argument('--intervals', choices=['fixed', 'bootstrap'], default='fixed',
+                        help="Batas forecast: ±10%% (fixed) atau P5/P50/P95 Monte-Carlo (bootstrap)")
+    args = parser.parse_args()
+    main(intervals=args.intervals)
@@ -0,0 +1,117 @@
+"""
+FORECAST RECONCILIATION - HIERARKI KOHEREN
+==========================================
+Membuat forecast total, regional, provinsi, dan kabupaten koheren
+(parent = jumlah child) dengan tiga metode rekonsiliasi: bottom-up,
+top-down proporsional, dan MinT (WLS, summing matrix sparse).
+
+Input:
+  - Traffic_VLR_Java_2024-2025.xlsx
+  - forecast_results/forecast_store/*.parquet (base forecast semua level,
+    hasil forecast_01..04)
+
+Output:
+  - forecast_results/07_reconciled/forecast_reconciled.csv
+    (base + forecast koheren per node × tanggal untuk setiap metode)
+  - forecast_results/07_reconciled/coherence_summary.csv
+    (selisih base vs jumlah kabupaten dan besar koreksi per level)
+
+Fungsi:
+  - Base forecast semua node (129 series × 75 hari) dari results store
+  - Rekonsiliasi semua horizon sekaligus (satu sparse solve untuk MinT)
+  - Ringkasan inkoherensi base forecast per level
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from forecast_core import LEVELS, load_cube
+from forecast_core.reconcile import BOTTOM_LEVEL, METHODS, reconciled_forecasts, summing_matrix
+
+OUTPUT_DIR = Path("forecast_results/07_reconciled")
+METHOD_COLUMNS = {'bottom_up': 'Bottom_Up', 'top_down': 'Top_Down', 'mint': 'MinT'}
+
+def reconciled_frame(cube, forecast_dates, base, reconciled):
+    """Format long: Level, Name, Date, Base, lalu satu kolom per metode"""
+    n_nodes, horizon = base.shape
+    df = pd.DataFrame({
+        'Level': np.repeat(cube.nodes['level'].to_numpy(), horizon),
+        'Name': np.repeat(cube.nodes['name'].to_numpy(), horizon),
+        'Date': np.tile(forecast_dates, n_nodes),
+        'Base': base.ravel(),
+    })
+    for method, values in reconciled.items():
+        df[METHOD_COLUMNS[method]] = values.ravel()
+    return df
+
+def coherence_summary(cube, base, reconciled):
+    """
+    Per level: rata-rata selisih absolut base forecast terhadap jumlah
+    base kabupaten di bawahnya, dan rata-rata koreksi setiap metode (% base).
+    """
+    S = summing_matrix(cube)
+    bottom_sum = S @ base[cube.level_indices(BOTTOM_LEVEL)]
+    scale = np.where(base != 0, np.abs(base), np.nan)
+
+    rows = []
+    for level in LEVELS:
+        indices = cube.level_indices(level)
+        row = {'Level': level, 'Nodes': len(indices),
+               'Base_vs_Sum_Kabupaten(%)': np.nanmean(
+                   100 * np.abs(bottom_sum[indices] - base[indices]) / scale[indices])}
+        for method, values in reconciled.items():
+            row[f'Koreksi_{METHOD_COLUMNS[method]}(%)'] = np.nanmean(
+                100 * np.abs(values[indices] - base[indices]) / scale[indices])
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+def main(weights='variance'):
+    """Main function"""
+    print("="*80)
+    print("  REKONSILIASI FORECAST HIERARKI (BOTTOM-UP, TOP-DOWN, MINT)")
+    print("="*80)
+
+    print("\nMembaca data...")
+    cube = load_cube()
+
+    start = time.perf_counter()
+    forecast_dates, base, reconciled = reconciled_forecasts(cube, weights=weights)
+    print(f"  {len(cube.nodes)} node × {len(forecast_dates)} hari (bobot MinT: {weights})")
+    print(f"  Rekonsiliasi selesai dalam {time.perf_counter() - start:.1f} detik")
+
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    forecast_file = OUTPUT_DIR / "forecast_reconciled.csv"
+    summary_file = OUTPUT_DIR / "coherence_summary.csv"
+    reconciled_frame(cube, forecast_dates, base, reconciled).to_csv(forecast_file, index=False)
+    summary = coherence_summary(cube, base, reconciled)
+    summary.to_csv(summary_file, index=False, float_format='%.4f')
+
+    print("\n" + "="*80)
+    print("  INKOHERENSI BASE FORECAST & KOREKSI PER METODE")
+    print("="*80)
+    print(f"\n{'Level':<12} {'Node':>6} {'Base vs Σkab':>14} "
+          + " ".join(f"{METHOD_COLUMNS[method]:>10}" for method in METHODS))
+    print("-"*80)
+    for _, row in summary.iterrows():
+        print(f"{row['Level']:<12} {row['Nodes']:>6} {row['Base_vs_Sum_Kabupaten(%)']:>13.2f}% "
+              + " ".join(f"{row[f'Koreksi_{METHOD_COLUMNS[method]}(%)']:>9.2f}%"
+                         for method in METHODS))
+
+    print("\n" + "="*80)
+    print("✅ SELESAI!")
+    print("="*80)
+    print(f"\nHasil disimpan:")
+    print(f"  - {forecast_file}")
+    print(f"  - {summary_file}")
+    print("\n" + "="*80)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rekonsiliasi forecast semua level hierarki")
+    parser.add_argument('--weights', choices=['variance', 'structural'], default='variance',
+                        help="Bobot MinT: variance error backtest 1 hari atau jumlah kabupaten")
+    args = parser.parse_args()
+    main(weights=args.weights)
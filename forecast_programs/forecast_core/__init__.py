@@ -0,0 +1,47 @@
+"""
+FORECAST CORE
+=============
+Library bersama untuk semua program forecast, visualisasi, dan analisis.
+
+Modul:
+  - data : data-access layer (cache kolumnar workbook VLR)
+  - cube : agregasi hierarki Total/Regional/Provinsi/Kabupaten
+  - engine : batch forecast engine (MA + WMA + ES ter-vektorisasi) dan
+    entry point forecast(level, horizon) untuk semua level
+  - kernels : kernel numerik (exponential smoothing sebagai filter linear,
+    bobot WMA dan operator slope ter-cache)
+  - state : state MA/WMA/ES incremental untuk ingest harian
+  - backtest : rolling-origin backtest (MAPE, sMAPE, bias, coverage)
+  - intervals : interval prediksi Monte-Carlo (bootstrap residual backtest)
+  - reconcile : rekonsiliasi hierarki (bottom-up, top-down, MinT sparse)
+  - results : store hasil forecast kolumnar (Parquet per level, format long)
+  - summary : ringkasan historis vs forecast per node (growth, top-N)
+  - render : render farm chart forecast (spesifikasi chart → worker Agg)
+  - deck : builder PowerPoint (gambar slide di-resample paralel, dedup, budget ukuran)
+  - params : parameter ensemble per node (default atau hasil tuning)
+  - tuning : grid search parameter ensemble per node terhadap backtest
+  - rng : stream random per entity (SeedSequence dari base seed + key)
+  - parallel : eksekusi per entity di ProcessPoolExecutor (cube via mmap)
+  - manifest : manifest build content-addressed (skip entity yang up-to-date)
+  - pipeline : scheduler DAG untuk run_all_forecasts.py
+"""
+
+from .data import WORKBOOK_FILE, load_raw_data, workbook_fingerprint
+from .cube import LEVELS, TOTAL_NAME, TrafficCube, build_cube, load_cube
+from .engine import (INTERVAL_QUANTILES, ensemble_components, ensemble_forecast, forecast, forecast_frame,
+                     forecast_level, level_event_options)
+from .kernels import exponential_smoothing_filter, slope_operator, wma_weights
+from .rng import BASE_SEED, entity_key, entity_noise, entity_rng
+from .parallel import run_parallel, shared_cube
+from .manifest import BuildManifest, code_version, fingerprint
+
+__all__ = [
+    'WORKBOOK_FILE', 'load_raw_data', 'workbook_fingerprint',
+    'LEVELS', 'TOTAL_NAME', 'TrafficCube', 'build_cube', 'load_cube',
+    'INTERVAL_QUANTILES', 'ensemble_components', 'ensemble_forecast', 'forecast', 'forecast_frame', 'forecast_level',
+    'level_event_options',
+    'exponential_smoothing_filter', 'slope_operator', 'wma_weights',
+    'BASE_SEED', 'entity_key', 'entity_noise', 'entity_rng',
+    'run_parallel', 'shared_cube',
+    'BuildManifest', 'code_version', 'fingerprint',
+]
@@ -0,0 +1,170 @@
+"""
+AGGREGATION CUBE
+================
+Agregasi hierarki Total → REGION IOH → PROVINCE → KABUPATEN IOH dalam
+satu kali pass atas data mentah. Hasilnya berupa cube NumPy dense
+(series × hari × metric) untuk setiap node hierarki.
+
+Input:
+  - Data mentah dari data.load_raw_data()
+
+Output:
+  - TrafficCube: values[node, hari, metric] + counts[node, hari]
+
+Fungsi:
+  - build_cube(): agregasi bottom-up (kabupaten → provinsi → regional → total)
+  - load_cube(): cube untuk workbook aktif (dimemo per proses)
+  - Slice series per node tanpa filter/groupby ulang atas frame mentah
+"""
+
+import numpy as np
+import pandas as pd
+
+from .data import WORKBOOK_FILE, data_version, load_raw_data
+
+LEVELS = ['total', 'regional', 'provinsi', 'kabupaten']
+LEVEL_COLUMNS = {
+    'regional': 'REGION IOH',
+    'provinsi': 'PROVINCE',
+    'kabupaten': 'KABUPATEN IOH',
+}
+TOTAL_NAME = 'TOTAL'
+CUBE_METRICS = [
+    'Traffic_H3I (TB)',
+    'Traffic_IM3 (TB)',
+    'Traffic_Total(TB)',
+    'VLR_3ID_subs',
+    'VLR_IM3_subs',
+]
+
+_cube_cache = {}
+
+
+class TrafficCube:
+    """
+    Cube agregasi traffic untuk semua node hierarki.
+
+    Node disusun berurutan: total, regional (sorted), provinsi (sorted),
+    kabupaten (sorted). `counts` menyimpan jumlah baris mentah per
+    node per hari sehingga hari tanpa data bisa dibedakan dari nol.
+    """
+
+    def __init__(self, dates, metrics, nodes, values, counts):
+        self.dates = pd.DatetimeIndex(dates)
+        self.metrics = list(metrics)
+        self.nodes = nodes
+        self.values = values
+        self.counts = counts
+        self._index = {(row.level, row.name): i for i, row in enumerate(nodes.itertuples(index=False))}
+
+    def level_names(self, level):
+        """Nama node pada level tertentu (urut alfabet)"""
+        return self.nodes.loc[self.nodes['level'] == level, 'name'].tolist()
+
+    def level_indices(self, level):
+        """Index baris cube untuk semua node pada level tertentu"""
+        return np.flatnonzero(self.nodes['level'].to_numpy() == level)
+
+    def index_of(self, level, name):
+        """Index baris cube untuk satu node"""
+        return self._index[(level, name)]
+
+    def parent_of(self, level, name):
+        """Nama parent node (None untuk total)"""
+        return self.nodes['parent'].iat[self.index_of(level, name)]
+
+    def metric_index(self, metric):
+        return self.metrics.index(metric)
+
+    def series(self, level, name, metric='Traffic_Total(TB)'):
+        """Series harian (array 1-D, hanya hari yang ada datanya)"""
+        idx = self.index_of(level, name)
+        observed = self.counts[idx] > 0
+        return self.values[idx, observed, self.metric_index(metric)]
+
+    def level_matrix(self, level, metric='Traffic_Total(TB)'):
+        """Matrix (node × hari) untuk satu level dan satu metric"""
+        return self.values[self.level_indices(level), :, self.metric_index(metric)]
+
+    def daily_frame(self, level, name, metrics=None):
+        """
+        DataFrame harian dengan format sama seperti hasil
+        groupby('Date').agg(...) pada script forecast.
+        """
+        metrics = metrics or self.metrics
+        idx = self.index_of(level, name)
+        observed = self.counts[idx] > 0
+
+        daily_data = pd.DataFrame({'Date': self.dates[observed]})
+        for metric in metrics:
+            daily_data[metric] = self.values[idx, observed, self.metric_index(metric)]
+        return daily_data
+
+
+def build_cube(df, metrics=None):
+    """
+    Bangun TrafficCube dari data mentah dalam satu pass.
+
+    Baris mentah hanya di-scan sekali untuk level kabupaten (bincount
+    atas kode kabupaten × tanggal). Level di atasnya dijumlahkan dari
+    cube kabupaten menggunakan mapping parent.
+    """
+    metrics = metrics or CUBE_METRICS
+
+    kab_codes, kab_names = pd.factorize(df['KABUPATEN IOH'], sort=True)
+    date_codes, dates = pd.factorize(pd.to_datetime(df['Date']), sort=True)
+    n_kab, n_days = len(kab_names), len(dates)
+
+    flat = kab_codes * n_days + date_codes
+    size = n_kab * n_days
+
+    bottom = np.empty((n_kab, n_days, len(metrics)))
+    for m, metric in enumerate(metrics):
+        # NaN dihitung 0, sama seperti groupby().sum()
+        weights = np.nan_to_num(df[metric].to_numpy(dtype=np.float64))
+        bottom[:, :, m] = np.bincount(flat, weights=weights, minlength=size).reshape(n_kab, n_days)
+    bottom_counts = np.bincount(flat, minlength=size).reshape(n_kab, n_days)
+
+    # Mapping kabupaten → provinsi → regional (diambil dari baris pertama)
+    first_rows = df.groupby('KABUPATEN IOH', sort=True)[['PROVINCE', 'REGION IOH']].first()
+    kab_province = first_rows['PROVINCE'].reindex(kab_names).to_numpy()
+    kab_region = first_rows['REGION IOH'].reindex(kab_names).to_numpy()
+
+    prov_codes, prov_names = pd.factorize(kab_province, sort=True)
+    reg_codes, reg_names = pd.factorize(kab_region, sort=True)
+
+    prov_region = {}
+    for prov, region in zip(kab_province, kab_region):
+        prov_region.setdefault(prov, region)
+
+    def rollup(codes, n_groups):
+        values = np.zeros((n_groups, n_days, len(metrics)))
+        counts = np.zeros((n_groups, n_days), dtype=bottom_counts.dtype)
+        np.add.at(values, codes, bottom)
+        np.add.at(counts, codes, bottom_counts)
+        return values, counts
+
+    prov_values, prov_counts = rollup(prov_codes, len(prov_names))
+    reg_values, reg_counts = rollup(reg_codes, len(reg_names))
+    total_values = bottom.sum(axis=0, keepdims=True)
+    total_counts = bottom_counts.sum(axis=0, keepdims=True)
+
+    nodes = pd.DataFrame(
+        [('total', TOTAL_NAME, None)]
+        + [('regional', name, TOTAL_NAME) for name in reg_names]
+        + [('provinsi', name, prov_region[name]) for name in prov_names]
+        + [('kabupaten', name, prov) for name, prov in zip(kab_names, kab_province)],
+        columns=['level', 'name', 'parent']
+    )
+    values = np.concatenate([total_values, reg_values, prov_values, bottom])
+    counts = np.concatenate([total_counts, reg_counts, prov_counts, bottom_counts])
+
+    return TrafficCube(dates, metrics, nodes, values, counts)
+
+
+def load_cube(filename=WORKBOOK_FILE):
+    """Cube untuk data aktif (workbook + baris append), dibangun sekali per proses"""
+    key = data_version(filename)
+    if key not in _cube_cache:
+        _cube_cache[key] = build_cube(load_raw_data(filename))
+    return _cube_cache[key]
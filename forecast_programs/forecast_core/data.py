@@ -0,0 +1,218 @@
+"""
+DATA STORE
+==========
+Data-access layer untuk workbook VLR. Workbook Excel hanya di-parse
+sekali, lalu disimpan sebagai cache kolumnar (Parquet) yang di-key
+dengan mtime dan hash konten workbook.
+
+Input:
+  - Traffic_VLR_Java_2024-2025.xlsx
+
+Output:
+  - .forecast_cache/vlr_<hash>.parquet
+  - .forecast_cache/vlr_cache.json (metadata: mtime, size, sha256)
+  - .forecast_cache/vlr_appended.parquet (baris harian hasil ingest)
+
+Fungsi:
+  - load_raw_data(): baca data mentah dari cache (parse Excel hanya
+    jika workbook berubah) + baris harian yang sudah di-append
+  - append_rows(): tambahkan baris harian baru ke store kolumnar
+  - data_version(): versi data (hash workbook + hash baris append)
+  - Fallback ke pickle jika pyarrow tidak terinstall
+"""
+
+import hashlib
+import json
+from pathlib import Path
+
+import pandas as pd
+
+WORKBOOK_FILE = "Traffic_VLR_Java_2024-2025.xlsx"
+CACHE_DIR = Path(".forecast_cache")
+CACHE_META = "vlr_cache.json"
+APPENDED_STEM = "vlr_appended"
+
+# Tipe data kolom metric workbook VLR
+METRIC_COLUMNS = {
+    'Traffic_H3I (TB)': 'float64',
+    'Traffic_IM3 (TB)': 'float64',
+    'Traffic_Total(TB)': 'float64',
+    'VLR_3ID_subs': 'int64',
+    'VLR_IM3_subs': 'int64',
+}
+
+# Cache in-process: satu run cukup membaca file cache satu kali
+_memory_cache = {}
+
+
+def _file_sha256(path):
+    """Hitung sha256 konten file secara streaming"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _parquet_available():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _read_meta(cache_dir):
+    meta_file = cache_dir / CACHE_META
+    if not meta_file.exists():
+        return {}
+    try:
+        return json.loads(meta_file.read_text())
+    except (ValueError, OSError):
+        return {}
+
+
+def _write_meta(cache_dir, meta):
+    (cache_dir / CACHE_META).write_text(json.dumps(meta, indent=2))
+
+
+def workbook_fingerprint(filename=WORKBOOK_FILE, cache_dir=CACHE_DIR):
+    """
+    Fingerprint workbook: (mtime_ns, size, sha256).
+
+    Hash konten hanya dihitung ulang jika mtime/size berbeda dari
+    metadata cache terakhir.
+    """
+    path = Path(filename)
+    stat = path.stat()
+    meta = _read_meta(Path(cache_dir)).get(str(path), {})
+
+    if meta.get('mtime_ns') == stat.st_mtime_ns and meta.get('size') == stat.st_size:
+        sha256 = meta['sha256']
+    else:
+        sha256 = _file_sha256(path)
+
+    return {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size, 'sha256': sha256}
+
+
+def _prepare_types(df):
+    """Pastikan tipe kolom konsisten sebelum disimpan ke cache"""
+    df['Date'] = pd.to_datetime(df['Date'])
+    for col, dtype in METRIC_COLUMNS.items():
+        # Kolom dengan nilai kosong (NaN) dibiarkan float
+        if col in df.columns and not df[col].isna().any():
+            df[col] = df[col].astype(dtype)
+    return df
+
+
+def _cache_path(cache_dir, sha256):
+    suffix = 'parquet' if _parquet_available() else 'pkl'
+    return Path(cache_dir) / f"vlr_{sha256[:16]}.{suffix}"
+
+
+def _read_cache_file(path):
+    if path.suffix == '.parquet':
+        return pd.read_parquet(path)
+    return pd.read_pickle(path)
+
+
+def _write_cache_file(df, path):
+    if path.suffix == '.parquet':
+        df.to_parquet(path, index=False)
+    else:
+        df.to_pickle(path)
+
+
+def appended_path(cache_dir=CACHE_DIR):
+    """Path store baris harian yang di-append (Parquet, atau pickle)"""
+    suffix = 'parquet' if _parquet_available() else 'pkl'
+    return Path(cache_dir) / f"{APPENDED_STEM}.{suffix}"
+
+
+def load_appended_rows(cache_dir=CACHE_DIR):
+    """Baris harian hasil ingest (None jika belum ada)"""
+    path = appended_path(cache_dir)
+    if not path.exists():
+        return None
+    return _read_cache_file(path)
+
+
+def read_daily_rows(path):
+    """Baca file baris harian baru (Excel atau CSV) dengan kolom seperti workbook"""
+    path = Path(path)
+    if path.suffix.lower() == '.csv':
+        df = pd.read_csv(path)
+    else:
+        df = pd.read_excel(path, sheet_name=0)
+    return _prepare_types(df)
+
+
+def append_rows(df_new, cache_dir=CACHE_DIR):
+    """
+    Tambahkan baris harian ke store append. Store ditulis ulang utuh
+    (ukurannya kecil dibanding workbook) lalu di-rename secara atomik.
+    """
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    existing = load_appended_rows(cache_dir)
+    combined = df_new if existing is None else pd.concat([existing, df_new], ignore_index=True)
+
+    path = appended_path(cache_dir)
+    tmp_path = path.with_name(f"{path.stem}.tmp{path.suffix}")
+    _write_cache_file(combined.reset_index(drop=True), tmp_path)
+    tmp_path.replace(path)
+    return combined
+
+
+def data_version(filename=WORKBOOK_FILE, cache_dir=CACHE_DIR):
+    """Versi data aktif: sha256 workbook, ditambah hash store append jika ada"""
+    version = workbook_fingerprint(filename, cache_dir)['sha256']
+    path = appended_path(cache_dir)
+    if path.exists():
+        version += ':' + _file_sha256(path)[:16]
+    return version
+
+
+def load_raw_data(filename=WORKBOOK_FILE, cache_dir=CACHE_DIR, refresh=False):
+    """
+    Load data mentah VLR (semua baris, kolom Date sudah datetime).
+
+    Workbook di-parse dengan pd.read_excel hanya jika belum ada cache
+    untuk hash kontennya. Baris harian dari append_rows() ikut
+    digabung di akhir. Pemanggilan berikutnya dalam proses yang sama
+    dilayani dari memori.
+    """
+    path = Path(filename)
+    cache_dir = Path(cache_dir)
+    fingerprint = workbook_fingerprint(path, cache_dir)
+    key = (str(path.resolve()), data_version(path, cache_dir))
+
+    if not refresh and key in _memory_cache:
+        return _memory_cache[key].copy()
+
+    cache_file = _cache_path(cache_dir, fingerprint['sha256'])
+
+    if not refresh and cache_file.exists():
+        df = _read_cache_file(cache_file)
+    else:
+        print(f"  → Parsing workbook {path.name} (cache miss)...")
+        df = _prepare_types(pd.read_excel(path, sheet_name=0))
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        _write_cache_file(df, cache_file)
+
+    # Update metadata agar run berikutnya tidak perlu hash ulang
+    if cache_dir.exists():
+        meta = _read_meta(cache_dir)
+        entry = dict(fingerprint, cache_file=cache_file.name)
+        if meta.get(str(path)) != entry:
+            meta[str(path)] = entry
+            _write_meta(cache_dir, meta)
+
+    # Baris append yang tanggalnya sudah tercakup workbook (workbook baru) diabaikan
+    appended = load_appended_rows(cache_dir)
+    if appended is not None:
+        appended = appended[appended['Date'] > df['Date'].max()]
+        df = pd.concat([df, appended], ignore_index=True)
+
+    _memory_cache[key] = df
+    return df.copy()
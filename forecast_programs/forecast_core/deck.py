@@ -0,0 +1,343 @@
+"""
+POWERPOINT DECK BUILDER
+=======================
+Builder PowerPoint bertahap: slide dicatat dulu (gambar + judul), lalu
+semua gambar unik disiapkan paralel sebelum slide dirakit dan disimpan.
+
+Persiapan gambar: resample ke lebar gambar di slide (9 inch) pada dpi
+target, simpan sebagai PNG palet teroptimasi di cache. Gambar dengan
+isi sama (hash sha256) hanya disiapkan dan di-embed sekali. Dengan
+budget ukuran, dpi diturunkan sampai total gambar muat di budget.
+
+Mode chart native: gambar chart diganti chart PowerPoint (python-pptx)
+yang dibangun langsung dari results store dan tabel analisis, sehingga
+deck tidak butuh rasterisasi sama sekali dan chart bisa diedit.
+
+Input:
+  - Gambar chart (PNG dari forecast_results/)
+  - Mode native: results store, cube historis,
+    01_main/comparison_statistics_2025_vs_2026.csv, tabel top 10 (05_analysis/)
+
+Output:
+  - .forecast_cache/deck_images/[hash]_[dpi]dpi.png (cache gambar slide)
+  - File .pptx dari script generate_ppt*.py
+
+Fungsi:
+  - prepare_image(): resample satu gambar ke lebar slide (dipakai worker)
+  - prepare_images(): siapkan gambar unik secara paralel, cache per hash + dpi
+  - fit_to_budget(): pilih dpi tertinggi yang total gambarnya muat di budget
+  - forecast_chart() / comparison_chart() / province_chart() / top10_chart():
+    data chart native (kategori + series) dari forecast dan tabel analisis
+  - native_charts(): dict path gambar → chart native pengganti
+  - add_native_chart(): gambar chart native di slide
+  - DeckBuilder: catat slide, siapkan gambar, rakit dan simpan presentasi
+"""
+
+import math
+from pathlib import Path
+
+import pandas as pd
+from PIL import Image
+from pptx.chart.data import CategoryChartData
+from pptx.dml.color import RGBColor
+from pptx.enum.chart import XL_CHART_TYPE, XL_LEGEND_POSITION
+from pptx.util import Pt
+
+from .cube import TOTAL_NAME, load_cube
+from .data import CACHE_DIR
+from .manifest import file_digest
+from .parallel import run_parallel
+from .render import CHART_DIRS, METRIC, chart_path, save_image
+from .results import results_by_name
+
+DECK_IMAGE_DIR = CACHE_DIR / "deck_images"
+SLIDE_IMAGE_WIDTH = 9  # inch, lebar gambar di slide 10 inch
+DEFAULT_DPI = 150
+# Profil chart on-demand untuk deck: report (150 dpi) = dpi slide default
+CHART_PROFILE = 'report'
+MIN_DPI = 72
+SLIDE_OVERHEAD = 2000  # byte XML per slide (di luar gambar)
+
+MAIN_DIR = Path("forecast_results/01_main")
+ANALYSIS_DIR = Path("forecast_results/05_analysis")
+COMPARISON_FILE = MAIN_DIR / "comparison_statistics_2025_vs_2026.csv"
+
+# Warna sama dengan chart matplotlib (render.ForecastChartTemplate)
+HISTORY_COLOR = '2E86AB'
+FORECAST_COLOR = 'E63946'
+BOUND_COLOR = 'F4A3A9'
+
+
+def prepare_image(task):
+    """
+    Resample gambar `source` ke lebar SLIDE_IMAGE_WIDTH × dpi pixel
+    (tidak pernah diperbesar) dan simpan ke `target`. Return path target.
+    """
+    source, target, dpi = task
+    target = Path(target)
+    if target.exists():
+        return target
+
+    image = Image.open(source).convert('RGB')
+    width = round(SLIDE_IMAGE_WIDTH * dpi)
+    if image.width > width:
+        height = round(image.height * width / image.width)
+        image = image.resize((width, height), Image.Resampling.LANCZOS)
+
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = target.with_name(target.name + '.tmp')
+    save_image(image, tmp_path, 'png-optimized')
+    tmp_path.replace(target)
+    return target
+
+
+def prepare_images(sources, dpi=DEFAULT_DPI, workers=1, cache_dir=DECK_IMAGE_DIR):
+    """
+    Siapkan gambar slide untuk semua `sources` yang ada. Gambar dengan
+    isi sama disiapkan sekali; hasil di-cache per (hash isi, dpi).
+
+    Return dict path sumber → path gambar siap pakai.
+    """
+    digests = {Path(source): file_digest(source) for source in dict.fromkeys(sources)
+               if Path(source).exists()}
+    unique = {digest: source for source, digest in digests.items()}
+    targets = {digest: Path(cache_dir) / f"{digest[:16]}_{dpi}dpi.png" for digest in unique}
+
+    tasks = [(str(source), str(targets[digest]), dpi) for digest, source in unique.items()]
+    for _ in run_parallel(prepare_image, tasks, workers=workers):
+        pass
+    return {source: targets[digest] for source, digest in digests.items()}
+
+
+def fit_to_budget(sources, budget_bytes=None, dpi=DEFAULT_DPI, workers=1):
+    """
+    Siapkan gambar pada `dpi`; jika total gambar unik melebihi
+    `budget_bytes`, turunkan dpi (ukuran ~ dpi²) sampai muat atau MIN_DPI.
+
+    Return (dict sumber → gambar siap pakai, dpi yang dipakai, total byte).
+    """
+    while True:
+        prepared = prepare_images(sources, dpi, workers)
+        total = sum(path.stat().st_size for path in set(prepared.values()))
+        if budget_bytes is None or total <= budget_bytes or dpi <= MIN_DPI:
+            return prepared, dpi, total
+        # Target 95% budget supaya tidak perlu iterasi tambahan karena pembulatan
+        dpi = max(MIN_DPI, int(dpi * math.sqrt(0.95 * budget_bytes / total)))
+
+
+def _dates(values):
+    return [timestamp.date() for timestamp in pd.to_datetime(values)]
+
+
+def _series(name, values, color=None, width=2.0):
+    return {'name': name, 'values': values, 'color': color, 'width': width}
+
+
+def forecast_chart(daily_data, df_forecast, metric=METRIC):
+    """
+    Chart line historical + forecast + interval satu node (panel utama
+    chart matplotlib). Series diisi None di luar periodenya.
+    """
+    history = daily_data[metric].tolist()
+    forecast = df_forecast[metric].tolist()
+    no_history, no_forecast = [None] * len(history), [None] * len(forecast)
+    return {
+        'type': 'line',
+        'categories': _dates(daily_data['Date']) + _dates(df_forecast['Date']),
+        'series': [
+            _series('Historical', history + no_forecast, HISTORY_COLOR),
+            _series('Forecast', no_history + forecast, FORECAST_COLOR),
+            _series('Lower Bound', no_history + df_forecast['Lower_Bound'].tolist(), BOUND_COLOR, 1.0),
+            _series('Upper Bound', no_history + df_forecast['Upper_Bound'].tolist(), BOUND_COLOR, 1.0),
+        ],
+        'number_format': '#,##0.00',
+        'axis_title': 'Traffic (TB)',
+    }
+
+
+def comparison_chart(path=COMPARISON_FILE):
+    """Chart line actual 2025 vs forecast 2026 per tanggal (comparison_statistics CSV)"""
+    df = pd.read_csv(path)
+    return {
+        'type': 'line',
+        'categories': _dates(df['Date_2026']),
+        'series': [
+            _series('Actual 2025', df['Actual_2025'].tolist(), HISTORY_COLOR),
+            _series('Forecast 2026', df['Forecast_2026'].tolist(), FORECAST_COLOR),
+        ],
+        'number_format': '#,##0.00',
+        'axis_title': 'Traffic (TB)',
+    }
+
+
+def province_chart(forecasts, metric=METRIC):
+    """Chart line forecast semua provinsi (dict nama → DataFrame forecast), warna tema"""
+    dates = next(iter(forecasts.values()))['Date']
+    return {
+        'type': 'line',
+        'categories': _dates(dates),
+        'series': [_series(name.title(), df[metric].tolist()) for name, df in sorted(forecasts.items())],
+        'number_format': '#,##0.00',
+        'axis_title': 'Traffic (TB)',
+    }
+
+
+def top10_chart(df, value_column, axis_title, number_format='#,##0.00'):
+    """Chart bar horizontal top 10 kabupaten (peringkat #1 di atas)"""
+    df = df.iloc[::-1]
+    return {
+        'type': 'bar',
+        'categories': df['Kabupaten'].tolist(),
+        'series': [_series(axis_title, df[value_column].tolist(), HISTORY_COLOR)],
+        'number_format': number_format,
+        'axis_title': axis_title,
+    }
+
+
+def native_charts(cube=None):
+    """
+    Dict path gambar → chart native pengganti: chart forecast setiap
+    node di store (regional/provinsi/kabupaten dan total), perbandingan
+    2025 vs 2026, perbandingan provinsi, dan ringkasan top 10.
+    """
+    cube = load_cube() if cube is None else cube
+    charts = {}
+    for level in CHART_DIRS:
+        for name, df_forecast in results_by_name(level).items():
+            charts[chart_path(level, name)] = forecast_chart(
+                cube.daily_frame(level, name, [METRIC]), df_forecast)
+
+    total = results_by_name('total')
+    if TOTAL_NAME in total:
+        charts[MAIN_DIR / "00_main_forecast_overview.png"] = forecast_chart(
+            cube.daily_frame('total', TOTAL_NAME, [METRIC]), total[TOTAL_NAME])
+    if COMPARISON_FILE.exists():
+        charts[MAIN_DIR / "03_traffic_forecast_lengkap.png"] = comparison_chart()
+    provinces = results_by_name('provinsi')
+    if provinces:
+        charts[MAIN_DIR / "04_combined_province_comparison.png"] = province_chart(provinces)
+
+    excel_file = ANALYSIS_DIR / "top10_kabupaten_by_absolute_change.xlsx"
+    if excel_file.exists():
+        df = pd.read_excel(excel_file, sheet_name='Top 10 Absolute')
+        charts[ANALYSIS_DIR / "top10_kabupaten_by_absolute_change.png"] = top10_chart(
+            df, 'Change_Avg_TB', 'Perubahan Rata-rata (TB/hari)')
+    excel_file = ANALYSIS_DIR / "top10_kabupaten_individual_forecast.xlsx"
+    if excel_file.exists():
+        df = pd.read_excel(excel_file, sheet_name='Top 10')
+        charts[ANALYSIS_DIR / "top10_kabupaten_individual_forecast.png"] = top10_chart(
+            df, 'Growth_Rate', 'Growth Rate (%)', '0.00"%"')
+    return charts
+
+
+def add_native_chart(slide, chart, left, top, width, height):
+    """Gambar chart native (hasil forecast_chart() dkk.) di slide, return objek chart"""
+    chart_data = CategoryChartData(number_format=chart['number_format'])
+    chart_data.categories = chart['categories']
+    for series in chart['series']:
+        chart_data.add_series(series['name'], series['values'])
+
+    chart_type = XL_CHART_TYPE.LINE if chart['type'] == 'line' else XL_CHART_TYPE.BAR_CLUSTERED
+    graphic = slide.shapes.add_chart(chart_type, left, top, width, height, chart_data).chart
+    graphic.font.size = Pt(10)
+    graphic.has_legend = len(chart['series']) > 1
+    if graphic.has_legend:
+        graphic.legend.position = XL_LEGEND_POSITION.BOTTOM
+        graphic.legend.include_in_layout = False
+
+    value_axis = graphic.value_axis
+    value_axis.has_major_gridlines = True
+    value_axis.axis_title.text_frame.text = chart['axis_title']
+    value_axis.tick_labels.number_format = chart['number_format']
+    value_axis.tick_labels.number_format_is_linked = False
+
+    plot = graphic.plots[0]
+    if chart['type'] == 'line':
+        graphic.category_axis.tick_labels.number_format = 'mmm yyyy'
+        graphic.category_axis.tick_labels.number_format_is_linked = False
+    else:
+        plot.has_data_labels = True
+        plot.data_labels.number_format = chart['number_format']
+        plot.data_labels.number_format_is_linked = False
+
+    for series, spec in zip(plot.series, chart['series']):
+        if spec['color'] is None:
+            continue
+        if chart['type'] == 'line':
+            series.smooth = False
+            series.format.line.color.rgb = RGBColor.from_string(spec['color'])
+            series.format.line.width = Pt(spec['width'])
+        else:
+            series.format.fill.solid()
+            series.format.fill.fore_color.rgb = RGBColor.from_string(spec['color'])
+    return graphic
+
+
+class DeckBuilder:
+    """
+    Builder presentasi: add() mencatat slide (gambar + judul) sesuai
+    urutan, save() menyiapkan semua gambar sekaligus (paralel, dedup,
+    budget ukuran) lalu merakit slide dengan fungsi `add_slide(prs,
+    image_path, title)` milik script dan menyimpan file.
+
+    Dengan `charts` (dict path gambar → chart native, lihat
+    native_charts()) gambar yang punya pengganti dirakit lewat
+    `add_chart_slide(prs, chart, title)` dan tidak perlu ada di disk.
+    `chart_options` adalah opsi render (render_options()) untuk chart
+    yang dirender on-demand oleh script.
+    """
+
+    def __init__(self, prs, add_slide, dpi=DEFAULT_DPI, budget_mb=None, workers=1,
+                 charts=None, add_chart_slide=None, chart_options=None):
+        self.prs = prs
+        self.add_slide = add_slide
+        self.dpi = dpi
+        self.budget_mb = budget_mb
+        self.workers = workers
+        self.charts = charts or {}
+        self.add_chart_slide = add_chart_slide
+        self.chart_options = chart_options
+        self.slides = []
+
+    @property
+    def native(self):
+        """True jika deck memakai chart native"""
+        return bool(self.charts)
+
+    def available(self, image_path):
+        """True jika gambar ada di disk atau punya pengganti chart native"""
+        return Path(image_path) in self.charts or Path(image_path).exists()
+
+    def add(self, image_path, title):
+        """Catat slide; return True jika gambarnya (atau chart penggantinya) ada"""
+        self.slides.append((Path(image_path), title))
+        return self.available(image_path)
+
+    def save(self, output_file):
+        """
+        Siapkan gambar, rakit semua slide, simpan. Return ringkasan:
+        jumlah slide, chart native, gambar unik, dpi, total byte gambar,
+        ukuran file.
+        """
+        sources = [path for path, _ in self.slides if path not in self.charts]
+        budget_bytes = None
+        if self.budget_mb is not None:
+            budget_bytes = self.budget_mb * 1e6 - SLIDE_OVERHEAD * len(self.slides)
+        prepared, dpi, image_bytes = fit_to_budget(sources, budget_bytes, self.dpi, self.workers)
+
+        for path, title in self.slides:
+            if path in self.charts:
+                self.add_chart_slide(self.prs, self.charts[path], title)
+            else:
+                # Gambar yang tidak ada diteruskan apa adanya (script mencetak peringatan)
+                self.add_slide(self.prs, prepared.get(path, path), title)
+        self.prs.save(output_file)
+
+        return {
+            'slides': len(self.slides),
+            'charts': sum(path in self.charts for path, _ in self.slides),
+            'images': len(set(prepared.values())),
+            'dpi': dpi,
+            'image_bytes': image_bytes,
+            'file_bytes': Path(output_file).stat().st_size,
+        }
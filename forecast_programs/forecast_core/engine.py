@@ -0,0 +1,445 @@
+"""
+BATCH FORECAST ENGINE
+=====================
+Ensemble forecasting (MA + WMA + ES) untuk banyak series sekaligus.
+Input berupa matrix 2-D (baris = kabupaten/provinsi/regional, kolom =
+hari), semua komponen ensemble dihitung dengan operasi NumPy
+ter-vektorisasi dan seluruh horizon forecast dihasilkan sebagai satu
+matrix.
+
+Input:
+  - history: array (n_series × n_hari)
+  - TrafficCube dari cube.load_cube() (untuk forecast_level)
+
+Output:
+  - Matrix forecast (n_series × days_ahead)
+
+Fungsi:
+  - ensemble_components(): base value dan trend MA/WMA/ES per series
+  - components_from_tails(): sama, dari window terakhir + tail ES saja
+  - param_groups(): kelompok baris dengan parameter ensemble yang sama
+  - grouped_components(): ensemble_components() dengan parameter per baris
+  - new_year_baseline(): rata-rata traffic normal 1-24 Des 2024 per series
+  - new_year_event_factors(): faktor event Tahun Baru per series
+  - horizon_forecast(): horizon forecast closed-form (tanpa loop per hari)
+  - ensemble_forecast(): forecast horizon lengkap untuk semua series
+  - level_event_options(): opsi event forecast yang dipublikasikan per level
+  - forecast_level(): forecast semua node pada satu level hierarki
+  - forecast(): entry point level-agnostic, misal forecast('kabupaten', 75)
+
+Noise diambil dari stream random per entity (lihat rng.py). Parameter
+ensemble per node (window, alpha, damping) diambil dari params.py.
+"""
+
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+
+from .cube import load_cube
+from .kernels import exponential_smoothing_filter, slope_operator, wma_weights
+from .params import node_params
+from .rng import BASE_SEED, entity_key, entity_noise
+
+# Periode Tahun Baru historis (sumber faktor event) dan baseline normal
+NY_PATTERN_START = pd.Timestamp('2024-12-25')
+NY_PATTERN_END = pd.Timestamp('2025-01-07')
+NY_BASELINE_START = pd.Timestamp('2024-12-01')
+NY_BASELINE_END = pd.Timestamp('2024-12-24')
+
+# Periode Tahun Baru yang di-forecast
+NY_FORECAST_START = pd.Timestamp('2025-12-25')
+NY_FORECAST_END = pd.Timestamp('2026-01-07')
+
+WEEKEND_DAYS = [4, 5, 6]  # Fri, Sat, Sun
+WEEKEND_FACTOR = 1.05
+TREND_DAMPING = 0.5
+
+# Quantile default untuk interval Monte-Carlo (lihat intervals.py)
+INTERVAL_QUANTILES = (0.05, 0.5, 0.95)
+
+# Opsi event Tahun Baru per level seperti yang dipublikasikan: total memakai
+# baseline normal 1-24 Des dan tanggal yang sama tahun lalu (forecast_01),
+# level lain rata-rata 30 hari terakhir dan tanggal 2024 (default)
+LEVEL_EVENT_OPTIONS = {
+    'total': {'event_base': 'baseline', 'same_date_last_year': True},
+}
+
+
+def trend_slopes(windows):
+    """
+    Slope regresi linear (sama dengan np.polyfit(x, y, 1)[0]) untuk
+    setiap baris: satu matrix-vector product dengan operator slope
+    ter-cache (kernels.slope_operator) atas axis terakhir.
+    """
+    n = windows.shape[-1]
+    if n < 2:
+        return np.zeros(windows.shape[:-1])
+    return windows @ slope_operator(n)
+
+
+def exponential_smoothing_batch(history, alpha=0.3, keep_last=30, dtype=np.float64):
+    """
+    Exponential smoothing untuk semua baris sekaligus (filter linear,
+    tanpa loop Python per hari).
+
+    Return level terakhir dan `keep_last` nilai smoothed terakhir
+    per baris (untuk perhitungan trend).
+    """
+    smoothed = exponential_smoothing_filter(history, alpha=alpha, dtype=dtype)
+    return smoothed[:, -1], smoothed[:, -keep_last:]
+
+
+def compact_history(history, observed):
+    """
+    Rapatkan hari yang ada datanya ke kanan (urutan tetap) dan isi sisi
+    kiri dengan nilai observasi pertama per baris.
+
+    Hasilnya setara dengan series per-entity yang hanya berisi hari
+    observasi: window MA/WMA dan ES tidak terpengaruh padding karena ES
+    dengan nilai awal konstan tetap di nilai tersebut.
+    """
+    order = np.argsort(observed, axis=1, kind='stable')
+    compact = np.take_along_axis(history, order, axis=1)
+
+    n_missing = (~observed).sum(axis=1)
+    first_observed = compact[np.arange(len(compact)), np.minimum(n_missing, compact.shape[1] - 1)]
+    padding = np.arange(compact.shape[1])[None, :] < n_missing[:, None]
+    return np.where(padding, first_observed[:, None], compact)
+
+
+def components_from_tails(recent, es_tail, ma_window=7, wma_window=14):
+    """
+    Base value dan trend ensemble dari nilai terakhir series (`recent`,
+    minimal `wma_window` kolom) dan tail nilai ES (`es_tail`, kolom
+    terakhir = level ES). Dipakai juga oleh state incremental.
+
+    Return (base_value, trend), masing-masing array (n_series,).
+    """
+    # Moving Average
+    ma_recent = recent[:, -ma_window:]
+    ma_base = ma_recent.mean(axis=1)
+    ma_trend = trend_slopes(ma_recent)
+
+    # Weighted Moving Average
+    wma_recent = recent[:, -wma_window:]
+    wma_base = wma_recent @ wma_weights(wma_recent.shape[1])
+    wma_trend = trend_slopes(wma_recent)
+
+    # Exponential Smoothing
+    es_base = es_tail[:, -1]
+    es_trend = trend_slopes(es_tail)
+
+    base_value = (ma_base + wma_base + es_base) / 3
+    trend = (ma_trend + wma_trend + es_trend) / 3
+    return base_value, trend
+
+
+def ensemble_components(history, ma_window=7, wma_window=14, alpha=0.3, es_trend_window=30):
+    """
+    Hitung base value dan trend ensemble (MA + WMA + ES) per baris.
+
+    Return (base_value, trend), masing-masing array (n_series,).
+    """
+    history = np.asarray(history, dtype=float)
+    n_days = history.shape[1]
+
+    _, es_tail = exponential_smoothing_batch(history, alpha=alpha, keep_last=es_trend_window)
+    return components_from_tails(history, es_tail, ma_window, min(wma_window, n_days))
+
+
+def param_groups(params, names=('ma_window', 'wma_window', 'alpha')):
+    """
+    Kelompokkan baris berdasarkan kombinasi parameter `names` (dict
+    nama → array per baris, lihat params.node_params).
+    Yield (dict parameter, mask baris) untuk setiap kombinasi unik.
+    """
+    combos = np.column_stack([np.asarray(params[name], dtype=float) for name in names])
+    unique, inverse = np.unique(combos, axis=0, return_inverse=True)
+    inverse = inverse.ravel()
+    for g, values in enumerate(unique):
+        yield dict(zip(names, values)), inverse == g
+
+
+def grouped_components(history, params):
+    """
+    Base value dan trend ensemble dengan parameter per baris. Baris
+    dengan window/alpha yang sama dihitung sebagai satu batch.
+
+    Return (base_value, trend), masing-masing array (n_series,).
+    """
+    history = np.asarray(history, dtype=float)
+    base_value = np.empty(len(history))
+    trend = np.empty(len(history))
+    for group, rows in param_groups(params):
+        base_value[rows], trend[rows] = ensemble_components(
+            history[rows], int(group['ma_window']), int(group['wma_window']), group['alpha'])
+    return base_value, trend
+
+
+def new_year_baseline(dates, history, fallback=None):
+    """
+    Baseline traffic normal (rata-rata 1-24 Des 2024) per series,
+    fallback ke rata-rata keseluruhan jika periode tersebut kosong.
+    `history` sejajar dengan `dates`; hari tanpa data bernilai NaN.
+    `fallback` (array per series) mengganti rata-rata keseluruhan jika
+    `history` hanya sebagian history (misal state incremental).
+    """
+    dates = pd.DatetimeIndex(dates)
+    in_baseline = (dates >= NY_BASELINE_START) & (dates <= NY_BASELINE_END)
+    with np.errstate(invalid='ignore'):
+        baseline = np.nanmean(np.where(in_baseline[None, :], history, np.nan), axis=1)
+        if fallback is None:
+            fallback = np.nanmean(history, axis=1)
+        return np.where(np.isnan(baseline), fallback, baseline)
+
+
+def new_year_event_factors(dates, history, forecast_dates, same_date_last_year=False, baseline=None):
+    """
+    Faktor event Tahun Baru per series untuk setiap tanggal forecast.
+
+    Faktor = traffic hari event tahun lalu / rata-rata 1-24 Des 2024.
+    Tanggal forecast dipetakan ke tahun 2024 (sama seperti logika
+    forecast per provinsi/regional/kabupaten, sehingga 1-7 Jan 2026 tidak
+    punya sumber), atau ke tanggal yang sama setahun sebelumnya jika
+    `same_date_last_year` (logika forecast total). `history` sejajar
+    dengan `dates`; hari tanpa data bernilai NaN. `baseline` default
+    new_year_baseline(dates, history).
+
+    Return (factors, event_mask), masing-masing (n_series × days_ahead).
+    `factors` bernilai 1.0 di luar tanggal event.
+    """
+    dates = pd.DatetimeIndex(dates)
+    forecast_dates = pd.DatetimeIndex(forecast_dates)
+    n_series = history.shape[0]
+
+    factors = np.ones((n_series, len(forecast_dates)))
+    event_mask = np.zeros((n_series, len(forecast_dates)), dtype=bool)
+
+    in_pattern = (dates >= NY_PATTERN_START) & (dates <= NY_PATTERN_END)
+    if not in_pattern.any():
+        return factors, event_mask
+
+    has_pattern = ~np.isnan(history[:, in_pattern]).all(axis=1)
+
+    if baseline is None:
+        baseline = new_year_baseline(dates, history)
+    safe_baseline = np.where(baseline > 0, baseline, 1.0)
+
+    date_pos = {date: i for i, date in enumerate(dates)}
+    for j, forecast_date in enumerate(forecast_dates):
+        if not (NY_FORECAST_START <= forecast_date <= NY_FORECAST_END):
+            continue
+        if same_date_last_year:
+            source_date = forecast_date - pd.DateOffset(years=1)
+        else:
+            source_date = forecast_date.replace(year=2024)
+        pos = date_pos.get(source_date)
+        if pos is None or not in_pattern[pos]:
+            continue
+        has_event = has_pattern & ~np.isnan(history[:, pos])
+        factors[:, j] = np.where(has_event & (baseline > 0), history[:, pos] / safe_baseline, 1.0)
+        event_mask[:, j] = has_event
+
+    return factors, event_mask
+
+
+def horizon_forecast(base_value, trend, event_base, factors, event_mask, forecast_dates, noise,
+                     damping=TREND_DAMPING):
+    """
+    Forecast seluruh horizon secara closed-form (tanpa loop per hari).
+
+    Menerima skalar/array (n_series,) untuk base_value, trend dan
+    event_base, serta array (days_ahead,) atau (n_series × days_ahead)
+    untuk factors dan event_mask. Hasil di-broadcast ke shape yang sama.
+    `noise` adalah standard normal dengan shape hasil (lihat entity_noise).
+
+    `damping` berupa skalar atau array (n_series,).
+
+    Untuk hari normal: base + trend * damping * i; untuk hari event:
+    event_base. Lalu dikalikan weekly factor dan faktor event, ditambah
+    noise (1% saat event naik, 2% lainnya), dan di-clip ke >= 0.
+    """
+    forecast_dates = pd.DatetimeIndex(forecast_dates)
+    base_value = np.asarray(base_value, dtype=float)[..., np.newaxis]
+    trend = np.asarray(trend, dtype=float)[..., np.newaxis]
+    event_base = np.asarray(event_base, dtype=float)[..., np.newaxis]
+    damping = np.asarray(damping, dtype=float)[..., np.newaxis]
+    factors = np.asarray(factors, dtype=float)
+
+    steps = np.arange(len(forecast_dates))
+    base_forecast = np.where(event_mask, event_base, base_value + trend * damping * steps)
+
+    weekly_factor = np.where(np.isin(forecast_dates.dayofweek, WEEKEND_DAYS), WEEKEND_FACTOR, 1.0)
+    forecasts = base_forecast * weekly_factor * factors
+
+    noise_level = np.where(factors > 1.0, 0.01, 0.02)
+    forecasts += noise * base_forecast * noise_level
+    np.maximum(forecasts, 0, out=forecasts)
+
+    return forecasts
+
+
+def ensemble_forecast(history, dates, days_ahead=75, noise=None, observed=None, keys=None,
+                      base_seed=BASE_SEED, event_base='recent', same_date_last_year=False,
+                      params=None):
+    """
+    Forecast ensemble untuk semua baris `history` sekaligus.
+
+    Base untuk hari event adalah rata-rata 30 hari terakhir
+    (event_base='recent', dipakai forecast provinsi/regional/kabupaten)
+    atau baseline normal 1-24 Des 2024 (event_base='baseline', dipakai
+    forecast total); horizon dihitung dengan horizon_forecast().
+    `same_date_last_year` diteruskan ke new_year_event_factors().
+
+    `noise` adalah matrix standard normal (n_series × days_ahead). Jika
+    None, noise dibuat dari stream per entity untuk `keys` (satu key
+    per baris), sehingga hasil tiap baris tidak bergantung pada baris lain.
+
+    `observed` (bool, sama shape dengan history) menandai hari yang ada
+    datanya; hari lain diabaikan seperti pada series per-entity.
+
+    `params` (dict nama → array per baris, lihat params.node_params)
+    mengganti window/alpha/damping default per baris.
+
+    Return (forecast_dates, forecasts).
+    """
+    history = np.asarray(history, dtype=float)
+    dates = pd.DatetimeIndex(dates)
+    if noise is None and keys is None:
+        raise ValueError("ensemble_forecast butuh `noise` atau `keys` per baris")
+    if observed is None:
+        observed = np.ones(history.shape, dtype=bool)
+
+    last_date = dates[observed.any(axis=0)].max()
+    forecast_dates = pd.DatetimeIndex([last_date + timedelta(days=i) for i in range(1, days_ahead + 1)])
+
+    compact = compact_history(history, observed)
+    masked = np.where(observed, history, np.nan)
+    if params is None:
+        base_value, trend = ensemble_components(compact)
+        damping = TREND_DAMPING
+    else:
+        base_value, trend = grouped_components(compact, params)
+        damping = params['damping']
+    if event_base == 'recent':
+        event_base = compact[:, -30:].mean(axis=1)
+    elif event_base == 'baseline':
+        event_base = new_year_baseline(dates, masked)
+    else:
+        raise ValueError(f"event_base tidak dikenal: {event_base!r}")
+    factors, event_mask = new_year_event_factors(dates, masked, forecast_dates,
+                                                 same_date_last_year)
+    if noise is None:
+        noise = entity_noise(keys, days_ahead, base_seed)
+
+    forecasts = horizon_forecast(base_value, trend, event_base, factors, event_mask,
+                                 forecast_dates, noise=noise, damping=damping)
+
+    return forecast_dates, forecasts
+
+
+def level_event_options(level):
+    """Opsi event_base/same_date_last_year untuk forecast yang dipublikasikan di `level`"""
+    return dict(LEVEL_EVENT_OPTIONS.get(level, {}))
+
+
+def forecast_level(cube, level, days_ahead=75, min_days=30, metric='Traffic_Total(TB)',
+                   base_seed=BASE_SEED, names=None, event_base='recent',
+                   same_date_last_year=False, params=None):
+    """
+    Forecast semua node pada satu level hierarki sebagai satu matrix.
+
+    Node dengan data kurang dari `min_days` hari dilewati. Semua node
+    di-forecast mulai dari hari terakhir cube, masing-masing dengan
+    stream random sendiri (entity_key(level, nama)). Jika `names`
+    diberikan, hanya node tersebut yang di-forecast (noise per entity,
+    jadi tidak bergantung pada node lain yang ikut di-forecast).
+
+    Parameter ensemble per node diambil dari hasil tuning
+    (forecast_params.json) jika `params` None; `params={}` memaksa
+    parameter default untuk semua node.
+
+    Return (names, forecast_dates, forecasts).
+    """
+    level_names = np.array(cube.level_names(level), dtype=object)
+    indices = cube.level_indices(level)
+    if names is not None:
+        selected = np.isin(level_names, list(names))
+        level_names, indices = level_names[selected], indices[selected]
+    names = level_names
+
+    observed = cube.counts[indices] > 0
+    keep = observed.sum(axis=1) >= min_days
+    if not keep.any():
+        return [], pd.DatetimeIndex([]), np.empty((0, days_ahead))
+
+    history = cube.values[indices[keep], :, cube.metric_index(metric)]
+    keys = [entity_key(level, name) for name in names[keep]]
+    forecast_dates, forecasts = ensemble_forecast(history, cube.dates, days_ahead,
+                                                  observed=observed[keep], keys=keys,
+                                                  base_seed=base_seed, event_base=event_base,
+                                                  same_date_last_year=same_date_last_year,
+                                                  params=node_params(keys, params))
+
+    return names[keep].tolist(), forecast_dates, forecasts
+
+
+def forecast(level='kabupaten', horizon=75, names=None, cube=None, intervals='fixed',
+             quantiles=INTERVAL_QUANTILES, n_paths=10000, **kwargs):
+    """
+    Forecast semua node (atau `names`) pada satu level hierarki:
+    'total', 'regional', 'provinsi', atau 'kabupaten'.
+
+    Semua node dihitung sekaligus oleh forecast_level(); argumen lain
+    (min_days, metric, base_seed, event_base, same_date_last_year,
+    params) diteruskan ke sana.
+    `cube` default ke cube data aktif.
+
+    intervals='fixed' memberi batas ±10%; intervals='bootstrap'
+    mensimulasikan `n_paths` sample path dari residual backtest dan
+    menambahkan kolom quantile (P5, P50, P95, ...), dengan Lower/Upper
+    Bound = quantile terendah/tertinggi.
+
+    Return dict nama node → DataFrame forecast (lihat forecast_frame).
+    """
+    cube = load_cube() if cube is None else cube
+    level_names, forecast_dates, forecasts = forecast_level(cube, level, horizon,
+                                                            names=names, **kwargs)
+    if intervals == 'fixed' or not level_names:
+        return {name: forecast_frame(forecast_dates, values)
+                for name, values in zip(level_names, forecasts)}
+    if intervals != 'bootstrap':
+        raise ValueError(f"intervals tidak dikenal: {intervals!r}")
+
+    # Import lokal: intervals.py memakai engine (via backtest.py)
+    from .intervals import interval_quantiles, quantile_column
+    bounds = interval_quantiles(cube, level, level_names, forecast_dates, quantiles, n_paths,
+                                **kwargs)
+    columns = [quantile_column(q) for q in quantiles]
+    return {name: forecast_frame(forecast_dates, values,
+                                 dict(zip(columns, bounds[:, row])))
+            for row, (name, values) in enumerate(zip(level_names, forecasts))}
+
+
+def forecast_frame(forecast_dates, values, quantiles=None):
+    """
+    DataFrame forecast satu series dengan confidence interval ±10%, atau
+    dengan kolom `quantiles` (dict nama kolom → array, urut naik) dan
+    Lower/Upper Bound dari quantile terendah/tertinggi.
+    """
+    df_forecast = pd.DataFrame({
+        'Date': forecast_dates,
+        'Traffic_Total(TB)': values
+    })
+    if quantiles is None:
+        df_forecast['Lower_Bound'] = df_forecast['Traffic_Total(TB)'] * 0.9
+        df_forecast['Upper_Bound'] = df_forecast['Traffic_Total(TB)'] * 1.1
+        return df_forecast
+
+    bounds = list(quantiles.values())
+    df_forecast['Lower_Bound'] = bounds[0]
+    df_forecast['Upper_Bound'] = bounds[-1]
+    for column, quantile_values in quantiles.items():
+        df_forecast[column] = quantile_values
+    return df_forecast
@@ -0,0 +1,179 @@
+"""
+MONTE-CARLO PREDICTION INTERVALS
+================================
+Interval prediksi dari simulasi sample path, menggantikan batas tetap
+±10%. Residual diambil dari fit historis: untuk setiap origin backtest,
+rasio error aktual / forecast - 1 per horizon (lihat backtest.py).
+
+Setiap sample path memilih satu origin historis secara acak (block
+bootstrap, korelasi antar horizon tetap terjaga) lalu mengalikan
+forecast ekspektasi dengan (1 + residual). Path dibuat per chunk untuk
+semua series sekaligus dan langsung diakumulasi ke histogram per
+series × horizon, sehingga memori tidak bergantung pada jumlah path.
+Origin dekat akhir history tidak punya residual untuk horizon panjang;
+sample tersebut tidak dihitung di horizon itu, sehingga distribusi
+setiap horizon hanya berasal dari origin yang punya residual di sana.
+
+Input:
+  - TrafficCube dari cube.load_cube()
+
+Output:
+  - Quantile forecast (misal P5, P50, P95) per series × horizon
+
+Fungsi:
+  - backtest_residuals(): residual relatif per node × origin × horizon
+  - QuantileHistogram: akumulator quantile streaming (histogram rasio)
+  - simulate_quantiles(): simulasi path ter-batch + quantile streaming
+  - interval_quantiles(): quantile untuk node satu level (dipakai forecast())
+"""
+
+import numpy as np
+
+from .backtest import backtest_origins, origin_forecasts
+from .engine import INTERVAL_QUANTILES, ensemble_forecast
+from .params import node_params
+from .rng import BASE_SEED, entity_key, entity_rng
+
+DEFAULT_QUANTILES = INTERVAL_QUANTILES
+N_PATHS = 10000
+CHUNK_PATHS = 500
+
+# Histogram rasio path / forecast ekspektasi: [0, RATIO_MAX] dalam RATIO_BINS bin
+RATIO_MAX = 3.0
+RATIO_BINS = 600
+
+
+def quantile_column(q):
+    """Nama kolom quantile, misal 0.05 → 'P5'"""
+    return f"P{100 * q:g}"
+
+
+def backtest_residuals(cube, indices, horizon=75, min_train=60, min_days=30,
+                       metric='Traffic_Total(TB)', params=None):
+    """
+    Residual relatif (aktual / forecast - 1) per node × origin × horizon
+    sebagai float32; NaN jika hari aktual tidak ada atau forecast <= 0.
+    """
+    n_origins = len(backtest_origins(cube.values.shape[1], min_train))
+    residuals = np.full((len(indices), n_origins, horizon), np.nan, dtype=np.float32)
+
+    for number, rows, steps, predicted, actual, valid in origin_forecasts(
+            cube, horizon, min_train, 1, min_days, metric, params, indices):
+        usable = valid & (predicted > 0)
+        ratio = np.where(usable, actual / np.where(usable, predicted, 1.0) - 1, np.nan)
+        residuals[rows[:, None], number, steps[None, :]] = ratio
+
+    return residuals
+
+
+class QuantileHistogram:
+    """
+    Akumulator quantile streaming untuk array sample berbentuk
+    (n_path × n_series × horizon), nilai berupa rasio terhadap forecast
+    ekspektasi. Memori tetap: n_series × horizon × RATIO_BINS counter.
+    """
+
+    def __init__(self, n_series, horizon, ratio_max=RATIO_MAX, bins=RATIO_BINS):
+        self.shape = (n_series, horizon)
+        self.ratio_max = ratio_max
+        self.bins = bins
+        self.counts = np.zeros((n_series * horizon, bins), dtype=np.int64)
+
+    def add(self, ratios):
+        """Tambahkan satu chunk sample (n_path × n_series × horizon); NaN dilewati"""
+        n_cells = self.counts.shape[0]
+        valid = ~np.isnan(ratios).reshape(len(ratios), n_cells)
+        scaled = np.nan_to_num(ratios, nan=0.0) * (self.bins / self.ratio_max)
+        bin_index = np.clip(scaled.astype(np.int64), 0, self.bins - 1)
+        flat = bin_index.reshape(len(ratios), n_cells) + np.arange(n_cells) * self.bins
+        self.counts += np.bincount(flat[valid], minlength=n_cells * self.bins).reshape(self.counts.shape)
+
+    def sample_counts(self):
+        """Jumlah sample yang terhitung per series × horizon"""
+        return self.counts.sum(axis=1).reshape(self.shape)
+
+    def quantiles(self, qs):
+        """Quantile rasio (len(qs) × n_series × horizon), interpolasi linear dalam bin"""
+        cumulative = np.cumsum(self.counts, axis=1)
+        cells = np.arange(len(cumulative))
+        width = self.ratio_max / self.bins
+        result = np.empty((len(qs),) + self.shape)
+        for i, q in enumerate(qs):
+            target = q * cumulative[:, -1]
+            # Bin pertama yang cumulative count-nya mencapai target
+            bin_index = np.minimum((cumulative < target[:, None]).sum(axis=1), self.bins - 1)
+            below = np.where(bin_index > 0, cumulative[cells, bin_index - 1], 0)
+            in_bin = self.counts[cells, bin_index]
+            fraction = np.where(in_bin > 0, (target - below) / np.maximum(in_bin, 1), 0.5)
+            result[i] = ((bin_index + fraction) * width).reshape(self.shape)
+        return result
+
+
+def simulate_quantiles(point, residuals, keys, quantiles=DEFAULT_QUANTILES, n_paths=N_PATHS,
+                       chunk_paths=CHUNK_PATHS, base_seed=BASE_SEED):
+    """
+    Simulasi `n_paths` sample path per series dan hitung quantile-nya.
+
+    `point` adalah forecast ekspektasi (n_series × horizon), `residuals`
+    hasil backtest_residuals(). Origin untuk setiap path diambil dari
+    stream random per entity (key + '/intervals'), sehingga hasil satu
+    series tidak bergantung pada series lain. Sample dengan residual NaN
+    tidak dihitung di horizon tersebut (quantile per horizon hanya dari
+    origin yang punya residual); series × horizon tanpa residual sama
+    sekali mendapat interval ±10%.
+
+    Return array (len(quantiles) × n_series × horizon).
+    """
+    n_series, horizon = point.shape
+    has_data = ~np.isnan(residuals).all(axis=2)
+
+    # Index origin per series × path (stream per entity)
+    choices = np.zeros((n_series, n_paths), dtype=np.int64)
+    for row, key in enumerate(keys):
+        usable = np.flatnonzero(has_data[row])
+        if len(usable):
+            rng = entity_rng(f"{key}/intervals", base_seed)
+            choices[row] = usable[rng.integers(0, len(usable), size=n_paths)]
+
+    histogram = QuantileHistogram(n_series, horizon)
+    series_index = np.arange(n_series)[None, :]
+    for start in range(0, n_paths, chunk_paths):
+        chunk = choices[:, start:start + chunk_paths].T
+        ratios = 1 + residuals[series_index, chunk]
+        np.maximum(ratios, 0, out=ratios)
+        histogram.add(ratios)
+
+    result = histogram.quantiles(quantiles) * point[None, :, :]
+
+    # Tanpa residual di horizon tersebut: fallback ke batas tetap ±10%
+    no_samples = histogram.sample_counts() == 0
+    if no_samples.any():
+        spread = np.interp(quantiles, [0, 0.5, 1], [0.9, 1.0, 1.1])
+        fallback = spread[:, None, None] * point[None, :, :]
+        result[:, no_samples] = fallback[:, no_samples]
+    return result
+
+
+def interval_quantiles(cube, level, names, forecast_dates, quantiles=DEFAULT_QUANTILES,
+                       n_paths=N_PATHS, min_days=30, metric='Traffic_Total(TB)', params=None,
+                       base_seed=BASE_SEED, **forecast_options):
+    """
+    Quantile forecast untuk node `names` pada satu level (hasil
+    forecast_level), dengan horizon sama seperti `forecast_dates`.
+    Forecast ekspektasi dihitung ulang tanpa noise dengan opsi yang
+    sama (event_base, same_date_last_year).
+
+    Return array (len(quantiles) × len(names) × horizon).
+    """
+    horizon = len(forecast_dates)
+    indices = np.array([cube.index_of(level, name) for name in names], dtype=np.int64)
+    keys = [entity_key(level, name) for name in names]
+    observed = cube.counts[indices] > 0
+    history = cube.values[indices, :, cube.metric_index(metric)]
+
+    _, point = ensemble_forecast(history, cube.dates, horizon, noise=np.zeros((len(keys), horizon)),
+                                 observed=observed, params=node_params(keys, params),
+                                 **forecast_options)
+    residuals = backtest_residuals(cube, indices, horizon, min_days=min_days,
+                                   metric=metric, params=params)
+    return simulate_quantiles(point, residuals, keys, quantiles, n_paths, base_seed=base_seed)
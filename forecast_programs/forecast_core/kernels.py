@@ -0,0 +1,113 @@
+"""
+FORECAST KERNELS
+================
+Kernel numerik kecil yang dipakai bersama oleh engine dan script
+forecast.
+
+Fungsi:
+  - exponential_smoothing_filter(): rekursi exponential smoothing sebagai
+    filter linear (scipy.signal.lfilter), untuk satu series atau batch
+    series, dengan opsi float32
+  - wma_weights(): bobot eksponensial WMA ter-normalisasi per ukuran window
+  - slope_operator(): vektor slope regresi linear closed-form per ukuran
+    window (slope = window @ operator, setara np.polyfit(x, y, 1)[0])
+
+Bobot dan operator di-memoize per ukuran window dan dikembalikan
+read-only, sehingga dipakai bersama oleh semua series dan pemanggilan.
+"""
+
+import numpy as np
+
+try:
+    from scipy.signal import lfilter
+except ImportError:  # scipy opsional, fallback ke blok matrix NumPy
+    lfilter = None
+
+# Ukuran blok untuk fallback tanpa scipy
+ES_BLOCK_SIZE = 256
+
+_es_block_cache = {}
+_wma_weight_cache = {}
+_slope_operator_cache = {}
+
+
+def _frozen(array):
+    array.flags.writeable = False
+    return array
+
+
+def wma_weights(window):
+    """Bobot WMA exp(linspace(-1, 0, window)) yang sudah dinormalisasi"""
+    if window not in _wma_weight_cache:
+        weights = np.exp(np.linspace(-1, 0, window))
+        _wma_weight_cache[window] = _frozen(weights / weights.sum())
+    return _wma_weight_cache[window]
+
+
+def slope_operator(window):
+    """
+    Operator slope regresi linear untuk window berukuran `window`:
+    (x - mean(x)) / sum((x - mean(x))^2) dengan x = 0..window-1.
+    Untuk window < 2 slope selalu 0.
+    """
+    if window not in _slope_operator_cache:
+        if window < 2:
+            operator = np.zeros(max(window, 0))
+        else:
+            x = np.arange(window) - (window - 1) / 2
+            operator = x / np.dot(x, x)
+        _slope_operator_cache[window] = _frozen(operator)
+    return _slope_operator_cache[window]
+
+
+def _es_block_operators(alpha, block_size, dtype):
+    """Operator blok ES: matrix Toeplitz bawah dan pangkat decay"""
+    key = (alpha, block_size, np.dtype(dtype).str)
+    if key not in _es_block_cache:
+        decay = 1 - alpha
+        lags = np.arange(block_size)[:, None] - np.arange(block_size)[None, :]
+        toeplitz = np.where(lags >= 0, alpha * decay ** np.maximum(lags, 0), 0.0)
+        carry = decay ** np.arange(1, block_size + 1)
+        _es_block_cache[key] = (toeplitz.T.astype(dtype), carry.astype(dtype))
+    return _es_block_cache[key]
+
+
+def _es_blocked(data, alpha):
+    """Fallback ES tanpa scipy: loop per blok (bukan per titik data)"""
+    smoothed = np.empty_like(data)
+    n_days = data.shape[-1]
+    toeplitz_t, carry = _es_block_operators(alpha, ES_BLOCK_SIZE, data.dtype)
+
+    level = data[..., 0]
+    for start in range(0, n_days, ES_BLOCK_SIZE):
+        stop = min(start + ES_BLOCK_SIZE, n_days)
+        size = stop - start
+        block = data[..., start:stop] @ toeplitz_t[:size, :size]
+        smoothed[..., start:stop] = block + level[..., None] * carry[:size]
+        level = smoothed[..., stop - 1]
+
+    return smoothed
+
+
+def exponential_smoothing_filter(data, alpha=0.3, dtype=np.float64):
+    """
+    Exponential smoothing s[t] = alpha * x[t] + (1 - alpha) * s[t-1],
+    dengan s[0] = x[0], dihitung atas axis terakhir.
+
+    `data` bisa 1-D (satu series) atau 2-D (baris = series). Gunakan
+    dtype=np.float32 untuk series panjang (misal data per jam multi-tahun)
+    agar hemat memori.
+    """
+    data = np.asarray(data, dtype=dtype)
+    if data.shape[-1] == 0:
+        return data.copy()
+
+    if lfilter is None:
+        return _es_blocked(data, alpha)
+
+    b = np.array([alpha], dtype=dtype)
+    a = np.array([1.0, -(1 - alpha)], dtype=dtype)
+    # State awal agar s[0] = x[0]
+    zi = ((1 - alpha) * data[..., :1]).astype(dtype)
+    smoothed, _ = lfilter(b, a, data, axis=-1, zi=zi)
+    return smoothed.astype(dtype, copy=False)
@@ -0,0 +1,119 @@
+"""
+BUILD MANIFEST
+==============
+Manifest content-addressed untuk artifact di forecast_results/. Setiap
+artifact (CSV + PNG satu entity) dicatat bersama fingerprint input-nya:
+hash data series, parameter model, dan versi kode. Script hanya
+membangun ulang entity yang fingerprint-nya berubah atau file
+output-nya hilang/diubah.
+
+Input:
+  - Data series, parameter, dan file kode yang memengaruhi artifact
+
+Output:
+  - .forecast_cache/manifest/[scope].json (satu file per script/level)
+
+Fungsi:
+  - fingerprint(): hash stabil dari array, DataFrame, dan parameter
+  - code_version(): hash file kode (script + forecast_core)
+  - BuildManifest: cek artifact up-to-date, catat hasil build
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .data import CACHE_DIR
+
+MANIFEST_DIR = CACHE_DIR / "manifest"
+CORE_DIR = Path(__file__).parent
+
+
+def file_digest(path):
+    """sha256 isi file"""
+    hasher = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            hasher.update(block)
+    return hasher.hexdigest()
+
+
+def _update(hasher, part):
+    if isinstance(part, (pd.DataFrame, pd.Series, pd.Index)):
+        labels = part.columns if isinstance(part, pd.DataFrame) else [part.name]
+        hasher.update(json.dumps([str(c) for c in labels]).encode())
+        hasher.update(pd.util.hash_pandas_object(part, index=False).to_numpy().tobytes())
+    elif isinstance(part, np.ndarray):
+        hasher.update(f"{part.dtype}{part.shape}".encode())
+        hasher.update(np.ascontiguousarray(part).tobytes())
+    else:
+        hasher.update(json.dumps(part, sort_keys=True, default=str).encode())
+
+
+def fingerprint(*parts):
+    """Hash sha256 dari gabungan array, DataFrame, dan nilai JSON-able"""
+    hasher = hashlib.sha256()
+    for part in parts:
+        _update(hasher, part)
+        hasher.update(b'\0')
+    return hasher.hexdigest()
+
+
+def code_version(*paths):
+    """
+    Hash isi file kode: `paths` (biasanya script pemanggil) ditambah
+    semua modul forecast_core. Berubah setiap kali kode diedit.
+    """
+    files = [Path(p) for p in paths] + sorted(CORE_DIR.glob("*.py"))
+    hasher = hashlib.sha256()
+    for path in files:
+        hasher.update(path.name.encode())
+        hasher.update(file_digest(path).encode())
+    return hasher.hexdigest()
+
+
+class BuildManifest:
+    """
+    Manifest build untuk satu scope (misal 'kabupaten').
+
+    Entry per key: fingerprint input + sha256 setiap file output.
+    Artifact dianggap up-to-date jika fingerprint sama dan semua file
+    output masih ada dengan isi yang sama seperti saat dicatat.
+    """
+
+    def __init__(self, scope, directory=MANIFEST_DIR):
+        self.path = Path(directory) / f"{scope}.json"
+        self.entries = {}
+        if self.path.exists():
+            try:
+                self.entries = json.loads(self.path.read_text())
+            except (OSError, ValueError):
+                self.entries = {}
+
+    def is_current(self, key, key_fingerprint):
+        entry = self.entries.get(key)
+        if entry is None or entry['fingerprint'] != key_fingerprint:
+            return False
+        for path, digest in entry['outputs'].items():
+            if not Path(path).exists() or file_digest(path) != digest:
+                return False
+        return True
+
+    def record(self, key, key_fingerprint, outputs):
+        self.entries[key] = {
+            'fingerprint': key_fingerprint,
+            'outputs': {str(path): file_digest(path) for path in outputs},
+        }
+
+    def discard(self, key):
+        self.entries.pop(key, None)
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.json.tmp')
+        tmp_path.write_text(json.dumps(self.entries, indent=1, sort_keys=True))
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,125 @@
+"""
+PARALLEL EXECUTION
+==================
+Helper untuk menjalankan pekerjaan per entity (kabupaten/provinsi/
+regional) di ProcessPoolExecutor. Cube teragregasi ditulis sekali ke
+file .npy di cache dan dibuka worker sebagai memory-mapped array,
+sehingga tidak di-pickle ulang untuk setiap task.
+
+Input:
+  - TrafficCube dari cube.load_cube()
+
+Output:
+  - Hasil fungsi per entity, berurutan sesuai input
+
+Fungsi:
+  - SharedArrays: tulis array bersama ke cache dan hapus setelah selesai
+  - share_cube() / attach_cube(): kirim TrafficCube ke worker via mmap
+  - init_shared_cube() / shared_cube(): cube aktif di dalam worker
+  - run_parallel(): map fungsi atas entity, serial jika workers <= 1
+"""
+
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .cube import TrafficCube, load_cube
+from .data import CACHE_DIR
+
+# Cube yang di-attach oleh initializer worker (kosong di proses utama)
+_shared = {}
+
+
+class SharedArrays:
+    """
+    Context manager: tulis array NumPy ke direktori sementara di cache
+    dan hapus lagi setelah selesai. Nilai `with` berupa dict nama → path
+    yang aman di-pickle ke worker.
+    """
+
+    def __init__(self, arrays, cache_dir=CACHE_DIR):
+        self.arrays = arrays
+        self.cache_dir = Path(cache_dir)
+        self.directory = None
+
+    def __enter__(self):
+        shared_root = self.cache_dir / "shared"
+        shared_root.mkdir(parents=True, exist_ok=True)
+        self.directory = Path(tempfile.mkdtemp(dir=shared_root))
+
+        handle = {}
+        for name, array in self.arrays.items():
+            path = self.directory / f"{name}.npy"
+            np.save(path, np.ascontiguousarray(array))
+            handle[name] = str(path)
+        return handle
+
+    def __exit__(self, *exc):
+        shutil.rmtree(self.directory, ignore_errors=True)
+        return False
+
+
+def share_cube(cube, cache_dir=CACHE_DIR):
+    """
+    Siapkan TrafficCube untuk worker.
+
+    Return (SharedArrays, meta). Array besar (values, counts, dates)
+    ditulis sebagai .npy; meta berisi node dan nama metric yang ikut
+    di-pickle sekali ke initializer worker.
+    """
+    arrays = {
+        'values': cube.values,
+        'counts': cube.counts,
+        'dates': cube.dates.values.astype('datetime64[ns]').view('int64'),
+    }
+    meta = {'metrics': cube.metrics, 'nodes': cube.nodes.to_dict('list')}
+    return SharedArrays(arrays, cache_dir), meta
+
+
+def attach_cube(handle, meta):
+    """Rekonstruksi TrafficCube dari array bersama (mmap read-only)"""
+    arrays = {name: np.load(path, mmap_mode='r') for name, path in handle.items()}
+    dates = pd.DatetimeIndex(np.asarray(arrays['dates']).view('datetime64[ns]'))
+    return TrafficCube(dates, meta['metrics'], pd.DataFrame(meta['nodes']),
+                       arrays['values'], arrays['counts'])
+
+
+def init_shared_cube(handle, meta):
+    """Initializer ProcessPoolExecutor: attach cube bersama sekali per worker"""
+    _shared['cube'] = attach_cube(handle, meta)
+
+
+def shared_cube():
+    """Cube bersama di worker, atau load_cube() di proses utama"""
+    return _shared.get('cube') or load_cube()
+
+
+def run_parallel(func, items, workers=1, cube=None):
+    """
+    Jalankan func(item) untuk setiap item; hasil di-yield sesuai urutan
+    items sehingga progress bisa dicetak oleh proses utama.
+
+    Dengan workers <= 1 semuanya berjalan di proses ini. Jika `cube`
+    diberikan, cube dibagikan ke worker lewat memory-mapped file dan
+    tersedia di worker melalui shared_cube().
+    """
+    items = list(items)
+    if workers <= 1:
+        for item in items:
+            yield func(item)
+        return
+
+    if cube is None:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            yield from executor.map(func, items)
+        return
+
+    shared, meta = share_cube(cube)
+    with shared as handle:
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_shared_cube,
+                                 initargs=(handle, meta)) as executor:
+            yield from executor.map(func, items)
@@ -0,0 +1,66 @@
+"""
+ENSEMBLE PARAMETERS
+===================
+Parameter ensemble per node hierarki: window MA, window WMA, alpha
+Exponential Smoothing, dan damping trend. Node tanpa parameter hasil
+tuning memakai DEFAULT_PARAMS (nilai asli script forecast).
+
+Input:
+  - forecast_params.json (hasil tune_parameters.py, opsional)
+
+Output:
+  - Parameter per node sebagai array sejajar dengan daftar key entity
+
+Fungsi:
+  - load_params(): baca parameter hasil tuning (kosong jika belum ada)
+  - save_params(): simpan parameter hasil tuning
+  - node_params(): array parameter untuk daftar key entity
+  - params_version(): hash file parameter (untuk fingerprint build)
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+
+PARAMS_FILE = "forecast_params.json"
+DEFAULT_PARAMS = {'ma_window': 7, 'wma_window': 14, 'alpha': 0.3, 'damping': 0.5}
+PARAM_NAMES = list(DEFAULT_PARAMS)
+
+
+def load_params(path=PARAMS_FILE):
+    """Mapping key entity (misal 'kabupaten/ALOR') → dict parameter"""
+    path = Path(path)
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text())['params']
+
+
+def save_params(params, path=PARAMS_FILE, **meta):
+    """Simpan mapping key → parameter (ditulis atomik) beserta metadata tuning"""
+    path = Path(path)
+    payload = dict(meta, defaults=DEFAULT_PARAMS, params=params)
+    tmp_path = path.with_name(path.name + '.tmp')
+    tmp_path.write_text(json.dumps(payload, indent=1, sort_keys=True))
+    os.replace(tmp_path, path)
+
+
+def node_params(keys, params=None):
+    """
+    Parameter untuk setiap key sebagai dict nama → array (len(keys),).
+    `params` default ke hasil load_params(); key yang tidak ada memakai
+    DEFAULT_PARAMS.
+    """
+    params = load_params() if params is None else params
+    rows = [dict(DEFAULT_PARAMS, **params.get(key, {})) for key in keys]
+    return {name: np.array([row[name] for row in rows]) for name in PARAM_NAMES}
+
+
+def params_version(path=PARAMS_FILE):
+    """sha256 file parameter ('default' jika belum ada hasil tuning)"""
+    path = Path(path)
+    if not path.exists():
+        return 'default'
+    return hashlib.sha256(path.read_bytes()).hexdigest()
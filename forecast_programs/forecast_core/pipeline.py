@@ -0,0 +1,242 @@
+"""
+PIPELINE SCHEDULER
+==================
+Scheduler DAG untuk menjalankan program forecast, visualisasi, dan
+analisis dalam satu proses Python. Setiap stage mendeklarasikan file
+input dan output-nya; dependensi antar stage diturunkan dari sana
+(output stage A dipakai sebagai input stage B → B menunggu A).
+
+Input:
+  - Daftar Stage (lihat run_all_forecasts.py)
+
+Output:
+  - Output masing-masing stage di forecast_results/
+  - .forecast_cache/pipeline_state.json (fingerprint run terakhir yang sukses)
+
+Fungsi:
+  - Stage: deklarasi satu langkah pipeline (modul, input, output)
+  - stage_fingerprint(): hash isi input + kode + parameter stage
+  - run_pipeline(): jalankan stage yang siap secara paralel, skip yang up-to-date
+"""
+
+import contextlib
+import glob
+import hashlib
+import importlib
+import json
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from fnmatch import fnmatch
+from pathlib import Path
+
+from .data import CACHE_DIR, WORKBOOK_FILE, workbook_fingerprint
+from .manifest import code_version
+
+PIPELINE_STATE = "pipeline_state.json"
+
+
+class Stage:
+    """
+    Satu langkah pipeline: modul script dengan fungsi main().
+
+    `inputs`/`outputs` berupa path atau glob relatif terhadap root repo.
+    `after` memaksa urutan terhadap stage lain (misal dua stage yang
+    menulis file yang sama). Stage `optional` yang gagal tidak
+    menghentikan pipeline; hanya stage turunannya yang dilewati.
+    """
+
+    def __init__(self, name, module, description, inputs=(), outputs=(),
+                 after=(), params=None, optional=False):
+        self.name = name
+        self.module = module
+        self.description = description
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.after = list(after)
+        self.params = dict(params or {})
+        self.optional = optional
+
+    def __repr__(self):
+        return f"Stage({self.name!r})"
+
+
+def _patterns_overlap(a, b):
+    """True jika dua path/glob bisa menunjuk file yang sama"""
+    return a == b or fnmatch(a, b) or fnmatch(b, a)
+
+
+def stage_dependencies(stages):
+    """Mapping nama stage → set nama stage yang harus selesai lebih dulu"""
+    deps = {stage.name: set(stage.after) for stage in stages}
+    for consumer in stages:
+        for producer in stages:
+            if producer is consumer:
+                continue
+            if any(_patterns_overlap(i, o) for i in consumer.inputs for o in producer.outputs):
+                deps[consumer.name].add(producer.name)
+    return deps
+
+
+def _hash_file(hasher, path):
+    if Path(path).name == WORKBOOK_FILE:
+        # Workbook besar: pakai sha256 yang sudah di-cache oleh data layer
+        hasher.update(workbook_fingerprint(path)['sha256'].encode())
+        return
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            hasher.update(block)
+
+
+def stage_fingerprint(stage, script_dir):
+    """
+    Hash isi semua file input, kode stage (script + forecast_core) dan
+    parameter. Berubah jika salah satu dari itu berubah.
+    """
+    hasher = hashlib.sha256()
+    for pattern in stage.inputs:
+        for path in sorted(glob.glob(pattern)):
+            hasher.update(path.encode())
+            _hash_file(hasher, path)
+
+    hasher.update(code_version(Path(script_dir) / f"{stage.module}.py").encode())
+
+    hasher.update(json.dumps(stage.params, sort_keys=True).encode())
+    return hasher.hexdigest()
+
+
+def _outputs_exist(stage):
+    return all(glob.glob(pattern) for pattern in stage.outputs)
+
+
+def _load_state(cache_dir):
+    path = Path(cache_dir) / PIPELINE_STATE
+    if not path.exists():
+        return {}
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_state(cache_dir, state):
+    path = Path(cache_dir) / PIPELINE_STATE
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(state, indent=2, sort_keys=True))
+
+
+def _run_stage(module, params, log_file=None):
+    """Import modul stage dan panggil main(**params); return (ok, detik, error)"""
+    start = time.perf_counter()
+    with contextlib.ExitStack() as stack:
+        if log_file is not None:
+            Path(log_file).parent.mkdir(parents=True, exist_ok=True)
+            log = stack.enter_context(open(log_file, 'w', encoding='utf-8'))
+            stack.enter_context(contextlib.redirect_stdout(log))
+            stack.enter_context(contextlib.redirect_stderr(log))
+        try:
+            importlib.import_module(module).main(**params)
+        except BaseException:
+            return False, time.perf_counter() - start, traceback.format_exc()
+    return True, time.perf_counter() - start, None
+
+
+def run_pipeline(stages, script_dir, jobs=1, force=False, cache_dir=CACHE_DIR):
+    """
+    Jalankan semua stage sesuai urutan dependensi.
+
+    - Stage yang dependensinya sudah selesai dijalankan bersamaan
+      (maks `jobs` proses). Dengan jobs=1 semua berjalan di proses ini.
+    - Stage dilewati jika fingerprint input/kode/parameter sama dengan
+      run sukses terakhir dan semua output masih ada (kecuali force).
+    - Jika stage wajib gagal, tidak ada stage baru yang dimulai.
+
+    Return dict nama stage → status ('done', 'skipped', 'failed', 'blocked').
+    """
+    deps = stage_dependencies(stages)
+    by_name = {stage.name: stage for stage in stages}
+    unknown = {dep for names in deps.values() for dep in names} - set(by_name)
+    if unknown:
+        raise ValueError(f"Stage tidak dikenal di 'after': {sorted(unknown)}")
+
+    state = _load_state(cache_dir)
+    status = {}
+    pending = [stage.name for stage in stages]
+    running = {}
+    aborted = False
+    log_dir = Path(cache_dir) / "logs"
+
+    def finish(name, result, fingerprint):
+        ok, seconds, error = result
+        stage = by_name[name]
+        if ok:
+            status[name] = 'done'
+            state[name] = {'fingerprint': fingerprint, 'seconds': round(seconds, 2)}
+            _save_state(cache_dir, state)
+            print(f"\n✓ {name} selesai ({seconds:.1f} detik)")
+            return False
+        status[name] = 'failed'
+        state.pop(name, None)
+        _save_state(cache_dir, state)
+        print(f"\n✗ Error menjalankan {name} ({stage.module}.py)")
+        print(error.rstrip())
+        if jobs > 1:
+            print(f"  Log: {log_dir / (name + '.log')}")
+        return not stage.optional
+
+    executor = ProcessPoolExecutor(max_workers=jobs) if jobs > 1 else None
+    try:
+        while True:
+            progressed = False
+            # Submit semua stage yang dependensinya sudah selesai
+            for name in list(pending):
+                if aborted:
+                    break
+                stage = by_name[name]
+                dep_status = [status.get(dep) for dep in deps[name]]
+                if any(s in ('failed', 'blocked') for s in dep_status):
+                    pending.remove(name)
+                    progressed = True
+                    status[name] = 'blocked'
+                    print(f"\n⚠️  {name} dilewati (stage sebelumnya gagal)")
+                    continue
+                if not all(s in ('done', 'skipped') for s in dep_status):
+                    continue
+
+                pending.remove(name)
+                progressed = True
+                fingerprint = stage_fingerprint(stage, script_dir)
+                if (not force and _outputs_exist(stage)
+                        and state.get(name, {}).get('fingerprint') == fingerprint):
+                    status[name] = 'skipped'
+                    print(f"\n⏭  {name}: input tidak berubah, skip")
+                    continue
+
+                print(f"\n▶ Menjalankan: {stage.module}.py")
+                print(f"  {stage.description}")
+                if executor is None:
+                    aborted = finish(name, _run_stage(stage.module, stage.params), fingerprint)
+                else:
+                    log_file = log_dir / f"{name}.log"
+                    future = executor.submit(_run_stage, stage.module, stage.params, str(log_file))
+                    running[future] = (name, fingerprint)
+
+            if not running:
+                if not pending or aborted:
+                    break
+                if not progressed:
+                    raise ValueError(f"Dependensi siklik antar stage: {pending}")
+                continue
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name, fingerprint = running.pop(future)
+                if finish(name, future.result(), fingerprint):
+                    aborted = True
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    for name in pending:
+        status[name] = 'blocked'
+    return status
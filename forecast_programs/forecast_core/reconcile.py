@@ -0,0 +1,238 @@
+"""
+HIERARCHICAL RECONCILIATION
+===========================
+Membuat forecast semua level hierarki (total, regional, provinsi,
+kabupaten) koheren: setiap parent sama dengan jumlah child-nya.
+
+Hierarki dinyatakan sebagai summing matrix S (node × kabupaten) dengan
+baris dalam urutan node cube; forecast koheren selalu berbentuk
+S @ forecast_kabupaten. Semua metode bekerja pada matrix forecast
+(node × horizon) sekaligus, jadi satu solve untuk semua horizon.
+
+Input:
+  - TrafficCube dari cube.load_cube()
+  - Base forecast per node: forecast yang dipublikasikan di results store
+    (ditulis script forecast_01..04, dengan opsi masing-masing level)
+
+Output:
+  - Forecast koheren (node × horizon) untuk setiap metode
+
+Fungsi:
+  - summing_matrix(): S sparse (scipy.sparse CSR) dari mapping parent cube
+  - bottom_up(): jumlahkan forecast kabupaten ke atas
+  - top_down(): pecah forecast total dengan proporsi historis
+  - mint(): MinT dengan matrix bobot diagonal (WLS), satu sparse solve
+  - mint_weights(): bobot MinT dari variance error backtest 1 hari
+    atau struktural (jumlah kabupaten per node)
+  - reconcile(): dispatch metode untuk base forecast
+  - stored_base(): matrix base forecast (node × tanggal) dari results store
+  - reconciled_forecasts(): base forecast semua level + rekonsiliasi
+
+MinT memakai W diagonal (varian MinT WLS) supaya S' W^-1 S tetap sparse;
+kovarians penuh antar node tidak diestimasi.
+"""
+
+import numpy as np
+import pandas as pd
+
+try:
+    from scipy import sparse
+    from scipy.sparse.linalg import splu
+except ImportError:  # scipy opsional, fallback ke matrix dense NumPy
+    sparse = None
+
+from .backtest import origin_forecasts
+from .cube import LEVELS
+from .results import read_results
+
+METHODS = ['bottom_up', 'top_down', 'mint']
+BOTTOM_LEVEL = LEVELS[-1]
+
+# Script yang menulis forecast setiap level ke results store
+LEVEL_SCRIPTS = {
+    'total': 'forecast_01_main_total.py',
+    'regional': 'forecast_03_by_regional.py',
+    'provinsi': 'forecast_02_by_province.py',
+    'kabupaten': 'forecast_04_by_kabupaten.py',
+}
+
+
+def summing_matrix(cube):
+    """
+    Summing matrix S (jumlah node × jumlah kabupaten): S[i, j] = 1 jika
+    kabupaten j berada di bawah node i (termasuk dirinya sendiri).
+    Sparse CSR jika scipy tersedia, selain itu array dense.
+    """
+    levels = cube.nodes['level'].to_numpy()
+    parents = cube.nodes['parent'].to_numpy()
+
+    rows, cols = [], []
+    for col, node in enumerate(cube.level_indices(BOTTOM_LEVEL)):
+        # Naik dari kabupaten sampai total
+        while True:
+            rows.append(node)
+            cols.append(col)
+            depth = LEVELS.index(levels[node])
+            if depth == 0:
+                break
+            node = cube.index_of(LEVELS[depth - 1], parents[node])
+
+    shape = (len(cube.nodes), len(cube.level_indices(BOTTOM_LEVEL)))
+    if sparse is None:
+        matrix = np.zeros(shape)
+        matrix[rows, cols] = 1.0
+        return matrix
+    return sparse.csr_matrix((np.ones(len(rows)), (rows, cols)), shape=shape)
+
+
+def bottom_up(S, base, bottom):
+    """Forecast koheren dari forecast kabupaten (`bottom` = index baris kabupaten)"""
+    return S @ base[bottom]
+
+
+def top_down(S, base, proportions, top=0):
+    """
+    Top-down proporsional: forecast total (baris `top`) dibagi ke
+    kabupaten dengan `proportions`, lalu dijumlahkan ke atas.
+    """
+    return S @ (proportions[:, None] * base[top][None, :])
+
+
+def historical_proportions(cube, window=None, metric='Traffic_Total(TB)'):
+    """
+    Rata-rata proporsi harian kabupaten terhadap total (Gross-Sohl
+    metode A) atas `window` hari terakhir (default seluruh history).
+    Hari tanpa data total tidak dihitung.
+    """
+    metric_index = cube.metric_index(metric)
+    bottom = cube.values[cube.level_indices(BOTTOM_LEVEL), :, metric_index]
+    total = cube.values[cube.level_indices(LEVELS[0])[0], :, metric_index]
+    days = np.flatnonzero(total > 0)
+    if window is not None:
+        days = days[-window:]
+
+    proportions = (bottom[:, days] / total[days]).mean(axis=1)
+    return proportions / proportions.sum()
+
+
+def mint(S, base, weights):
+    """
+    MinT dengan W = diag(weights):
+    y~ = S (S' W^-1 S)^-1 S' W^-1 y^ untuk semua horizon sekaligus.
+    """
+    inverse = 1.0 / np.asarray(weights, dtype=float)
+    rhs = S.T @ (base * inverse[:, None])
+    if sparse is None:
+        bottom = np.linalg.solve(S.T @ (S * inverse[:, None]), rhs)
+    else:
+        normal = (S.T @ sparse.diags(inverse) @ S).tocsc()
+        bottom = splu(normal).solve(rhs)
+    return S @ bottom
+
+
+def mint_weights(cube, S, kind='variance', min_train=60, min_days=30,
+                 metric='Traffic_Total(TB)', params=None):
+    """
+    Diagonal W untuk mint().
+
+    kind='variance': mean squared error forecast 1 hari ke depan dari
+    rolling-origin backtest per node (node tanpa error backtest memakai
+    bobot terbesar). kind='structural': jumlah kabupaten di bawah node.
+    """
+    structural = np.asarray(S.sum(axis=1)).ravel()
+    if kind == 'structural':
+        return structural
+    if kind != 'variance':
+        raise ValueError(f"bobot MinT tidak dikenal: {kind!r}")
+
+    squared = np.zeros(len(cube.nodes))
+    count = np.zeros(len(cube.nodes))
+    for _, rows, steps, predicted, actual, valid in origin_forecasts(
+            cube, horizon=1, min_train=min_train, min_days=min_days,
+            metric=metric, params=params):
+        error = np.where(valid, predicted - actual, 0.0)[:, 0]
+        squared[rows] += error ** 2
+        count[rows] += valid[:, 0]
+
+    usable = count > 0
+    weights = np.full(len(cube.nodes), np.nan)
+    weights[usable] = squared[usable] / count[usable]
+    positive = weights[usable & (weights > 0)]
+    fallback = positive.max() if len(positive) else 1.0
+    return np.where(np.isnan(weights) | (weights <= 0), fallback, weights)
+
+
+def reconcile(cube, base, method='mint', S=None, weights='variance', proportions=None,
+              **weight_options):
+    """
+    Rekonsiliasi `base` (node cube × horizon) dengan metode 'bottom_up',
+    'top_down', atau 'mint'. `weights` untuk MinT bisa berupa array
+    bobot per node atau jenis bobot mint_weights().
+    """
+    S = summing_matrix(cube) if S is None else S
+    if method == 'bottom_up':
+        return bottom_up(S, base, cube.level_indices(BOTTOM_LEVEL))
+    if method == 'top_down':
+        proportions = historical_proportions(cube) if proportions is None else proportions
+        return top_down(S, base, proportions, cube.level_indices(LEVELS[0])[0])
+    if method == 'mint':
+        if isinstance(weights, str):
+            weights = mint_weights(cube, S, weights, **weight_options)
+        return mint(S, base, weights)
+    raise ValueError(f"metode rekonsiliasi tidak dikenal: {method!r}")
+
+
+def stored_base(cube, metric='Traffic_Total(TB)'):
+    """
+    Base forecast semua level dari results store, disusun dalam urutan
+    node cube × tanggal forecast. Hanya tanggal yang ada di semua level
+    yang dipakai. Node yang tidak ada di store (data < min_days saat
+    forecast) mendapat base forecast 0; nama di store yang tidak ada di
+    cube (store dari data lama) memunculkan ValueError.
+
+    Return (forecast_dates, base).
+    """
+    df = read_results(columns=[metric])
+    if df.empty:
+        raise ValueError("results store kosong, jalankan script forecast_01..04 dulu")
+
+    level_dates = [set(dates) for _, dates in df.groupby('Level')['Date']]
+    forecast_dates = pd.DatetimeIndex(sorted(set.intersection(*level_dates)))
+    df = df[df['Date'].isin(forecast_dates)]
+    nodes = df[['Level', 'Name']].drop_duplicates()
+    unknown = {}
+    for level, names in nodes.groupby('Level')['Name']:
+        missing = sorted(set(names) - set(cube.level_names(level)))
+        if missing:
+            unknown[level] = missing
+    if unknown:
+        rerun = ', '.join(f"{LEVEL_SCRIPTS.get(level, level)} ({level}: {names})"
+                          for level, names in unknown.items())
+        raise ValueError(f"results store berisi nama yang tidak ada di data terbaru, "
+                         f"jalankan ulang: {rerun}")
+    node_rows = pd.Series([cube.index_of(level, name) for level, name in nodes.itertuples(index=False)],
+                          index=pd.MultiIndex.from_frame(nodes))
+
+    base = np.zeros((len(cube.nodes), len(forecast_dates)))
+    rows = node_rows.reindex(pd.MultiIndex.from_frame(df[['Level', 'Name']])).to_numpy()
+    base[rows, forecast_dates.get_indexer(df['Date'])] = df[metric].to_numpy()
+    return forecast_dates, base
+
+
+def reconciled_forecasts(cube, methods=METHODS, weights='variance', min_days=30, params=None,
+                         metric='Traffic_Total(TB)'):
+    """
+    Base forecast semua level dari results store (stored_base(), yaitu
+    forecast yang dipublikasikan, termasuk opsi event khusus total),
+    lalu direkonsiliasi dengan setiap metode di `methods`.
+
+    Return (forecast_dates, base, dict metode → forecast koheren).
+    """
+    forecast_dates, base = stored_base(cube, metric)
+
+    S = summing_matrix(cube)
+    if 'mint' in methods and isinstance(weights, str):
+        weights = mint_weights(cube, S, weights, min_days=min_days, metric=metric, params=params)
+    reconciled = {method: reconcile(cube, base, method, S=S, weights=weights)
+                  for method in methods}
+    return forecast_dates, base, reconciled
@@ -0,0 +1,569 @@
+"""
+CHART RENDER FARM
+=================
+Render chart forecast per entity (regional, provinsi, kabupaten) lepas
+dari proses forecast. Setiap chart dinyatakan sebagai spesifikasi kecil
+(array tanggal/nilai + label + layout) yang murah di-pickle, lalu
+dirender oleh pool worker process dengan backend Agg. Waktu render
+setiap chart diukur di worker dan dikembalikan ke proses utama.
+
+Karena chart hanya butuh history (cube) dan forecast (results store),
+chart bisa dirender bersamaan dengan atau setelah angka forecast dibuat,
+misal sebagai stage pipeline terpisah.
+
+Input:
+  - TrafficCube dari cube.load_cube()
+  - Forecast dari results store (results.read_results())
+
+Output:
+  - forecast_results/[02_regional|03_provinsi|04_kabupaten]/[nama]_forecast.png
+    (atau .webp), opsional thumbnail di subfolder thumbs/
+
+Profil render: draft (dpi rendah, tanpa bbox tight), report (slide),
+print (300 dpi, default). Format: png, png-optimized (palet 256 warna),
+atau webp.
+
+Fungsi:
+  - render_options(): opsi profil render, format gambar, thumbnail
+  - add_render_arguments(): argumen CLI opsi render untuk script
+  - chart_path() / thumbnail_path(): path gambar chart satu entity
+  - forecast_chart_spec(): spesifikasi chart dari data harian + forecast
+  - ForecastChartTemplate: figure chart forecast yang dibangun sekali per
+    worker; entity berikutnya hanya mengganti data, bin, dan teks tabel,
+    bagian statis di-cache sebagai raster
+  - forecast_chart_template(): template chart forecast per layout
+  - save_figure(): simpan figure sesuai profil/format (+ thumbnail)
+  - render_chart(): render satu spesifikasi (Agg) dan ukur waktunya
+  - RenderQueue: antrian spesifikasi ke pool worker render
+  - render_charts(): render daftar spesifikasi, serial jika workers <= 1
+  - level_chart_specs(): spesifikasi chart satu level dari store + cube
+  - render_level_charts(): render chart yang berubah, dicatat di manifest
+  - materialize_charts(): chart on-demand untuk nama yang diminta (cache)
+"""
+
+import io
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import matplotlib
+import matplotlib.image
+import numpy as np
+import pandas as pd
+from PIL import Image
+
+from .cube import load_cube
+from .manifest import BuildManifest, code_version, fingerprint
+from .results import results_by_name, stored_names
+
+CHART_DIRS = {
+    'regional': Path("forecast_results/02_regional"),
+    'provinsi': Path("forecast_results/03_provinsi"),
+    'kabupaten': Path("forecast_results/04_kabupaten"),
+}
+
+# Layout chart per level (provinsi memakai figure lebih tinggi)
+CHART_LAYOUTS = {
+    'regional': {'figsize': (20, 10), 'title_fontsize': 18},
+    'provinsi': {'figsize': (20, 12), 'title_fontsize': 16},
+    'kabupaten': {'figsize': (20, 10), 'title_fontsize': 18},
+}
+
+# Profil render: resolusi dan bbox tight (tight = figure digambar dua kali)
+RENDER_PROFILES = {
+    'draft': {'dpi': 80, 'tight': False},
+    'report': {'dpi': 150, 'tight': True},
+    'print': {'dpi': 300, 'tight': True},
+}
+DEFAULT_PROFILE = 'print'
+
+# Format gambar → ekstensi file (png-optimized: palet 256 warna + zlib maksimum)
+IMAGE_FORMATS = {'png': '.png', 'png-optimized': '.png', 'webp': '.webp'}
+# WebP lossless: teks chart tetap tajam, lebih kecil dari lossy kualitas 90
+WEBP_OPTIONS = {'lossless': True, 'method': 6}
+THUMBNAIL_WIDTH = 480
+THUMBNAIL_DIR = 'thumbs'
+
+METRIC = 'Traffic_Total(TB)'
+HISTORY_BINS = 30
+FORECAST_BINS = 20
+SECTION_HEADERS = ('HISTORICAL:', 'FORECAST:', 'COMPARISON:')
+
+
+def render_options(profile=DEFAULT_PROFILE, image_format='png', thumbnails=False):
+    """
+    Opsi penyimpanan chart: profil (draft/report/print → dpi, bbox
+    tight), format gambar, dan apakah thumbnail ikut dibuat.
+    """
+    if profile not in RENDER_PROFILES:
+        raise ValueError(f"profil render tidak dikenal: {profile!r}")
+    if image_format not in IMAGE_FORMATS:
+        raise ValueError(f"format gambar tidak dikenal: {image_format!r}")
+    return {'profile': profile, **RENDER_PROFILES[profile],
+            'format': image_format, 'thumbnails': bool(thumbnails)}
+
+
+def add_render_arguments(parser):
+    """Argumen CLI --profile, --format, --thumbnails untuk script yang merender chart"""
+    parser.add_argument('--profile', choices=list(RENDER_PROFILES), default=DEFAULT_PROFILE,
+                        help="Profil render chart: draft (80 dpi, tanpa bbox tight), "
+                             "report (150 dpi, slide), print (300 dpi, default)")
+    parser.add_argument('--format', dest='image_format', choices=list(IMAGE_FORMATS), default='png',
+                        help="Format gambar chart (default: png; PPT butuh png/png-optimized)")
+    parser.add_argument('--thumbnails', action='store_true',
+                        help=f"Buat juga thumbnail lebar {THUMBNAIL_WIDTH}px di subfolder {THUMBNAIL_DIR}/")
+
+
+def chart_path(level, name, image_format='png'):
+    """Path chart forecast, misal 04_kabupaten/kota_surabaya_forecast.png"""
+    stem = f"{name.lower().replace(' ', '_')}_forecast"
+    return CHART_DIRS[level] / (stem + IMAGE_FORMATS[image_format])
+
+
+def thumbnail_path(path):
+    """Path thumbnail chart: subfolder thumbs/ di samping gambar penuh"""
+    path = Path(path)
+    return path.parent / THUMBNAIL_DIR / path.name
+
+
+def chart_outputs(spec):
+    """File yang dihasilkan render_chart() untuk `spec` (gambar + thumbnail)"""
+    path = Path(spec['path'])
+    return [path, thumbnail_path(path)] if spec['thumbnails'] else [path]
+
+
+def forecast_chart_spec(level, name, daily_data, df_forecast, metric=METRIC, options=None):
+    """
+    Spesifikasi chart forecast satu entity: hanya kolom yang digambar
+    (sebagai array NumPy), judul, path output, layout level, dan opsi
+    render (default render_options()).
+    """
+    options = render_options() if options is None else options
+    return {
+        'kind': 'forecast',
+        'name': name,
+        'path': str(chart_path(level, name, options['format'])),
+        'history_dates': daily_data['Date'].to_numpy(),
+        'history': daily_data[metric].to_numpy(dtype=float),
+        'forecast_dates': pd.to_datetime(df_forecast['Date']).to_numpy(),
+        'forecast': df_forecast[metric].to_numpy(dtype=float),
+        'lower': df_forecast['Lower_Bound'].to_numpy(dtype=float),
+        'upper': df_forecast['Upper_Bound'].to_numpy(dtype=float),
+        **CHART_LAYOUTS[level],
+        **options,
+    }
+
+
+def statistics_table(history, forecast):
+    """Baris tabel STATISTICS SUMMARY (17 baris × 2 kolom)"""
+    hist_mean, fore_mean = history.mean(), forecast.mean()
+    return [
+        ['HISTORICAL:', ''],
+        ['  • Data Points', f': {len(history)} hari'],
+        ['  • Mean Traffic', f': {hist_mean:,.2f} TB/hari'],
+        ['  • Std Deviation', f': {history.std(ddof=1):,.2f} TB'],
+        ['  • Min Traffic', f': {history.min():,.2f} TB'],
+        ['  • Max Traffic', f': {history.max():,.2f} TB'],
+        ['', ''],
+        ['FORECAST:', ''],
+        ['  • Data Points', f': {len(forecast)} hari'],
+        ['  • Mean Traffic', f': {fore_mean:,.2f} TB/hari'],
+        ['  • Std Deviation', f': {forecast.std(ddof=1):,.2f} TB'],
+        ['  • Min Traffic', f': {forecast.min():,.2f} TB'],
+        ['  • Max Traffic', f': {forecast.max():,.2f} TB'],
+        ['', ''],
+        ['COMPARISON:', ''],
+        ['  • Mean Change', f': {fore_mean - hist_mean:+,.2f} TB'],
+        ['  • Percentage', f': {((fore_mean - hist_mean)/hist_mean)*100:+.2f}%'],
+    ]
+
+
+class ForecastChartTemplate:
+    """
+    Figure chart forecast yang dibangun sekali lalu dipakai ulang:
+    time series historical + forecast dengan interval (atas), tabel
+    statistik (kiri bawah), distribusi (kanan bawah).
+
+    Konstruksi figure, GridSpec, tabel 17 baris dan styling sel hanya
+    dilakukan di __init__; update() untuk entity berikutnya hanya
+    mengganti data garis, area interval, tinggi/posisi bar histogram,
+    teks sel tabel, label legend dan judul, lalu menghitung ulang batas
+    axis.
+
+    raster() menggambar figure tanpa bbox tight: bagian yang sama untuk
+    semua entity (sel dan label tabel, judul panel statistik) digambar
+    sekali per dpi lalu di-blit, hanya panel time series, distribusi,
+    judul, dan kolom nilai tabel yang digambar ulang. Hasilnya identik
+    per pixel dengan savefig() figure baru.
+    """
+
+    def __init__(self, spec):
+        import matplotlib.pyplot as plt
+
+        history, forecast = spec['history'], spec['forecast']
+        last_historical_date = pd.Timestamp(spec['history_dates'].max())
+
+        fig = plt.figure(figsize=spec['figsize'])
+        gs = fig.add_gridspec(2, 2, hspace=0.3, wspace=0.25)
+
+        self.title = fig.suptitle(self.title_text(spec),
+                                  fontsize=spec['title_fontsize'], fontweight='bold', y=0.98)
+
+        # Plot 1: Full Time Series
+        ax1 = fig.add_subplot(gs[0, :])
+
+        self.history_line, = ax1.plot(spec['history_dates'], history,
+                                      'o-', color='#2E86AB', linewidth=2, markersize=3,
+                                      label='Historical', alpha=0.8)
+        self.forecast_line, = ax1.plot(spec['forecast_dates'], forecast,
+                                       'o-', color='#E63946', linewidth=2, markersize=3,
+                                       label='Forecast', alpha=0.8)
+
+        self.interval = ax1.fill_between(spec['forecast_dates'], spec['lower'], spec['upper'],
+                                         alpha=0.2, color='#E63946', label='Confidence Interval')
+
+        self.last_line = ax1.axvline(last_historical_date, color='green', linestyle='--',
+                                     linewidth=2, alpha=0.7,
+                                     label=f'Last Historical: {last_historical_date.date()}')
+
+        ax1.set_xlabel('Date', fontsize=12, fontweight='bold')
+        ax1.set_ylabel('Traffic (TB)', fontsize=12, fontweight='bold')
+        ax1.set_title('Time Series: Historical + Forecast', fontsize=14, fontweight='bold', pad=15)
+        legend = ax1.legend(loc='best', fontsize=10)
+        self.last_label = legend.get_texts()[
+            [text.get_text() for text in legend.get_texts()].index(self.last_line.get_label())]
+        ax1.grid(True, alpha=0.3)
+        # Rotasi lewat tick_params agar tetap berlaku untuk tick baru setelah update
+        ax1.tick_params(axis='x', labelrotation=45)
+
+        # Plot 2: Statistics table
+        ax2 = fig.add_subplot(gs[1, 0])
+        ax2.axis('off')
+
+        table_data = statistics_table(history, forecast)
+        table = ax2.table(cellText=table_data, cellLoc='left', loc='center',
+                          colWidths=[0.45, 0.55],
+                          bbox=[0.05, 0.05, 0.9, 0.9])
+
+        table.auto_set_font_size(False)
+        table.set_fontsize(9)
+        table.scale(1, 1.8)
+
+        for i, row in enumerate(table_data):
+            header = row[0] in SECTION_HEADERS
+            for j in range(2):
+                cell = table[(i, j)]
+                cell.set_edgecolor('none')
+                cell.set_facecolor('wheat' if header else 'white')
+                cell.set_alpha(0.3 if header else 0)
+                if header:
+                    cell.set_text_props(weight='bold', fontsize=10)
+                else:
+                    cell.set_text_props(fontsize=9, family='monospace')
+        self.cell_texts = [[table[(i, j)].get_text() for j in range(2)]
+                           for i in range(len(table_data))]
+
+        ax2.set_title('STATISTICS SUMMARY', fontsize=11, fontweight='bold', pad=10, loc='center')
+
+        # Plot 3: Distribution
+        ax3 = fig.add_subplot(gs[1, 1])
+
+        *_, self.history_bars = ax3.hist(history, bins=HISTORY_BINS, alpha=0.6,
+                                         color='#2E86AB', label='Historical', edgecolor='black')
+        *_, self.forecast_bars = ax3.hist(forecast, bins=FORECAST_BINS, alpha=0.6,
+                                          color='#E63946', label='Forecast', edgecolor='black')
+
+        self.history_mean = ax3.axvline(history.mean(), color='#2E86AB', linestyle='--', linewidth=2)
+        self.forecast_mean = ax3.axvline(forecast.mean(), color='#E63946', linestyle='--', linewidth=2)
+
+        ax3.set_xlabel('Traffic (TB)', fontsize=11, fontweight='bold')
+        ax3.set_ylabel('Frequency', fontsize=11, fontweight='bold')
+        ax3.set_title('Distribution: Historical vs Forecast', fontsize=12, fontweight='bold', pad=10)
+        ax3.legend(loc='best', fontsize=9)
+        ax3.grid(True, alpha=0.3, axis='y')
+
+        self.fig, self.ax_series, self.ax_hist = fig, ax1, ax3
+        # Artist yang berubah per entity; sisanya masuk layer statis raster()
+        self.dynamic_artists = [ax1, ax3, self.title] + [texts[1] for texts in self.cell_texts]
+        self._background = None
+
+    @staticmethod
+    def title_text(spec):
+        return (f"FORECAST TRAFFIC: {spec['name'].upper()}\n" +
+                f'Historical + Forecast (Oct 2025 - Jan 2026)')
+
+    @staticmethod
+    def _set_bars(bars, values, bins):
+        heights, edges = np.histogram(values, bins=bins)
+        for bar, height, left, right in zip(bars, heights, edges[:-1], edges[1:]):
+            bar.set_x(left)
+            bar.set_width(right - left)
+            bar.set_height(height)
+
+    def _set_interval(self, dates, lower, upper):
+        if hasattr(self.interval, 'set_data'):  # matplotlib >= 3.10
+            self.interval.set_data(dates, lower, upper)
+            return
+        x = self.ax_series.convert_xunits(dates)
+        self.interval.set_verts([np.concatenate([
+            [(x[0], upper[0])], np.column_stack([x, lower]),
+            [(x[-1], upper[-1])], np.column_stack([x[::-1], upper[::-1]]),
+        ])])
+
+    def update(self, spec):
+        """Isi template dengan data entity `spec`; return figure"""
+        history, forecast = spec['history'], spec['forecast']
+        last_historical_date = pd.Timestamp(spec['history_dates'].max())
+
+        self.title.set_text(self.title_text(spec))
+
+        self.history_line.set_data(spec['history_dates'], history)
+        self.forecast_line.set_data(spec['forecast_dates'], forecast)
+        self._set_interval(spec['forecast_dates'], spec['lower'], spec['upper'])
+        self.last_line.set_xdata([last_historical_date, last_historical_date])
+        self.last_line.set_label(f'Last Historical: {last_historical_date.date()}')
+        self.last_label.set_text(self.last_line.get_label())
+
+        # Collection (area interval) tidak ikut relim(), tambahkan manual
+        self.ax_series.relim()
+        self.ax_series.update_datalim(self.interval.get_paths()[0].vertices)
+        self.ax_series.autoscale_view()
+
+        for row, texts in zip(statistics_table(history, forecast), self.cell_texts):
+            for value, text in zip(row, texts):
+                text.set_text(value)
+
+        self._set_bars(self.history_bars, history, HISTORY_BINS)
+        self._set_bars(self.forecast_bars, forecast, FORECAST_BINS)
+        self.history_mean.set_xdata([history.mean(), history.mean()])
+        self.forecast_mean.set_xdata([forecast.mean(), forecast.mean()])
+        self.ax_hist.relim()
+        self.ax_hist.autoscale_view()
+
+        return self.fig
+
+    def raster(self, dpi):
+        """Buffer RGBA figure pada `dpi` (tanpa bbox tight) dari layer statis + artist dinamis"""
+        canvas = self.fig.canvas
+        if self._background is None or self._background[0] != dpi:
+            self.fig.set_dpi(dpi)
+            for artist in self.dynamic_artists:
+                artist.set_visible(False)
+            canvas.draw()
+            self._background = (dpi, canvas.copy_from_bbox(self.fig.bbox))
+            for artist in self.dynamic_artists:
+                artist.set_visible(True)
+
+        # Urutan sama seperti Figure.draw(): axes kiri-ke-kanan lalu suptitle;
+        # kolom nilai tabel tidak bertumpuk dengan artist lain
+        canvas.restore_region(self._background[1])
+        renderer = canvas.get_renderer()
+        for artist in self.dynamic_artists:
+            artist.draw(renderer)
+        return canvas.buffer_rgba()
+
+
+# Template per layout, dibangun sekali per proses (worker) lalu dipakai ulang
+_templates = {}
+
+
+def forecast_chart_template(spec):
+    """Template chart forecast sesuai layout `spec`, sudah diisi data `spec`"""
+    key = (tuple(spec['figsize']), spec['title_fontsize'])
+    template = _templates.get(key)
+    if template is None:
+        _templates[key] = ForecastChartTemplate(spec)
+        return _templates[key]
+    template.update(spec)
+    return template
+
+
+# Jenis chart → fungsi yang membuat chart (objek dengan .fig dan .raster()) dari spesifikasi
+RENDERERS = {
+    'forecast': forecast_chart_template,
+}
+
+
+def init_render_worker():
+    """Initializer worker render: backend non-interaktif Agg"""
+    matplotlib.use('Agg')
+
+
+def save_image(image, path, image_format):
+    """Simpan PIL image sebagai png / png-optimized / webp"""
+    if image_format == 'webp':
+        image.save(path, 'WEBP', **WEBP_OPTIONS)
+    elif image_format == 'png-optimized':
+        image.quantize(256, method=Image.Quantize.FASTOCTREE, dither=Image.Dither.NONE).save(
+            path, 'PNG', optimize=True)
+    else:
+        image.save(path, 'PNG')
+
+
+def save_figure(fig, spec, raster=None):
+    """
+    Simpan figure sesuai opsi render di `spec`. PNG biasa tanpa thumbnail
+    langsung ditulis matplotlib; format lain dan thumbnail dibuat dari
+    satu raster (PNG kompresi cepat di memori) lewat Pillow.
+
+    `raster` (fungsi dpi → buffer RGBA, misal ForecastChartTemplate.raster)
+    dipakai untuk profil tanpa bbox tight sebagai pengganti menggambar
+    ulang seluruh figure; bbox tight tetap lewat savefig().
+    """
+    path = Path(spec['path'])
+    if raster is not None and not spec['tight']:
+        buffer = raster(spec['dpi'])
+        if spec['format'] == 'png' and not spec['thumbnails']:
+            # Byte sama dengan savefig(): encoder dan metadata PNG matplotlib
+            matplotlib.image.imsave(path, buffer, format='png', dpi=spec['dpi'])
+            return
+        image = Image.fromarray(np.asarray(buffer)).convert('RGB')
+    else:
+        save_options = {'dpi': spec['dpi'], 'facecolor': 'white',
+                        'bbox_inches': 'tight' if spec['tight'] else None}
+        if spec['format'] == 'png' and not spec['thumbnails']:
+            fig.savefig(path, **save_options)
+            return
+
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format='png', pil_kwargs={'compress_level': 1}, **save_options)
+        image = Image.open(buffer).convert('RGB')
+    save_image(image, path, spec['format'])
+
+    if spec['thumbnails']:
+        thumbnail = thumbnail_path(path)
+        thumbnail.parent.mkdir(parents=True, exist_ok=True)
+        height = round(image.height * THUMBNAIL_WIDTH / image.width)
+        save_image(image.resize((THUMBNAIL_WIDTH, height), Image.Resampling.LANCZOS),
+                   thumbnail, spec['format'])
+
+
+def render_chart(spec):
+    """Render satu spesifikasi ke file gambar; return (path, detik render)"""
+    start = time.perf_counter()
+    path = Path(spec['path'])
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    # Figure milik template: tidak ditutup, dipakai ulang untuk chart berikutnya
+    chart = RENDERERS[spec['kind']](spec)
+    save_figure(chart.fig, spec, raster=chart.raster)
+    return path, time.perf_counter() - start
+
+
+class RenderQueue:
+    """
+    Antrian render chart. Spesifikasi yang di-submit langsung dikirim ke
+    pool worker Agg (workers > 1) sehingga proses utama bisa lanjut
+    bekerja; completed() menghasilkan chart sesuai urutan selesai.
+    Dengan workers <= 1 chart dirender di proses ini saat completed().
+    """
+
+    def __init__(self, workers=1):
+        self.workers = workers
+        self.executor = None
+        self.pending = {}
+
+    def __enter__(self):
+        if self.workers > 1:
+            self.executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                initializer=init_render_worker)
+        return self
+
+    def __exit__(self, *exc):
+        if self.executor is not None:
+            self.executor.shutdown(wait=True, cancel_futures=exc[0] is not None)
+        return False
+
+    def submit(self, spec):
+        # Serial: key berupa index, chart dirender saat completed()
+        key = len(self.pending) if self.executor is None else self.executor.submit(render_chart, spec)
+        self.pending[key] = spec
+
+    def completed(self):
+        """Yield (spec, path, detik) untuk setiap chart yang sudah di-submit"""
+        pending, self.pending = self.pending, {}
+        if self.executor is None:
+            for spec in pending.values():
+                yield (spec,) + render_chart(spec)
+            return
+        for future in as_completed(pending):
+            yield (pending[future],) + future.result()
+
+
+def render_charts(specs, workers=1):
+    """Render semua spesifikasi; yield (spec, path, detik) sesuai urutan selesai"""
+    with RenderQueue(workers) as queue:
+        for spec in specs:
+            queue.submit(spec)
+        yield from queue.completed()
+
+
+def level_chart_specs(cube, level, names=None, metric=METRIC, options=None):
+    """
+    Dict nama → spesifikasi chart forecast untuk node satu level yang
+    forecast-nya ada di results store (history dari cube).
+    """
+    return {name: forecast_chart_spec(level, name, cube.daily_frame(level, name, [metric]),
+                                      df_forecast, metric, options)
+            for name, df_forecast in results_by_name(level, names).items()}
+
+
+def chart_fingerprint(spec, version):
+    """Fingerprint isi chart: versi kode + semua field spesifikasi"""
+    return fingerprint(version, *[spec[key] for key in sorted(spec)])
+
+
+def render_level_charts(cube, level, workers=1, force=False, names=None, options=None,
+                        any_profile=False):
+    """
+    Render chart forecast satu level dari results store + cube dengan
+    opsi render `options` (render_options()). Chart yang spesifikasinya
+    (data, layout, opsi render) dan kodenya tidak berubah, dan file
+    gambarnya masih utuh, dilewati (manifest scope '<level>_charts').
+    Dengan `any_profile` chart yang up-to-date dengan profil render lain
+    (format sama) juga dilewati.
+
+    Yield (nama, path, detik) untuk setiap chart yang dirender, sesuai
+    urutan selesai; manifest disimpan setiap chart selesai.
+    """
+    specs = level_chart_specs(cube, level, names, options=options)
+    manifest = BuildManifest(f"{level}_charts")
+    version = code_version()
+    fingerprints = {name: chart_fingerprint(spec, version) for name, spec in specs.items()}
+
+    def is_current(name, spec):
+        if manifest.is_current(name, fingerprints[name]):
+            return True
+        return any_profile and any(
+            manifest.is_current(name, chart_fingerprint({**spec, 'profile': profile, **settings}, version))
+            for profile, settings in RENDER_PROFILES.items() if profile != spec['profile'])
+
+    stale = [spec for name, spec in specs.items() if force or not is_current(name, spec)]
+
+    for spec, path, seconds in render_charts(stale, workers):
+        manifest.record(spec['name'], fingerprints[spec['name']], chart_outputs(spec))
+        manifest.save()
+        yield spec['name'], path, seconds
+
+
+def materialize_charts(level, names, cube=None, workers=1, options=None):
+    """
+    Chart on-demand untuk konsumen (misal builder PPT): hanya chart
+    `names` yang diminta yang dirender, dan hanya jika belum ada atau
+    sudah tidak up-to-date (cache lewat manifest '<level>_charts').
+    Chart yang masih up-to-date dengan profil render apa pun (misal hasil
+    pipeline --profile draft) dipakai apa adanya; yang perlu dirender
+    memakai `options`.
+
+    Return (dict nama → path gambar untuk node yang forecast-nya ada di
+    store, list (nama, path, detik) chart yang baru dirender).
+    """
+    cube = load_cube() if cube is None else cube
+    names = list(dict.fromkeys(names))
+    rendered = list(render_level_charts(cube, level, workers=workers, names=names,
+                                        options=options, any_profile=True))
+
+    image_format = (options or render_options())['format']
+    stored = stored_names(level)
+    paths = {name: chart_path(level, name, image_format) for name in names if name in stored}
+    return paths, rendered
@@ -0,0 +1,146 @@
+"""
+FORECAST RESULTS STORE
+======================
+Store kolumnar untuk hasil forecast semua level, format long: satu baris
+per node × tanggal (Level, Name, Date, Traffic_Total(TB), Lower_Bound,
+Upper_Bound, dan kolom quantile P5/P50/P95 jika ada).
+
+Setiap level disimpan dalam satu file Parquet sendiri, sehingga script
+forecast per level (yang bisa berjalan paralel di pipeline) tidak
+menulis file yang sama. Baris diurutkan per Name lalu Date; pembacaan
+memakai filter pyarrow (predicate pushdown ke statistik row group)
+sehingga hanya entity/tanggal yang diminta yang dibaca.
+
+Input:
+  - Dict nama node → DataFrame forecast (hasil engine.forecast())
+
+Output:
+  - forecast_results/forecast_store/<level>.parquet
+    (pickle jika pyarrow tidak terinstall)
+
+Fungsi:
+  - results_path(): path file store untuk satu level
+  - write_results(): tulis/replace forecast sebagian atau semua node level
+  - read_results(): baca dengan filter level, nama, rentang tanggal, kolom
+  - results_by_name(): dict nama → DataFrame forecast (format CSV lama)
+  - stored_names(): nama node yang ada di store untuk satu level
+"""
+
+import os
+from pathlib import Path
+
+import pandas as pd
+
+from .cube import LEVELS
+from .data import _parquet_available
+
+RESULTS_DIR = Path("forecast_results/forecast_store")
+KEY_COLUMNS = ['Level', 'Name', 'Date']
+ROW_GROUP_SIZE = 4096
+
+
+def results_path(level, results_dir=RESULTS_DIR):
+    """Path file store untuk level (Parquet, atau pickle)"""
+    suffix = 'parquet' if _parquet_available() else 'pkl'
+    return Path(results_dir) / f"{level}.{suffix}"
+
+
+def _read_file(path, columns=None, filters=None):
+    if path.suffix == '.parquet':
+        return pd.read_parquet(path, columns=columns, filters=filters or None)
+
+    df = pd.read_pickle(path)
+    for column, op, value in filters or []:
+        if op == 'in':
+            df = df[df[column].isin(value)]
+        elif op == '>=':
+            df = df[df[column] >= value]
+        else:
+            df = df[df[column] <= value]
+    return df if columns is None else df[columns]
+
+
+def _write_file(df, path):
+    tmp_path = path.with_name(path.name + '.tmp')
+    if path.suffix == '.parquet':
+        df.to_parquet(tmp_path, index=False, row_group_size=ROW_GROUP_SIZE)
+    else:
+        df.to_pickle(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def write_results(level, forecasts, replace=None, replace_all=False, results_dir=RESULTS_DIR):
+    """
+    Simpan forecast (dict nama → DataFrame forecast) untuk satu level.
+
+    Baris lama untuk node di `replace` (default: key `forecasts`)
+    dihapus, baris node lain dipertahankan, kecuali `replace_all=True`
+    (isi level diganti seluruhnya). Ditulis atomik. Return path file store.
+    """
+    path = results_path(level, results_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    replace = list(forecasts) if replace is None else list(replace)
+    frames = [df.assign(Level=level, Name=name) for name, df in forecasts.items()]
+    if path.exists() and not replace_all:
+        existing = _read_file(path)
+        frames.insert(0, existing[~existing['Name'].isin(replace)])
+    frames = [frame for frame in frames if len(frame)]
+    if not frames:
+        if path.exists():
+            path.unlink()
+        return path
+
+    df = pd.concat(frames, ignore_index=True)
+    df['Date'] = pd.to_datetime(df['Date'])
+    value_columns = [column for column in df.columns if column not in KEY_COLUMNS]
+    df = df[KEY_COLUMNS + value_columns].sort_values(['Name', 'Date'], ignore_index=True)
+    _write_file(df, path)
+    return path
+
+
+def read_results(levels=None, names=None, columns=None, start=None, end=None,
+                 results_dir=RESULTS_DIR):
+    """
+    Baca hasil forecast dalam format long.
+
+    `levels` (satu level atau list, default semua) memilih file;
+    `names`, `start`, `end` diteruskan sebagai filter ke pyarrow;
+    `columns` membatasi kolom yang dibaca (kolom kunci selalu ikut).
+    """
+    levels = LEVELS if levels is None else [levels] if isinstance(levels, str) else levels
+    filters = []
+    if names is not None:
+        filters.append(('Name', 'in', list(names)))
+    if start is not None:
+        filters.append(('Date', '>=', pd.Timestamp(start)))
+    if end is not None:
+        filters.append(('Date', '<=', pd.Timestamp(end)))
+    if columns is not None:
+        columns = KEY_COLUMNS + [column for column in columns if column not in KEY_COLUMNS]
+
+    frames = []
+    for level in levels:
+        path = results_path(level, results_dir)
+        if path.exists():
+            frames.append(_read_file(path, columns, filters))
+    if not frames:
+        return pd.DataFrame(columns=columns or KEY_COLUMNS)
+    return pd.concat(frames, ignore_index=True)
+
+
+def results_by_name(level, names=None, **options):
+    """
+    Dict nama → DataFrame forecast satu node (kolom Date,
+    Traffic_Total(TB), Lower_Bound, Upper_Bound, ...), seperti CSV
+    per entity sebelumnya.
+    """
+    df = read_results(level, names=names, **options)
+    return {name: group.drop(columns=['Level', 'Name']).reset_index(drop=True)
+            for name, group in df.groupby('Name', sort=False)}
+
+
+def stored_names(level, results_dir=RESULTS_DIR):
+    """Set nama node yang forecast-nya ada di store"""
+    df = read_results(level, columns=['Name'], results_dir=results_dir)
+    return set(df['Name'].unique())
@@ -0,0 +1,57 @@
+"""
+PER-ENTITY RANDOM STREAMS
+=========================
+Noise forecast diambil dari numpy.random.Generator terpisah untuk setiap
+entity. Seed diturunkan dari base seed + key entity (level/nama) lewat
+SeedSequence, sehingga hasil satu entity tidak bergantung pada urutan,
+jumlah entity lain, batch, maupun worker process yang menghitungnya.
+
+Input:
+  - Key entity, misal entity_key('kabupaten', 'ALOR') → 'kabupaten/ALOR'
+
+Output:
+  - Matrix standard normal (n_entity × days_ahead)
+
+Fungsi:
+  - entity_key(): key stabil untuk satu node hierarki
+  - entity_rng(): Generator untuk satu entity
+  - entity_noise(): noise standard normal untuk banyak entity sekaligus
+"""
+
+import hashlib
+
+import numpy as np
+
+BASE_SEED = 42
+
+
+def entity_key(level, name):
+    """Key stabil untuk satu node hierarki"""
+    return f"{level}/{name}"
+
+
+def _key_words(key):
+    """Key string → 4 word uint32 (stabil lintas proses, tidak seperti hash())"""
+    digest = hashlib.sha256(key.encode('utf-8')).digest()
+    return tuple(int.from_bytes(digest[i:i + 4], 'little') for i in range(0, 16, 4))
+
+
+def entity_seed_sequence(key, base_seed=BASE_SEED):
+    """SeedSequence anak dari base seed untuk satu entity"""
+    return np.random.SeedSequence(entropy=base_seed, spawn_key=_key_words(key))
+
+
+def entity_rng(key, base_seed=BASE_SEED):
+    """numpy.random.Generator untuk satu entity"""
+    return np.random.default_rng(entity_seed_sequence(key, base_seed))
+
+
+def entity_noise(keys, days_ahead, base_seed=BASE_SEED):
+    """
+    Noise standard normal per entity, shape (len(keys) × days_ahead).
+    Baris untuk key yang sama selalu identik, apa pun urutan `keys`.
+    """
+    noise = np.empty((len(keys), days_ahead))
+    for row, key in enumerate(keys):
+        noise[row] = entity_rng(key, base_seed).standard_normal(days_ahead)
+    return noise
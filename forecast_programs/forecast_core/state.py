@@ -0,0 +1,224 @@
+"""
+INCREMENTAL FORECAST STATE
+==========================
+State ringkas per node hierarki yang cukup untuk membuat forecast
+ensemble tanpa membaca ulang seluruh history: window terakhir untuk
+MA/WMA, level dan tail Exponential Smoothing, serta data periode
+Tahun Baru untuk faktor event.
+
+Saat ada hari baru, state di-update per hari: level ES baru dihitung
+dari level sebelumnya dan titik baru (alpha * x + (1 - alpha) * level),
+window MA/WMA digeser satu hari. Trend dihitung dari window tersebut.
+Window, alpha, dan damping per node mengikuti params.py.
+
+Input:
+  - TrafficCube (build awal) dan baris harian baru (update)
+
+Output:
+  - .forecast_cache/forecast_state.npz + forecast_state.json
+
+Fungsi:
+  - ForecastState.from_cube(): bangun state dari cube lengkap
+  - ForecastState.update_from_rows(): tambahkan hari baru secara incremental
+  - ForecastState.forecast(): forecast satu level dari state
+  - save_state() / load_state(): simpan/baca state di cache
+"""
+
+import json
+from datetime import timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .cube import build_cube
+from .data import CACHE_DIR
+from .engine import (NY_BASELINE_START, NY_PATTERN_END, compact_history, components_from_tails,
+                     horizon_forecast, new_year_baseline, new_year_event_factors, param_groups)
+from .kernels import exponential_smoothing_filter
+from .params import PARAM_NAMES, node_params
+from .rng import BASE_SEED, entity_key, entity_noise
+
+STATE_STEM = "forecast_state"
+TAIL_DAYS = 30
+
+
+class ForecastState:
+    """
+    State forecast untuk semua node cube (urutan node sama dengan cube).
+
+    - tail: TAIL_DAYS nilai observasi terakhir per node (dipadatkan,
+      hari tanpa data dilewati seperti compact_history)
+    - es_tail: TAIL_DAYS nilai ES terakhir; kolom terakhir = level ES
+    - n_observed: jumlah hari observasi per node
+    - history_sum: jumlah semua nilai observasi per node (fallback
+      baseline Tahun Baru = rata-rata keseluruhan)
+    - event_dates/event_values: history periode 1 Des - 7 Jan (NaN jika
+      tidak ada data) untuk baseline 1-24 Des dan faktor event Tahun Baru
+    - params: parameter ensemble per node (dict nama → array)
+    """
+
+    def __init__(self, nodes, metric, last_date, tail, es_tail, n_observed, history_sum,
+                 event_dates, event_values, params, data_version=None):
+        self.nodes = nodes.reset_index(drop=True)
+        self.metric = metric
+        self.last_date = pd.Timestamp(last_date)
+        self.tail = tail
+        self.es_tail = es_tail
+        self.n_observed = n_observed
+        self.history_sum = history_sum
+        self.event_dates = pd.DatetimeIndex(event_dates)
+        self.event_values = event_values
+        self.params = params
+        self.data_version = data_version
+        self._index = {(row.level, row.name): i for i, row in enumerate(self.nodes.itertuples(index=False))}
+
+    @classmethod
+    def from_cube(cls, cube, metric='Traffic_Total(TB)', data_version=None, params=None):
+        """
+        Bangun state dari cube lengkap (satu pass atas history).
+        `params` diteruskan ke node_params() (default: hasil tuning).
+        """
+        history = cube.values[:, :, cube.metric_index(metric)]
+        observed = cube.counts > 0
+        params = node_params([entity_key(row.level, row.name)
+                              for row in cube.nodes.itertuples(index=False)], params)
+
+        compact = compact_history(history, observed)
+        smoothed = np.empty_like(compact[:, -TAIL_DAYS:])
+        for group, rows in param_groups(params, ['alpha']):
+            smoothed[rows] = exponential_smoothing_filter(compact[rows], alpha=group['alpha'])[:, -TAIL_DAYS:]
+
+        in_window = (cube.dates >= NY_BASELINE_START) & (cube.dates <= NY_PATTERN_END)
+        event_values = np.where(observed, history, np.nan)[:, in_window]
+
+        return cls(cube.nodes, metric, cube.dates[observed.any(axis=0)].max(),
+                   compact[:, -TAIL_DAYS:].copy(), smoothed,
+                   observed.sum(axis=1), np.where(observed, history, 0.0).sum(axis=1),
+                   cube.dates[in_window], event_values, params, data_version)
+
+    def update(self, dates, values, counts):
+        """
+        Tambahkan hari baru. `values`/`counts` berupa (n_node × n_hari)
+        dengan urutan node sama seperti state; hanya node dengan data
+        (counts > 0) pada hari tersebut yang di-update.
+        """
+        for j, date in enumerate(pd.DatetimeIndex(dates)):
+            observed = counts[:, j] > 0
+            if not observed.any():
+                continue
+            x = values[observed, j]
+
+            # Node yang baru pertama kali punya data: isi window dengan nilai pertama
+            first = self.n_observed[observed] == 0
+            tail = self.tail[observed]
+            es_tail = self.es_tail[observed]
+            tail[first] = x[first, np.newaxis]
+            es_tail[first] = x[first, np.newaxis]
+
+            alpha = self.params['alpha'][observed]
+            es_level = alpha * x + (1 - alpha) * es_tail[:, -1]
+            self.tail[observed] = np.column_stack([tail[:, 1:], x])
+            self.es_tail[observed] = np.column_stack([es_tail[:, 1:], es_level])
+            self.n_observed[observed] += 1
+            self.history_sum[observed] += x
+            self.last_date = max(self.last_date, date)
+
+    def update_from_rows(self, df_new):
+        """
+        Agregasi baris mentah baru ke layout node state lalu update.
+        Return daftar tanggal yang ditambahkan.
+        """
+        new_cube = build_cube(df_new, metrics=[self.metric])
+        unknown = [name for level, name in new_cube.nodes[['level', 'name']].itertuples(index=False)
+                   if (level, name) not in self._index]
+        if unknown:
+            raise ValueError(f"Node baru tidak ada di state (perlu rebuild penuh): {unknown}")
+
+        positions = [self._index[(row.level, row.name)] for row in new_cube.nodes.itertuples(index=False)]
+        values = np.zeros((len(self.nodes), len(new_cube.dates)))
+        counts = np.zeros((len(self.nodes), len(new_cube.dates)), dtype=np.int64)
+        values[positions] = new_cube.values[:, :, 0]
+        counts[positions] = new_cube.counts
+
+        self.update(new_cube.dates, values, counts)
+        return new_cube.dates
+
+    def forecast(self, level, days_ahead=75, min_days=30, base_seed=BASE_SEED,
+                 event_base='recent', same_date_last_year=False):
+        """
+        Forecast semua node satu level dari state (tanpa history penuh),
+        dengan opsi event sama seperti forecast_level() (lihat
+        engine.level_event_options() untuk opsi yang dipublikasikan).
+        Return (names, forecast_dates, forecasts) seperti forecast_level().
+        """
+        indices = np.flatnonzero(self.nodes['level'].to_numpy() == level)
+        indices = indices[self.n_observed[indices] >= min_days]
+        names = self.nodes['name'].to_numpy()[indices].tolist()
+
+        forecast_dates = pd.DatetimeIndex([self.last_date + timedelta(days=i)
+                                           for i in range(1, days_ahead + 1)])
+        params = {name: values[indices] for name, values in self.params.items()}
+        base_value = np.empty(len(indices))
+        trend = np.empty(len(indices))
+        for group, rows in param_groups(params, ['ma_window', 'wma_window']):
+            base_value[rows], trend[rows] = components_from_tails(
+                self.tail[indices[rows]], self.es_tail[indices[rows]],
+                int(group['ma_window']), int(group['wma_window']))
+
+        # Baseline 1-24 Des dari periode event; fallback rata-rata seluruh history
+        event_values = self.event_values[indices]
+        baseline = new_year_baseline(self.event_dates, event_values,
+                                     fallback=self.history_sum[indices] / self.n_observed[indices])
+        if event_base == 'recent':
+            event_base = self.tail[indices, -30:].mean(axis=1)
+        elif event_base == 'baseline':
+            event_base = baseline
+        else:
+            raise ValueError(f"event_base tidak dikenal: {event_base!r}")
+        factors, event_mask = new_year_event_factors(self.event_dates, event_values, forecast_dates,
+                                                     same_date_last_year, baseline=baseline)
+        noise = entity_noise([entity_key(level, name) for name in names], days_ahead, base_seed)
+
+        forecasts = horizon_forecast(base_value, trend, event_base, factors, event_mask,
+                                     forecast_dates, noise, damping=params['damping'])
+        return names, forecast_dates, forecasts
+
+
+def _state_paths(cache_dir):
+    cache_dir = Path(cache_dir)
+    return cache_dir / f"{STATE_STEM}.npz", cache_dir / f"{STATE_STEM}.json"
+
+
+def save_state(state, cache_dir=CACHE_DIR):
+    """Simpan state: array ke .npz, metadata (node, tanggal, versi) ke .json"""
+    arrays_path, meta_path = _state_paths(cache_dir)
+    arrays_path.parent.mkdir(parents=True, exist_ok=True)
+    np.savez(arrays_path, tail=state.tail, es_tail=state.es_tail, n_observed=state.n_observed,
+             history_sum=state.history_sum, event_values=state.event_values,
+             **{f"param_{name}": values for name, values in state.params.items()})
+    meta = {
+        'metric': state.metric,
+        'last_date': state.last_date.strftime('%Y-%m-%d'),
+        'event_dates': [d.strftime('%Y-%m-%d') for d in state.event_dates],
+        'nodes': state.nodes.to_dict('list'),
+        'data_version': state.data_version,
+    }
+    meta_path.write_text(json.dumps(meta, indent=1))
+
+
+def load_state(cache_dir=CACHE_DIR):
+    """Baca state dari cache (None jika belum ada)"""
+    arrays_path, meta_path = _state_paths(cache_dir)
+    if not arrays_path.exists() or not meta_path.exists():
+        return None
+    meta = json.loads(meta_path.read_text())
+    with np.load(arrays_path) as arrays:
+        # State versi lama (tanpa parameter atau history_sum) dibangun ulang
+        if 'history_sum' not in arrays or any(f"param_{name}" not in arrays for name in PARAM_NAMES):
+            return None
+        params = {name: arrays[f"param_{name}"] for name in PARAM_NAMES}
+        return ForecastState(pd.DataFrame(meta['nodes']), meta['metric'], meta['last_date'],
+                             arrays['tail'], arrays['es_tail'], arrays['n_observed'],
+                             arrays['history_sum'], pd.to_datetime(meta['event_dates']),
+                             arrays['event_values'], params, meta['data_version'])
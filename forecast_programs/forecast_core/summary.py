@@ -0,0 +1,104 @@
+"""
+GROWTH SUMMARY
+==============
+Ringkasan historis vs forecast per node untuk analisis ranking (top-N
+kabupaten berdasarkan perubahan absolut atau growth %).
+
+Statistik historis dihitung sekaligus untuk semua node satu level dari
+cube (matrix node × hari dengan mask hari yang ada datanya), ringkasan
+forecast dari satu groupby atas results store, lalu keduanya digabung
+dengan satu join. Tidak ada filter frame mentah per entity, sehingga
+biaya sebanding dengan jumlah baris data, bukan entity × baris.
+
+Input:
+  - TrafficCube dari cube.load_cube()
+  - Forecast dari results store (results.read_results())
+
+Output:
+  - DataFrame per node: Name, Region, Province, statistik historis,
+    statistik forecast, perubahan, dan growth rate
+
+Fungsi:
+  - node_ancestors(): regional/provinsi di atas setiap node
+  - historical_summary(): mean, total, std, dan jumlah hari historis
+  - forecast_summary(): mean dan total forecast per node
+  - growth_summary(): join historis + forecast + perubahan / growth %
+"""
+
+import numpy as np
+import pandas as pd
+
+from .cube import LEVELS
+from .results import read_results
+
+ANCESTOR_COLUMNS = {'regional': 'Region', 'provinsi': 'Province'}
+
+
+def node_ancestors(cube, level):
+    """DataFrame Name + kolom Region/Province (sesuai level) dari mapping parent cube"""
+    nodes = cube.nodes
+    parents = {lvl: nodes.loc[nodes['level'] == lvl].set_index('name')['parent']
+               for lvl in LEVELS}
+
+    result = pd.DataFrame({'Name': cube.level_names(level)})
+    current, depth = result['Name'], LEVELS.index(level)
+    while depth > 1:
+        current = current.map(parents[LEVELS[depth]])
+        depth -= 1
+        result[ANCESTOR_COLUMNS[LEVELS[depth]]] = current.to_numpy()
+    return result
+
+
+def historical_summary(cube, level, metric='Traffic_Total(TB)'):
+    """
+    Statistik harian historis semua node satu level (hanya hari yang
+    ada datanya): Historical_Avg, Historical_Total, Historical_Std
+    (ddof=1, seperti pandas), Data_Days.
+    """
+    values = cube.level_matrix(level, metric)
+    observed = cube.counts[cube.level_indices(level)] > 0
+    days = observed.sum(axis=1)
+
+    total = np.where(observed, values, 0.0).sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = total / days
+        squared = np.where(observed, (values - mean[:, None]) ** 2, 0.0).sum(axis=1)
+        std = np.sqrt(squared / (days - 1))
+    std[days < 2] = np.nan
+
+    return pd.DataFrame({
+        'Name': cube.level_names(level),
+        'Historical_Avg': mean,
+        'Historical_Total': total,
+        'Historical_Std': std,
+        'Data_Days': days,
+    })
+
+
+def forecast_summary(level, metric='Traffic_Total(TB)'):
+    """Forecast_Avg dan Forecast_Total per node dari results store"""
+    forecasts = read_results(level, columns=[metric])
+    return (forecasts.groupby('Name')[metric]
+            .agg(Forecast_Avg='mean', Forecast_Total='sum')
+            .reset_index())
+
+
+def growth_summary(cube, level='kabupaten', metric='Traffic_Total(TB)'):
+    """
+    Satu baris per node yang punya forecast dan data historis:
+    Name, Region/Province, statistik historis dan forecast,
+    Change_Avg, Change_Total, Growth_Rate (% dari rata-rata historis,
+    0 jika rata-rata historis <= 0).
+    """
+    history = historical_summary(cube, level, metric)
+    history = history[history['Data_Days'] > 0]
+
+    df = (node_ancestors(cube, level)
+          .merge(history, on='Name')
+          .merge(forecast_summary(level, metric), on='Name'))
+
+    df['Change_Avg'] = df['Forecast_Avg'] - df['Historical_Avg']
+    df['Change_Total'] = df['Forecast_Total'] - df['Historical_Total']
+    positive = df['Historical_Avg'] > 0
+    df['Growth_Rate'] = np.where(positive, df['Change_Avg'] / df['Historical_Avg'].where(positive) * 100, 0.0)
+    return df
@@ -0,0 +1,156 @@
+"""
+PARAMETER TUNING
+================
+Grid search parameter ensemble (window MA, window WMA, alpha ES,
+damping trend) per node hierarki terhadap rolling-origin backtest.
+
+Hasil parsial per series di-cache dan dipakai bersama oleh semua
+kandidat: statistik window MA/WMA (base + slope) per ukuran window dan
+level/slope ES per alpha dihitung sekali untuk semua origin, lalu
+setiap kombinasi hanya menjumlahkan komponen dan mengevaluasi horizon.
+
+Input:
+  - TrafficCube dari cube.load_cube()
+
+Output:
+  - Parameter terbaik + MAPE default vs tuned per node
+
+Fungsi:
+  - SeriesBacktestCache: cache komponen per origin untuk satu series
+  - tune_series(): grid search satu series
+  - tune_node(): worker untuk run_parallel (series dari shared_cube)
+
+Kandidat dievaluasi dengan MAPE forecast ekspektasi (tanpa noise) untuk
+horizon 1..horizon dari setiap origin harian, sama seperti backtest.py.
+"""
+
+import itertools
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .engine import WEEKEND_DAYS, WEEKEND_FACTOR
+from .kernels import exponential_smoothing_filter, slope_operator, wma_weights
+from .params import DEFAULT_PARAMS
+from .parallel import shared_cube
+
+PARAM_GRID = {
+    'ma_window': [3, 5, 7, 10, 14],
+    'wma_window': [7, 14, 21, 28],
+    'alpha': [0.1, 0.2, 0.3, 0.5, 0.7],
+    'damping': [0.0, 0.25, 0.5, 0.75, 1.0],
+}
+ES_TREND_WINDOW = 30
+
+
+class SeriesBacktestCache:
+    """
+    Komponen ensemble satu series untuk semua origin backtest.
+
+    `values`/`dates` hanya hari yang ada datanya (seperti
+    TrafficCube.series). Origin k berarti training = values[:k] dan
+    forecast dimulai sehari setelah dates[k-1].
+    """
+
+    def __init__(self, values, dates, horizon=75, min_train=60):
+        self.values = np.asarray(values, dtype=float)
+        longest = max(max(PARAM_GRID['wma_window']), max(PARAM_GRID['ma_window']), ES_TREND_WINDOW)
+        self.origins = np.arange(max(min_train, longest), len(self.values))
+        self.steps = np.arange(horizon)
+        self._windows = {}
+        self._es = {}
+
+        # Aktual per origin × horizon berdasarkan tanggal kalender (NaN = tidak ada data)
+        day = np.asarray((dates - dates[0]).days)
+        calendar = np.full(day[-1] + 1 if len(day) else 0, np.nan)
+        calendar[day] = self.values
+        target = day[self.origins - 1][:, None] + 1 + self.steps[None, :]
+        inside = target < len(calendar)
+        actual = np.where(inside, calendar[np.minimum(target, len(calendar) - 1)], np.nan)
+
+        self.valid = ~np.isnan(actual) & (actual != 0)
+        self.actual = np.where(self.valid, actual, 1.0)
+        weekday = (dates[0].dayofweek + target) % 7
+        self.weekly = np.where(np.isin(weekday, WEEKEND_DAYS), WEEKEND_FACTOR, 1.0)
+
+    @property
+    def n_pairs(self):
+        return int(self.valid.sum())
+
+    def _window_stats(self, window, weights):
+        key = (window, weights is None)
+        if key not in self._windows:
+            windows = sliding_window_view(self.values, window)[self.origins - window]
+            base = windows.mean(axis=1) if weights is None else windows @ weights
+            self._windows[key] = (base, windows @ slope_operator(window))
+        return self._windows[key]
+
+    def moving_average(self, window):
+        """(base, trend) MA untuk semua origin"""
+        return self._window_stats(window, None)
+
+    def weighted_moving_average(self, window):
+        """(base, trend) WMA untuk semua origin"""
+        return self._window_stats(window, wma_weights(window))
+
+    def exponential_smoothing(self, alpha):
+        """(level, trend) ES untuk semua origin; ES dihitung sekali per alpha"""
+        if alpha not in self._es:
+            smoothed = exponential_smoothing_filter(self.values, alpha=alpha)
+            tails = sliding_window_view(smoothed, ES_TREND_WINDOW)[self.origins - ES_TREND_WINDOW]
+            self._es[alpha] = (smoothed[self.origins - 1], tails @ slope_operator(ES_TREND_WINDOW))
+        return self._es[alpha]
+
+    def mape(self, base_value, trend, damping):
+        """MAPE (%) forecast ekspektasi untuk base/trend per origin"""
+        forecasts = (base_value[:, None] + trend[:, None] * damping * self.steps) * self.weekly
+        np.maximum(forecasts, 0, out=forecasts)
+        ape = np.abs(forecasts - self.actual) / np.abs(self.actual)
+        return 100 * ape[self.valid].mean()
+
+    def score(self, params):
+        """MAPE untuk satu kombinasi parameter"""
+        ma_base, ma_trend = self.moving_average(params['ma_window'])
+        wma_base, wma_trend = self.weighted_moving_average(params['wma_window'])
+        es_base, es_trend = self.exponential_smoothing(params['alpha'])
+        base_value = (ma_base + wma_base + es_base) / 3
+        trend = (ma_trend + wma_trend + es_trend) / 3
+        return self.mape(base_value, trend, params['damping'])
+
+
+def tune_series(values, dates, horizon=75, min_train=60, min_gain=0.5, grid=PARAM_GRID):
+    """
+    Grid search satu series. Parameter default dipertahankan kecuali
+    kandidat terbaik lebih baik minimal `min_gain` poin MAPE.
+
+    Return dict: params, mape_default, mape_tuned, n_pairs (MAPE None
+    jika history terlalu pendek untuk backtest).
+    """
+    cache = SeriesBacktestCache(values, dates, horizon, min_train)
+    if len(cache.origins) == 0 or cache.n_pairs == 0:
+        return {'params': dict(DEFAULT_PARAMS), 'mape_default': None,
+                'mape_tuned': None, 'n_pairs': 0}
+
+    names = list(grid)
+    best_params, best_mape = dict(DEFAULT_PARAMS), cache.score(DEFAULT_PARAMS)
+    default_mape = best_mape
+    for combo in itertools.product(*(grid[name] for name in names)):
+        candidate = dict(zip(names, combo))
+        mape = cache.score(candidate)
+        if mape < best_mape:
+            best_params, best_mape = candidate, mape
+
+    if default_mape - best_mape < min_gain:
+        best_params, best_mape = dict(DEFAULT_PARAMS), default_mape
+
+    return {'params': best_params, 'mape_default': default_mape,
+            'mape_tuned': best_mape, 'n_pairs': cache.n_pairs}
+
+
+def tune_node(task):
+    """Worker run_parallel: task = (level, name, horizon, min_train, min_gain)"""
+    level, name, horizon, min_train, min_gain = task
+    cube = shared_cube()
+    observed = cube.counts[cube.index_of(level, name)] > 0
+    return tune_series(cube.series(level, name), cube.dates[observed],
+                       horizon=horizon, min_train=min_train, min_gain=min_gain)
@@ -0,0 +1,134 @@
+"""
+INGEST DAILY DATA
+=================
+Menambahkan data VLR harian baru (Excel atau CSV) ke store kolumnar
+tanpa mengganti workbook utama, lalu memperbarui forecast semua level
+hierarki secara incremental.
+
+Input:
+  - File harian baru (.xlsx / .csv) dengan kolom sama seperti
+    Traffic_VLR_Java_2024-2025.xlsx (Date, REGION IOH, PROVINCE,
+    KABUPATEN IOH, Traffic_*, VLR_*)
+
+Output:
+  - .forecast_cache/vlr_appended.parquet (baris harian yang di-append)
+  - .forecast_cache/forecast_state.npz/.json (state MA/WMA/ES per node)
+  - forecast_results/06_refresh/forecast_refresh.csv (forecast semua level)
+
+Fungsi:
+  - Hanya hari setelah tanggal terakhir di store yang ditambahkan
+  - State ES di-update dari level sebelumnya + titik baru, window
+    MA/WMA digeser; history lengkap tidak dibaca ulang
+  - Forecast total, regional, provinsi, dan kabupaten dari state
+
+Penggunaan:
+  python forecast_programs/ingest_daily.py data_harian_2025-10-23.csv [file lain ...]
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from forecast_core import LEVELS, forecast_frame, level_event_options, load_cube
+from forecast_core.data import append_rows, data_version, read_daily_rows
+from forecast_core.params import params_version
+from forecast_core.state import ForecastState, load_state, save_state
+
+REQUIRED_COLUMNS = ['Date', 'REGION IOH', 'PROVINCE', 'KABUPATEN IOH', 'Traffic_Total(TB)']
+OUTPUT_FILE = Path("forecast_results/06_refresh/forecast_refresh.csv")
+
+def state_version():
+    """Versi state: data aktif + parameter ensemble hasil tuning"""
+    return f"{data_version()}|{params_version()}"
+
+def load_forecast_state():
+    """State incremental untuk data aktif; dibangun dari cube jika belum ada/kedaluwarsa"""
+    version = state_version()
+    state = load_state()
+
+    if state is None or state.data_version != version:
+        print("  → Membangun state dari data lengkap (sekali)...")
+        state = ForecastState.from_cube(load_cube(), data_version=version)
+        save_state(state)
+
+    return state
+
+def read_new_rows(paths, last_date):
+    """Baca file harian dan ambil hanya baris setelah tanggal terakhir di store"""
+    frames = []
+    for path in paths:
+        df = read_daily_rows(path)
+        missing = [col for col in REQUIRED_COLUMNS if col not in df.columns]
+        if missing:
+            raise ValueError(f"Kolom tidak ditemukan di {path}: {missing}")
+
+        new_rows = df[df['Date'] > last_date]
+        skipped = len(df) - len(new_rows)
+        print(f"  ✓ {path}: {len(new_rows)} baris baru", end="")
+        print(f" ({skipped} baris lama dilewati)" if skipped else "")
+        frames.append(new_rows)
+
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=REQUIRED_COLUMNS)
+
+def build_refresh_table(state, days_ahead=75):
+    """
+    Forecast semua level dari state, dalam satu tabel long-format
+    (opsi event per level sama dengan forecast yang dipublikasikan)
+    """
+    tables = []
+    for level in LEVELS:
+        names, forecast_dates, forecasts = state.forecast(level, days_ahead=days_ahead,
+                                                          **level_event_options(level))
+        for name, values in zip(names, forecasts):
+            df_forecast = forecast_frame(forecast_dates, values)
+            df_forecast.insert(0, 'Name', name)
+            df_forecast.insert(0, 'Level', level)
+            tables.append(df_forecast)
+    return pd.concat(tables, ignore_index=True)
+
+def main(paths, days_ahead=75):
+    """Main function"""
+    print("=" * 70)
+    print("  INGEST DATA HARIAN + REFRESH FORECAST")
+    print("=" * 70)
+    start = time.perf_counter()
+
+    print("\n📂 Menyiapkan state forecast...")
+    state = load_forecast_state()
+    print(f"  ✓ Data terakhir: {state.last_date.date()}")
+
+    print("\n📥 Membaca data harian baru...")
+    df_new = read_new_rows(paths, state.last_date)
+
+    if len(df_new) == 0:
+        print("\n⚠️  Tidak ada hari baru untuk ditambahkan")
+    else:
+        # Update state dulu: node yang tidak dikenal membatalkan ingest sebelum store diubah
+        added_dates = state.update_from_rows(df_new)
+        append_rows(df_new)
+        state.data_version = state_version()
+        save_state(state)
+        print(f"  ✓ {len(added_dates)} hari ditambahkan: "
+              f"{added_dates.min().date()} s/d {added_dates.max().date()}")
+
+    print("\n📈 Refresh forecast semua level...")
+    df_refresh = build_refresh_table(state, days_ahead)
+    OUTPUT_FILE.parent.mkdir(parents=True, exist_ok=True)
+    df_refresh.to_csv(OUTPUT_FILE, index=False)
+    for level, count in df_refresh.groupby('Level', sort=False)['Name'].nunique().items():
+        print(f"  ✓ {level:<10}: {count} series")
+    print(f"  ✓ Disimpan: {OUTPUT_FILE}")
+
+    print(f"\n✅ Selesai dalam {time.perf_counter() - start:.1f} detik")
+    print("💡 Jalankan 'run_all_forecasts.py' untuk memperbarui chart dan analisis")
+    print("=" * 70)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Append data VLR harian dan refresh forecast")
+    parser.add_argument('files', nargs='+', help="File harian baru (.xlsx atau .csv)")
+    parser.add_argument('--days-ahead', type=int, default=75,
+                        help="Panjang horizon forecast (default: 75 hari)")
+    args = parser.parse_args()
+    main(args.files, days_ahead=args.days_ahead)
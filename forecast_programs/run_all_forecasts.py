@@ -1,124 +1,214 @@
 """
 RUN ALL FORECAST PROGRAMS
 ==========================
-Script untuk menjalankan semua program forecast secara berurutan.
+Script untuk menjalankan semua program forecast sebagai pipeline DAG.
 
-Urutan eksekusi:
+Setiap stage mendeklarasikan input dan output-nya. Stage yang saling
+independen (misal forecast regional, provinsi, dan kabupaten) berjalan
+bersamaan, dan stage yang input/kodenya tidak berubah sejak run sukses
+terakhir dilewati.
+
+Urutan dependensi:
 1. Forecast total traffic
-2. Forecast per regional
-3. Forecast per provinsi
-4. Forecast per kabupaten (opsional)
-5. Visualisasi semua forecast
-6. Analisis top 10 kabupaten
+2. Forecast per regional          (paralel dengan 1)
+3. Forecast per provinsi          (butuh 1)
+4. Forecast per kabupaten         (opsional, paralel dengan 1)
+5. Render chart kabupaten         (butuh 4, paralel dengan 6)
+6. Visualisasi semua forecast     (butuh 1 dan 3)
+7. Analisis top 10 kabupaten      (butuh 4)
+8. Backtest akurasi forecast      (opsional, paralel dengan 1)
+
+Penggunaan:
+  python run_all_forecasts.py            # semua CPU
+  python run_all_forecasts.py --jobs 1   # serial, satu proses
+  python run_all_forecasts.py --force    # jalankan ulang semua stage
+  python run_all_forecasts.py --profile draft   # chart cepat (80 dpi) untuk refresh harian
+  python run_all_forecasts.py --lazy-charts     # chart kabupaten dirender on-demand oleh PPT
 """
 
-import subprocess
+import argparse
+import os
 import sys
+import time
 from pathlib import Path
 
+from forecast_core import WORKBOOK_FILE, load_cube
+from forecast_core.params import PARAMS_FILE
+from forecast_core.pipeline import Stage, run_pipeline, stage_dependencies
+from forecast_core.render import DEFAULT_PROFILE, RENDER_PROFILES
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+ROOT_DIR = SCRIPT_DIR.parent
+
+# Workbook + baris harian dari ingest_daily.py + parameter dari tune_parameters.py
+DATA_INPUTS = [WORKBOOK_FILE, ".forecast_cache/vlr_appended.*", PARAMS_FILE]
+MAIN_FORECAST_CSV = "forecast_results/01_main/forecast_data.csv"
+MAIN_COMPARISON_CSV = "forecast_results/01_main/comparison_statistics_2025_vs_2026.csv"
+PROVINCE_CSV = "forecast_results/03_provinsi/*.csv"
+# Store kolumnar per level (forecast_core.results)
+STORE = "forecast_results/forecast_store/{}.*"
+
+STAGES = [
+    Stage('forecast_total', 'forecast_01_main_total',
+          "Forecast traffic keseluruhan",
+          inputs=DATA_INPUTS,
+          outputs=[MAIN_FORECAST_CSV, MAIN_COMPARISON_CSV,
+                   "forecast_results/01_main/forecast_results.xlsx", STORE.format('total')]),
+    Stage('forecast_regional', 'forecast_03_by_regional',
+          "Forecast 3 regional (Bali Nusra, Central Java, East Java)",
+          inputs=DATA_INPUTS,
+          outputs=["forecast_results/02_regional/*.csv", STORE.format('regional'),
+                   "forecast_results/02_regional/*_forecast.png",
+                   "forecast_results/02_regional/summary_comparison_regional.png"]),
+    Stage('forecast_provinsi', 'forecast_02_by_province',
+          "Forecast 6 provinsi",
+          inputs=DATA_INPUTS + [MAIN_FORECAST_CSV],
+          outputs=[PROVINCE_CSV, STORE.format('provinsi'),
+                   "forecast_results/03_provinsi/*_forecast.png",
+                   "forecast_results/03_provinsi/summary_all_provinces.xlsx"]),
+    # Angka saja; chart dirender oleh stage render_kabupaten_charts dari store
+    Stage('forecast_kabupaten', 'forecast_04_by_kabupaten',
+          "Forecast 119 kabupaten",
+          inputs=DATA_INPUTS,
+          outputs=[STORE.format('kabupaten')],
+          params={'charts': False},
+          optional=True),
+    Stage('render_kabupaten_charts', 'visualize_04_kabupaten_charts',
+          "Render chart 119 kabupaten (worker pool, semua CPU)",
+          inputs=DATA_INPUTS + [STORE.format('kabupaten')],
+          outputs=["forecast_results/04_kabupaten/*_forecast.png"],
+          params={'workers': 0},
+          optional=True),
+    Stage('visualize_all', 'visualize_01_all_forecasts',
+          "Visualisasi lengkap semua forecast",
+          inputs=DATA_INPUTS + [MAIN_FORECAST_CSV, MAIN_COMPARISON_CSV, STORE.format('provinsi')],
+          outputs=["forecast_results/01_main/00_main_forecast_overview.png",
+                   "forecast_results/01_main/01_tabel_komparasi.png",
+                   "forecast_results/01_main/02_summary_dan_chart.png",
+                   "forecast_results/01_main/03_traffic_forecast_lengkap.png",
+                   "forecast_results/01_main/04_combined_province_comparison.png"]),
+    # Menulis ulang 00_main_forecast_overview.png, jadi harus setelah visualize_all
+    Stage('visualize_overview', 'visualize_02_main_overview',
+          "Visualisasi main forecast overview",
+          inputs=DATA_INPUTS + [MAIN_FORECAST_CSV],
+          outputs=["forecast_results/01_main/00_main_forecast_overview.png"],
+          after=['visualize_all']),
+    Stage('visualize_province_summary', 'visualize_03_province_summary',
+          "Summary comparison provinsi",
+          inputs=DATA_INPUTS + [STORE.format('provinsi')],
+          outputs=["forecast_results/03_provinsi/summary_comparison_provinsi.png"]),
+    Stage('analysis_top10_absolute', 'analysis_01_top10_absolute',
+          "Top 10 kabupaten peningkatan absolut",
+          inputs=DATA_INPUTS + [STORE.format('kabupaten')],
+          outputs=["forecast_results/05_analysis/top10_kabupaten_by_absolute_change.xlsx",
+                   "forecast_results/05_analysis/top10_kabupaten_by_absolute_change.png"],
+          optional=True),
+    Stage('analysis_top10_percentage', 'analysis_03_top10_percentage',
+          "Top 10 kabupaten persentase pertumbuhan",
+          inputs=DATA_INPUTS + [STORE.format('kabupaten')],
+          outputs=["forecast_results/05_analysis/top10_kabupaten_individual_forecast.xlsx",
+                   "forecast_results/05_analysis/top10_kabupaten_individual_forecast.png"],
+          optional=True),
+    Stage('analysis_backtest', 'analysis_04_backtest',
+          "Backtest akurasi forecast semua level (MAPE, sMAPE, bias, coverage)",
+          inputs=DATA_INPUTS,
+          outputs=["forecast_results/05_analysis/backtest_metrics.csv",
+                   "forecast_results/05_analysis/backtest_summary.csv"],
+          optional=True),
+    Stage('forecast_reconcile', 'forecast_05_reconcile',
+          "Rekonsiliasi forecast hierarki (bottom-up, top-down, MinT)",
+          inputs=DATA_INPUTS + [STORE.format(level)
+                                for level in ['total', 'regional', 'provinsi', 'kabupaten']],
+          outputs=["forecast_results/07_reconciled/forecast_reconciled.csv",
+                   "forecast_results/07_reconciled/coherence_summary.csv"],
+          optional=True),
+]
+
+# Stage yang merender chart forecast entity (menerima opsi profile)
+CHART_STAGES = ['forecast_regional', 'forecast_provinsi', 'render_kabupaten_charts']
+# Stage yang dilewati dengan --lazy-charts (chart dirender on-demand oleh konsumen)
+LAZY_CHART_STAGES = ['render_kabupaten_charts']
+
 def print_header(text):
     """Print formatted header"""
     print("\n" + "="*80)
     print(f"  {text}")
     print("="*80)
 
-def print_step(step_num, total_steps, text):
-    """Print step information"""
-    print(f"\n[STEP {step_num}/{total_steps}] {text}")
-    print("-"*80)
-
-def run_script(script_name, description):
-    """Run a Python script"""
-    print(f"\n▶ Menjalankan: {script_name}")
-    print(f"  {description}")
-    print()
-    
-    try:
-        # Change to parent directory since scripts expect to be run from root
-        root_dir = Path(__file__).parent.parent
-        result = subprocess.run(
-            [sys.executable, str(Path(__file__).parent / script_name)],
-            cwd=root_dir,
-            check=True,
-            capture_output=False
-        )
-        print(f"\n✓ {script_name} selesai")
-        return True
-    except subprocess.CalledProcessError as e:
-        print(f"\n✗ Error menjalankan {script_name}")
-        print(f"  Exit code: {e.returncode}")
-        return False
-    except FileNotFoundError:
-        print(f"\n✗ File tidak ditemukan: {script_name}")
-        return False
+def print_plan(stages):
+    """Print daftar stage beserta dependensinya"""
+    deps = stage_dependencies(stages)
+    for idx, stage in enumerate(stages, 1):
+        after = ", ".join(sorted(deps[stage.name])) or "-"
+        print(f"  {idx}. {stage.name:<28} ← {after}")
 
-def main():
+def main(jobs=None, force=False, profile=DEFAULT_PROFILE, lazy_charts=False):
     """Main execution"""
     print_header("RUN ALL FORECAST PROGRAMS")
-    
-    print("\n⚠️  CATATAN:")
-    print("  - Forecast kabupaten memakan waktu ~5-10 menit")
-    print("  - Jika tidak ingin menjalankan forecast kabupaten, tekan Ctrl+C saat proses tersebut")
-    print()
-    
-    total_steps = 9
-    
-    # Step 1: Forecast Main Total
-    print_step(1, total_steps, "Forecast Total Traffic")
-    if not run_script("forecast_01_main_total.py", "Forecast traffic keseluruhan"):
-        return
-    
-    # Step 2: Forecast Regional
-    print_step(2, total_steps, "Forecast Regional")
-    if not run_script("forecast_03_by_regional.py", "Forecast 3 regional (Bali Nusra, Central Java, East Java)"):
-        return
-    
-    # Step 3: Forecast Provinsi
-    print_step(3, total_steps, "Forecast Provinsi")
-    if not run_script("forecast_02_by_province.py", "Forecast 6 provinsi"):
-        return
-    
-    # Step 4: Forecast Kabupaten (optional)
-    print_step(4, total_steps, "Forecast Kabupaten (⚠️  Proses Lama)")
-    if not run_script("forecast_04_by_kabupaten.py", "Forecast 119 kabupaten (~5-10 menit)"):
-        print("\n⚠️  Forecast kabupaten gagal atau dibatalkan")
-        print("  Program akan lanjut ke tahap visualisasi tanpa data kabupaten")
-    
-    # Step 5: Visualisasi All Forecasts
-    print_step(5, total_steps, "Visualisasi All Forecasts")
-    if not run_script("visualize_01_all_forecasts.py", "Visualisasi lengkap semua forecast"):
-        return
-    
-    # Step 6: Visualisasi Main Overview
-    print_step(6, total_steps, "Visualisasi Main Overview")
-    if not run_script("visualize_02_main_overview.py", "Visualisasi main forecast overview"):
-        return
-    
-    # Step 7: Visualisasi Province Summary
-    print_step(7, total_steps, "Visualisasi Province Summary")
-    if not run_script("visualize_03_province_summary.py", "Summary comparison provinsi"):
-        return
-    
-    # Step 8: Analysis Top 10 Absolute
-    print_step(8, total_steps, "Analysis Top 10 - Absolute Change")
-    if not run_script("analysis_01_top10_absolute.py", "Top 10 kabupaten peningkatan absolut"):
-        print("\n⚠️  Analysis absolute gagal (mungkin data kabupaten belum ada)")
-    
-    # Step 9: Analysis Top 10 Percentage
-    print_step(9, total_steps, "Analysis Top 10 - Percentage Growth")
-    if not run_script("analysis_03_top10_percentage.py", "Top 10 kabupaten persentase pertumbuhan"):
-        print("\n⚠️  Analysis percentage gagal (mungkin data kabupaten belum ada)")
-    
-    print_header("SEMUA PROSES SELESAI!")
-    print("\n✓ Forecast dan analisis telah selesai")
-    print("✓ Hasil tersimpan di folder forecast_results/")
+
+    # Chart kabupaten tidak dirender di pipeline; builder PPT merender
+    # on-demand hanya chart yang dipakai deck
+    stages = [stage for stage in STAGES
+              if not (lazy_charts and stage.name in LAZY_CHART_STAGES)]
+
+    # Profil render chart (misal draft untuk refresh harian); default tidak
+    # mengubah params sehingga fingerprint stage tetap sama
+    if profile != DEFAULT_PROFILE:
+        for stage in stages:
+            if stage.name in CHART_STAGES:
+                stage.params['profile'] = profile
+
+    # Semua script memakai path relatif terhadap root repo
+    os.chdir(ROOT_DIR)
+    jobs = jobs or os.cpu_count() or 1
+
+    print(f"\nPipeline ({jobs} proses paralel):")
+    print_plan(stages)
+
+    if not Path(WORKBOOK_FILE).exists():
+        print(f"\n✗ File tidak ditemukan: {WORKBOOK_FILE}")
+        return False
+
+    # Parse workbook sekali sebelum stage dibagi ke worker
+    print("\nMenyiapkan cache data...")
+    load_cube()
+
+    start = time.perf_counter()
+    status = run_pipeline(stages, SCRIPT_DIR, jobs=jobs, force=force)
+    elapsed = time.perf_counter() - start
+
+    print_header("RINGKASAN PIPELINE")
+    for stage in stages:
+        print(f"  {stage.name:<28} {status.get(stage.name, 'blocked')}")
+    print(f"\n  Waktu total: {elapsed:.1f} detik")
+
+    failed = [name for name, s in status.items() if s in ('failed', 'blocked')]
+    if failed:
+        print(f"\n⚠️  Stage gagal/dilewati: {', '.join(failed)}")
+
+    print_header("SEMUA PROSES SELESAI!" if not failed else "PROSES SELESAI DENGAN ERROR")
+    print("\n✓ Hasil tersimpan di folder forecast_results/")
     print("\nUntuk membuat PowerPoint:")
     print("  python ../generate_ppt_complete.py")
     print("="*80)
 
+    return not failed
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Jalankan semua program forecast sebagai pipeline")
+    parser.add_argument('--jobs', type=int, default=None,
+                        help="Jumlah stage yang berjalan bersamaan (default: jumlah CPU)")
+    parser.add_argument('--force', action='store_true',
+                        help="Jalankan ulang semua stage walaupun input tidak berubah")
+    parser.add_argument('--profile', choices=list(RENDER_PROFILES), default=DEFAULT_PROFILE,
+                        help="Profil render chart forecast: draft, report, atau print (default)")
+    parser.add_argument('--lazy-charts', action='store_true',
+                        help="Jangan render 119 chart kabupaten; builder PPT merender yang dipakai saja")
+    args = parser.parse_args()
+
     try:
-        main()
+        ok = main(jobs=args.jobs, force=args.force, profile=args.profile, lazy_charts=args.lazy_charts)
     except KeyboardInterrupt:
         print("\n\n⚠️  Proses dibatalkan oleh user")
         sys.exit(1)
+    sys.exit(0 if ok else 1)
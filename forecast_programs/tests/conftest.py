@@ -0,0 +1,55 @@
+"""Test forecast_core: jalankan `python -m pytest forecast_programs/tests` dari root repo"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# forecast_core di-import dari forecast_programs/, sama seperti script
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from forecast_core.cube import CUBE_METRICS, build_cube  # noqa: E402
+
+# 2 regional / 3 provinsi / 6 kabupaten; periode mencakup Tahun Baru 2025 dan
+# horizon 75 hari dari 22 Okt 2025 mencakup Tahun Baru 2026
+HIERARCHY = [('KAB A', 'PROV 1', 'REG X'), ('KAB B', 'PROV 1', 'REG X'),
+             ('KAB C', 'PROV 2', 'REG X'), ('KAB D', 'PROV 2', 'REG X'),
+             ('KAB E', 'PROV 3', 'REG Y'), ('KAB F', 'PROV 3', 'REG Y')]
+DATES = pd.date_range('2024-11-15', '2025-10-22')
+
+
+def synthetic_rows(seed=0):
+    """
+    Baris mentah sintetis seperti workbook VLR: trend + weekly + lonjakan
+    Tahun Baru, beberapa hari kosong acak, KAB F baru mulai Feb 2025
+    (tanpa baseline 1-24 Des) dan KAB E dua baris per hari.
+    """
+    rng = np.random.default_rng(seed)
+    rows = []
+    for number, (kab, prov, region) in enumerate(HIERARCHY):
+        level = 50.0 * (number + 1)
+        for day, date in enumerate(DATES):
+            if kab == 'KAB F' and date < pd.Timestamp('2025-02-01'):
+                continue
+            if rng.random() < 0.03:
+                continue
+            event = 1.4 if (date.month, date.day) in [(12, 31), (1, 1)] else 1.0
+            for _ in range(2 if kab == 'KAB E' else 1):
+                value = level * (1 + 0.001 * day) * event * rng.uniform(0.9, 1.1)
+                rows.append({'Date': date, 'REGION IOH': region, 'PROVINCE': prov,
+                             'KABUPATEN IOH': kab,
+                             **{metric: value * share for metric, share
+                                in zip(CUBE_METRICS, [0.4, 0.6, 1.0, 100, 150])}})
+    return pd.DataFrame(rows)
+
+
+@pytest.fixture
+def raw_rows():
+    return synthetic_rows()
+
+
+@pytest.fixture
+def cube(raw_rows):
+    return build_cube(raw_rows)
@@ -0,0 +1,86 @@
+"""Backtest rolling-origin: metrik ter-vektorisasi vs akumulasi loop per pasangan"""
+
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from forecast_core import build_cube
+from forecast_core.backtest import (INTERVAL_WIDTH, origin_forecasts, rolling_origin_backtest,
+                                    summarize_backtest)
+
+OPTIONS = {'horizon': 14, 'min_train': 60, 'step': 7, 'params': {}}
+
+
+def loop_metrics(cube, horizon, **options):
+    """Metrik per (node, horizon) dengan loop Python atas setiap forecast/aktual"""
+    sums = defaultdict(lambda: defaultdict(float))
+    for _, rows, steps, predicted, actual, valid in origin_forecasts(cube, horizon, **options):
+        for i, row in enumerate(rows):
+            for j, step in enumerate(steps):
+                if not valid[i, j]:
+                    continue
+                p, a = predicted[i, j], actual[i, j]
+                entry = sums[(row, step + 1)]
+                entry['N'] += 1
+                if a != 0:
+                    entry['n_nonzero'] += 1
+                    entry['ape'] += abs(p - a) / abs(a)
+                    entry['bias'] += (p - a) / a
+                if abs(a) + abs(p) > 0:
+                    entry['smape'] += 2 * abs(p - a) / (abs(a) + abs(p))
+                entry['covered'] += abs(p - a) <= INTERVAL_WIDTH * abs(p)
+
+    records = []
+    for (row, h), entry in sorted(sums.items()):
+        records.append({
+            'Level': cube.nodes['level'].iat[row], 'Name': cube.nodes['name'].iat[row],
+            'Horizon': h, 'N': int(entry['N']),
+            'MAPE': 100 * entry['ape'] / entry['n_nonzero'],
+            'sMAPE': 100 * entry['smape'] / entry['N'],
+            'Bias': 100 * entry['bias'] / entry['n_nonzero'],
+            'Coverage': 100 * entry['covered'] / entry['N'],
+        })
+    return pd.DataFrame(records)
+
+
+def test_vectorised_metrics_match_loop(cube):
+    table = rolling_origin_backtest(cube, **OPTIONS)
+    expected = loop_metrics(cube, OPTIONS['horizon'], min_train=60, step=7, params={})
+
+    key = ['Level', 'Name', 'Horizon']
+    merged = table.merge(expected, on=key, suffixes=('', '_loop'), validate='one_to_one')
+    assert len(merged) == len(table) == len(expected)
+    assert set(merged['Level']) == {'total', 'regional', 'provinsi', 'kabupaten'}
+    np.testing.assert_array_equal(merged['N'], merged['N_loop'])
+    for metric in ['MAPE', 'sMAPE', 'Bias', 'Coverage']:
+        np.testing.assert_allclose(merged[metric], merged[f'{metric}_loop'], rtol=1e-10, err_msg=metric)
+
+
+def test_origin_forecast_ignores_future_data(raw_rows, cube):
+    origin = 120
+    cutoff = cube.dates[origin]
+    changed = raw_rows.copy()
+    changed.loc[changed['Date'] >= cutoff, 'Traffic_Total(TB)'] *= 3.0
+    changed_cube = build_cube(changed)
+
+    def predictions(source):
+        for _, rows, _, predicted, _, _ in origin_forecasts(source, horizon=14, min_train=origin,
+                                                            params={}):
+            return rows, predicted
+
+    rows, predicted = predictions(cube)
+    changed_rows, changed_predicted = predictions(changed_cube)
+    np.testing.assert_array_equal(rows, changed_rows)
+    np.testing.assert_array_equal(predicted, changed_predicted)
+
+
+def test_summary_weights_by_pairs(cube):
+    table = rolling_origin_backtest(cube, **OPTIONS)
+    summary = summarize_backtest(table).set_index('Level')
+
+    for level, rows in table.groupby('Level'):
+        assert summary.loc[level, 'Series'] == rows['Name'].nunique()
+        assert summary.loc[level, 'N'] == rows['N'].sum()
+        assert summary.loc[level, 'MAPE'] == pytest.approx(np.average(rows['MAPE'], weights=rows['N']))
@@ -0,0 +1,60 @@
+"""Cube hierarki satu pass vs groupby pandas per level (cara script sebelum cube)"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from forecast_core.cube import CUBE_METRICS, LEVEL_COLUMNS, LEVELS, TOTAL_NAME, build_cube
+
+
+@pytest.fixture
+def rows_with_nan(raw_rows):
+    # Nilai kosong di workbook dihitung 0 oleh groupby().sum()
+    rows = raw_rows.copy()
+    rows.loc[rows.index[::37], 'Traffic_H3I (TB)'] = np.nan
+    return rows
+
+
+def groupby_daily(rows, level):
+    """Agregasi harian per node seperti load_and_prepare_*_data() versi awal"""
+    key = rows[LEVEL_COLUMNS[level]] if level != 'total' else pd.Series(TOTAL_NAME, index=rows.index)
+    grouped = rows.groupby([key.rename('Name'), 'Date'])
+    return grouped[CUBE_METRICS].sum().join(grouped.size().rename('Rows'))
+
+
+@pytest.mark.parametrize('level', LEVELS)
+def test_cube_matches_groupby(rows_with_nan, level):
+    cube = build_cube(rows_with_nan)
+    expected = groupby_daily(rows_with_nan, level)
+
+    assert cube.level_names(level) == sorted(expected.index.get_level_values('Name').unique())
+    for name, daily in expected.groupby(level='Name'):
+        daily = daily.droplevel('Name')
+        frame = cube.daily_frame(level, name)
+        pd.testing.assert_index_equal(pd.DatetimeIndex(frame['Date']), pd.DatetimeIndex(daily.index),
+                                      check_names=False)
+        np.testing.assert_allclose(frame[CUBE_METRICS].to_numpy(), daily[CUBE_METRICS].to_numpy(),
+                                   rtol=1e-12)
+
+        idx = cube.index_of(level, name)
+        counts = pd.Series(cube.counts[idx], index=cube.dates)
+        np.testing.assert_array_equal(counts[counts > 0].to_numpy(), daily['Rows'].to_numpy())
+
+
+def test_parents_follow_hierarchy(raw_rows, cube):
+    mapping = raw_rows.drop_duplicates('KABUPATEN IOH').set_index('KABUPATEN IOH')
+    for kab in cube.level_names('kabupaten'):
+        province = cube.parent_of('kabupaten', kab)
+        assert province == mapping.loc[kab, 'PROVINCE']
+        assert cube.parent_of('provinsi', province) == mapping.loc[kab, 'REGION IOH']
+    assert {cube.parent_of('regional', r) for r in cube.level_names('regional')} == {TOTAL_NAME}
+
+
+def test_series_and_level_matrix_views(cube):
+    # KAB F baru mulai Feb 2025: series hanya hari yang ada datanya
+    series = cube.series('kabupaten', 'KAB F')
+    matrix = cube.level_matrix('kabupaten')
+    row = matrix[cube.level_names('kabupaten').index('KAB F')]
+    assert len(series) == (cube.counts[cube.index_of('kabupaten', 'KAB F')] > 0).sum()
+    assert (row[cube.dates < '2025-02-01'] == 0).all()
+    np.testing.assert_array_equal(series, row[row > 0])
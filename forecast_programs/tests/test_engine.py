@@ -0,0 +1,146 @@
+"""Engine batch (semua series sebagai satu matrix) vs loop per series versi awal"""
+
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from forecast_core import forecast, forecast_level
+from forecast_core.engine import ensemble_forecast, horizon_forecast
+from forecast_core.rng import entity_key, entity_noise
+
+METRIC = 'Traffic_Total(TB)'
+
+
+def loop_forecast(daily_data, noise, days_ahead=75):
+    """
+    create_kabupaten_forecast() sebelum forecast_core (MA + WMA + ES
+    dengan np.polyfit, faktor Tahun Baru dari tanggal 2024, horizon
+    per hari dengan np.append), noise diambil dari `noise` (standard
+    normal) sebagai ganti np.random.normal.
+    """
+    ny_period = daily_data[(daily_data['Date'] >= '2024-12-25') & (daily_data['Date'] <= '2025-01-07')]
+    baseline_period = daily_data[(daily_data['Date'] >= '2024-12-01') & (daily_data['Date'] <= '2024-12-24')]
+    baseline_avg = (daily_data[METRIC].mean() if len(baseline_period) == 0
+                    else baseline_period[METRIC].mean())
+    event_factors = {row.Date.strftime('%Y-%m-%d'): getattr(row, 'Traffic') / baseline_avg
+                     for row in ny_period.rename(columns={METRIC: 'Traffic'}).itertuples()}
+    recent_avg = daily_data.tail(30)[METRIC].mean()
+
+    last_date = daily_data['Date'].max()
+    forecast_dates = [last_date + timedelta(days=i) for i in range(1, days_ahead + 1)]
+    traffic_data = daily_data[METRIC].values
+
+    recent = traffic_data[-7:]
+    ma_base, ma_trend = np.mean(recent), np.polyfit(np.arange(len(recent)), recent, 1)[0]
+    window = min(14, len(traffic_data))
+    recent = traffic_data[-window:]
+    weights = np.exp(np.linspace(-1, 0, window))
+    wma_base = np.sum(recent * weights / weights.sum())
+    wma_trend = np.polyfit(np.arange(len(recent)), recent, 1)[0]
+    smoothed = [traffic_data[0]]
+    for i in range(1, len(traffic_data)):
+        smoothed.append(0.3 * traffic_data[i] + 0.7 * smoothed[i - 1])
+    es_trend = np.polyfit(np.arange(len(smoothed[-30:])), smoothed[-30:], 1)[0]
+
+    base_value = (ma_base + wma_base + smoothed[-1]) / 3
+    trend = (ma_trend + wma_trend + es_trend) / 3
+
+    daily_patterns = {}
+    for date in pd.date_range('2025-12-25', '2026-01-07'):
+        key = date.replace(year=2024).strftime('%Y-%m-%d')
+        if key in event_factors:
+            daily_patterns[date] = event_factors[key]
+
+    forecasts = []
+    for i, forecast_date in enumerate(forecast_dates):
+        if forecast_date in daily_patterns:
+            base_forecast = recent_avg
+        else:
+            base_forecast = base_value + trend * 0.5 * i
+        weekly_factor = 1.05 if forecast_date.dayofweek in [4, 5, 6] else 1.0
+        ny_factor = daily_patterns.get(forecast_date, 1.0)
+        value = base_forecast * weekly_factor * ny_factor
+        value += noise[i] * base_forecast * (0.01 if ny_factor > 1.0 else 0.02)
+        forecasts.append(max(value, 0))
+        traffic_data = np.append(traffic_data, value)
+    return pd.DatetimeIndex(forecast_dates), np.array(forecasts)
+
+
+@pytest.mark.parametrize('level', ['kabupaten', 'provinsi', 'regional'])
+def test_batch_forecast_matches_per_series_loop(cube, level):
+    names, forecast_dates, forecasts = forecast_level(cube, level, params={})
+
+    compared = 0
+    for name, row in zip(names, forecasts):
+        daily_data = cube.daily_frame(level, name, [METRIC])
+        # Engine memulai semua node dari hari terakhir cube; loop dari hari terakhir node
+        if daily_data['Date'].max() != cube.dates.max():
+            continue
+        noise = entity_noise([entity_key(level, name)], len(forecast_dates))[0]
+        expected_dates, expected = loop_forecast(daily_data, noise)
+        pd.testing.assert_index_equal(forecast_dates, expected_dates)
+        np.testing.assert_allclose(row, expected, rtol=1e-9, err_msg=name)
+        compared += 1
+    assert compared >= 2
+
+
+def loop_horizon(base_value, trend, event_base, factors, event_mask, forecast_dates, noise, damping):
+    """Horizon satu series hari per hari (bentuk loop awal, tanpa np.append)"""
+    values = []
+    for i, date in enumerate(forecast_dates):
+        base_forecast = event_base if event_mask[i] else base_value + trend * damping * i
+        value = base_forecast * (1.05 if date.dayofweek in [4, 5, 6] else 1.0) * factors[i]
+        value += noise[i] * base_forecast * (0.01 if factors[i] > 1.0 else 0.02)
+        values.append(max(value, 0))
+    return np.array(values)
+
+
+def test_closed_form_horizon_matches_daily_loop():
+    rng = np.random.default_rng(3)
+    n_series, days_ahead = 5, 75
+    forecast_dates = pd.date_range('2025-10-23', periods=days_ahead)
+    base_value = rng.uniform(10, 100, n_series)
+    # Trend negatif besar: sebagian horizon di-clip ke 0
+    trend = rng.uniform(-3, 1, n_series)
+    event_base = rng.uniform(10, 100, n_series)
+    damping = rng.uniform(0.2, 1.0, n_series)
+    in_event = (forecast_dates >= '2025-12-25') & (forecast_dates <= '2026-01-07')
+    event_mask = in_event[None, :] & (rng.random((n_series, days_ahead)) < 0.8)
+    factors = np.where(event_mask, rng.uniform(0.8, 1.5, (n_series, days_ahead)), 1.0)
+    noise = rng.standard_normal((n_series, days_ahead))
+
+    forecasts = horizon_forecast(base_value, trend, event_base, factors, event_mask,
+                                 forecast_dates, noise, damping=damping)
+
+    assert (forecasts == 0).any()
+    for row in range(n_series):
+        expected = loop_horizon(base_value[row], trend[row], event_base[row], factors[row],
+                                event_mask[row], forecast_dates, noise[row], damping[row])
+        np.testing.assert_allclose(forecasts[row], expected, rtol=1e-12, atol=1e-12)
+
+
+def test_missing_days_match_compacted_series(cube):
+    # Hari kosong di tengah history diabaikan, seperti series per entity
+    level_names = cube.level_names('kabupaten')
+    indices = cube.level_indices('kabupaten')
+    history = cube.level_matrix('kabupaten')
+    observed = cube.counts[indices] > 0
+    noise = entity_noise([entity_key('kabupaten', n) for n in level_names], 75)
+    _, batch = ensemble_forecast(history, cube.dates, noise=noise, observed=observed)
+
+    for row, name in enumerate(level_names):
+        series = cube.series('kabupaten', name)
+        _, single = ensemble_forecast(series[None, :], cube.dates[observed[row]], noise=noise[row:row + 1])
+        if cube.dates[observed[row]].max() == cube.dates.max():
+            np.testing.assert_allclose(batch[row], single[0], rtol=1e-9, err_msg=name)
+
+
+def test_forecast_frames(cube):
+    frames = forecast('provinsi', horizon=10, cube=cube, params={})
+    assert sorted(frames) == cube.level_names('provinsi')
+    for df in frames.values():
+        assert list(df.columns[:4]) == ['Date', METRIC, 'Lower_Bound', 'Upper_Bound']
+        np.testing.assert_allclose(df['Lower_Bound'], df[METRIC] * 0.9)
+        np.testing.assert_allclose(df['Upper_Bound'], df[METRIC] * 1.1)
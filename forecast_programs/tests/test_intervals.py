@@ -0,0 +1,100 @@
+"""Interval Monte-Carlo: histogram streaming vs np.quantile atas semua sample path"""
+
+import numpy as np
+import pytest
+
+from forecast_core import forecast
+from forecast_core.intervals import RATIO_BINS, RATIO_MAX, QuantileHistogram, simulate_quantiles
+from forecast_core.rng import entity_key, entity_rng
+
+QUANTILES = (0.05, 0.5, 0.95)
+BIN_WIDTH = RATIO_MAX / RATIO_BINS
+
+
+def full_path_quantiles(point, residuals, keys, quantiles, n_paths):
+    """Semua sample path sekaligus, NaN dibuang per series × horizon, lalu np.quantile"""
+    n_series, horizon = point.shape
+    result = np.empty((len(quantiles), n_series, horizon))
+    for row, key in enumerate(keys):
+        usable = np.flatnonzero(~np.isnan(residuals[row]).all(axis=1))
+        choices = np.zeros(n_paths, dtype=np.int64)
+        if len(usable):
+            rng = entity_rng(f"{key}/intervals")
+            choices = usable[rng.integers(0, len(usable), size=n_paths)]
+        ratios = np.maximum(1 + residuals[row, choices].astype(float), 0)
+        for step in range(horizon):
+            samples = ratios[:, step][~np.isnan(ratios[:, step])]
+            if len(samples):
+                result[:, row, step] = np.quantile(samples, quantiles) * point[row, step]
+            else:
+                result[:, row, step] = np.interp(quantiles, [0, 0.5, 1], [0.9, 1.0, 1.1]) * point[row, step]
+    return result
+
+
+@pytest.fixture
+def residuals():
+    rng = np.random.default_rng(11)
+    n_series, n_origins, horizon = 3, 40, 10
+    values = rng.normal(0, 0.15, (n_series, n_origins, horizon)).astype(np.float32)
+    # Origin terakhir tidak punya aktual untuk horizon panjang
+    late = np.arange(n_origins)[:, None] + np.arange(horizon)[None, :] >= n_origins
+    values[:, late] = np.nan
+    values[1, :, 7] = np.nan      # satu horizon tanpa residual sama sekali
+    values[2] = np.nan            # series tanpa residual
+    return values
+
+
+def test_histogram_matches_np_quantile():
+    rng = np.random.default_rng(5)
+    ratios = rng.uniform(0.5, 1.6, (4000, 2, 3))
+    ratios[::3, 0, 1] = np.nan
+
+    histogram = QuantileHistogram(2, 3)
+    for chunk in np.array_split(ratios, 7):
+        histogram.add(chunk)
+
+    expected = np.nanquantile(ratios, QUANTILES, axis=0)
+    np.testing.assert_array_equal(histogram.sample_counts(), (~np.isnan(ratios)).sum(axis=0))
+    np.testing.assert_allclose(histogram.quantiles(QUANTILES), expected, atol=BIN_WIDTH)
+
+
+def test_simulation_matches_full_paths(residuals):
+    point = np.random.default_rng(2).uniform(50, 150, (3, 10))
+    keys = [entity_key('kabupaten', name) for name in ['KAB A', 'KAB B', 'KAB C']]
+
+    result = simulate_quantiles(point, residuals, keys, QUANTILES, n_paths=3000, chunk_paths=256)
+
+    expected = full_path_quantiles(point, residuals, keys, QUANTILES, n_paths=3000)
+    np.testing.assert_allclose(result, expected, atol=0, rtol=BIN_WIDTH * 1.5)
+
+
+def test_missing_residuals_fall_back_to_fixed_bounds(residuals):
+    point = np.full((3, 10), 100.0)
+    keys = [entity_key('kabupaten', name) for name in ['KAB A', 'KAB B', 'KAB C']]
+    # Quantile 0/0.5/1 dari fallback = batas tetap -10%, forecast, +10%
+    result = simulate_quantiles(point, residuals, keys, (0.0, 0.5, 1.0), n_paths=500)
+
+    np.testing.assert_allclose(result[:, 2], [[90.0] * 10, [100.0] * 10, [110.0] * 10])
+    np.testing.assert_allclose(result[:, 1, 7], [90.0, 100.0, 110.0])
+    # Horizon panjang hanya dari origin yang punya residual, bukan residual 0
+    assert result[0, 0, 9] < 99.0 and result[2, 0, 9] > 101.0
+
+
+def test_bootstrap_forecast_frames(cube):
+    options = {'horizon': 14, 'cube': cube, 'params': {}, 'intervals': 'bootstrap', 'n_paths': 400}
+    frames = forecast('provinsi', **options)
+    fixed = forecast('provinsi', horizon=14, cube=cube, params={})
+
+    for name, df in frames.items():
+        assert list(df.columns) == ['Date', 'Traffic_Total(TB)', 'Lower_Bound', 'Upper_Bound',
+                                    'P5', 'P50', 'P95']
+        np.testing.assert_array_equal(df['Traffic_Total(TB)'], fixed[name]['Traffic_Total(TB)'])
+        np.testing.assert_array_equal(df['Lower_Bound'], df['P5'])
+        np.testing.assert_array_equal(df['Upper_Bound'], df['P95'])
+        assert (df['P5'] <= df['P50']).all() and (df['P50'] <= df['P95']).all()
+
+    # Stream per entity: subset nama memberi interval yang sama
+    name = sorted(frames)[0]
+    subset = forecast('provinsi', names=[name], **options)[name]
+    np.testing.assert_allclose(subset[['P5', 'P50', 'P95']], frames[name][['P5', 'P50', 'P95']],
+                               rtol=1e-9)
@@ -0,0 +1,59 @@
+"""Kernel ter-vektorisasi vs implementasi loop awal (forecast_0x sebelum forecast_core)"""
+
+import numpy as np
+import pytest
+
+from forecast_core import kernels
+from forecast_core.engine import trend_slopes
+
+
+def loop_exponential_smoothing(data, alpha=0.3):
+    """Exponential smoothing versi awal (list + loop Python)"""
+    smoothed = [data[0]]
+    for i in range(1, len(data)):
+        smoothed.append(alpha * data[i] + (1 - alpha) * smoothed[i - 1])
+    return np.array(smoothed)
+
+
+@pytest.fixture
+def series():
+    rng = np.random.default_rng(0)
+    return rng.gamma(5.0, 20.0, size=(4, 700))
+
+
+@pytest.mark.parametrize('alpha', [0.1, 0.3, 0.8])
+def test_exponential_smoothing_matches_loop(series, alpha):
+    expected = np.array([loop_exponential_smoothing(row, alpha) for row in series])
+    np.testing.assert_allclose(kernels.exponential_smoothing_filter(series, alpha), expected,
+                               rtol=1e-12)
+    np.testing.assert_allclose(kernels.exponential_smoothing_filter(series[0], alpha), expected[0],
+                               rtol=1e-12)
+    np.testing.assert_allclose(kernels.exponential_smoothing_filter(series, alpha, np.float32),
+                               expected, rtol=1e-4)
+
+
+def test_exponential_smoothing_blocked_fallback_matches_loop(series, monkeypatch):
+    monkeypatch.setattr(kernels, 'lfilter', None)
+    expected = np.array([loop_exponential_smoothing(row) for row in series])
+    np.testing.assert_allclose(kernels.exponential_smoothing_filter(series), expected, rtol=1e-10)
+
+
+@pytest.mark.parametrize('window', [2, 7, 30, 365])
+def test_trend_slopes_match_polyfit(series, window):
+    windows = series[:, -window:]
+    expected = [np.polyfit(np.arange(window), row, 1)[0] for row in windows]
+    np.testing.assert_allclose(trend_slopes(windows), expected, rtol=1e-9, atol=1e-12)
+
+
+def test_short_window_has_zero_slope(series):
+    np.testing.assert_array_equal(trend_slopes(series[:, -1:]), np.zeros(len(series)))
+
+
+@pytest.mark.parametrize('window', [1, 7, 14])
+def test_wma_weights_match_original_formula(series, window):
+    weights = np.exp(np.linspace(-1, 0, window))
+    expected = [np.sum(row[-window:] * (weights / weights.sum())) for row in series]
+    np.testing.assert_allclose(series[:, -window:] @ kernels.wma_weights(window), expected, rtol=1e-12)
+    # Cache dibagi antar pemanggil: array read-only, tidak bisa diubah tanpa sengaja
+    assert kernels.wma_weights(window) is kernels.wma_weights(window)
+    assert not kernels.wma_weights(window).flags.writeable
@@ -0,0 +1,65 @@
+"""Manifest build: skip artifact up-to-date, invalidasi saat input/output berubah"""
+
+import numpy as np
+import pandas as pd
+
+from forecast_core import build_cube
+from forecast_core.manifest import BuildManifest, fingerprint
+from forecast_02_by_province import FORECAST_PARAMS, province_fingerprints
+
+
+def test_fingerprint_is_stable_and_content_based():
+    frame = pd.DataFrame({'Date': pd.date_range('2025-01-01', periods=3), 'x': [1.0, 2.0, 3.0]})
+    assert fingerprint(frame, {'b': 1, 'a': 2}) == fingerprint(frame.copy(), {'a': 2, 'b': 1})
+    assert fingerprint(frame) != fingerprint(frame.assign(x=[1.0, 2.0, 3.5]))
+    assert fingerprint(np.arange(3.0)) != fingerprint(np.arange(3.0).astype(np.float32))
+    assert fingerprint('a', 'b') != fingerprint('ab')
+
+
+def test_manifest_skips_until_input_or_output_changes(tmp_path):
+    output = tmp_path / 'kab_a.csv'
+    output.write_text('Date,Traffic\n2025-01-01,1\n')
+    manifest = BuildManifest('kabupaten', directory=tmp_path / 'manifest')
+    assert not manifest.is_current('KAB A', 'fp1')
+
+    manifest.record('KAB A', 'fp1', [output])
+    manifest.save()
+    reloaded = BuildManifest('kabupaten', directory=tmp_path / 'manifest')
+    assert reloaded.is_current('KAB A', 'fp1')
+    assert not reloaded.is_current('KAB A', 'fp2')
+
+    # Output diubah atau dihapus di luar script → dibangun ulang
+    output.write_text('Date,Traffic\n2025-01-01,2\n')
+    assert not reloaded.is_current('KAB A', 'fp1')
+    output.unlink()
+    assert not reloaded.is_current('KAB A', 'fp1')
+
+    reloaded.discard('KAB A')
+    assert 'KAB A' not in reloaded.entries
+
+
+def test_manifest_ignores_corrupt_file(tmp_path):
+    (tmp_path / 'provinsi.json').write_text('{not json')
+    assert BuildManifest('provinsi', directory=tmp_path).entries == {}
+
+
+def test_province_fingerprints_follow_cube_inputs(raw_rows, cube):
+    provinces = cube.level_names('provinsi')
+    options = {'profile': 'draft'}
+    before = province_fingerprints(cube, provinces, FORECAST_PARAMS, options)
+    assert before == province_fingerprints(build_cube(raw_rows), provinces, FORECAST_PARAMS, options)
+    assert before != province_fingerprints(cube, provinces, dict(FORECAST_PARAMS, intervals='bootstrap'),
+                                           options)
+
+    # Data PROV 1 berubah: hanya PROV 1 yang stale
+    changed = raw_rows.copy()
+    changed.loc[changed['PROVINCE'] == 'PROV 1', 'Traffic_Total(TB)'] *= 1.01
+    after = province_fingerprints(build_cube(changed), provinces, FORECAST_PARAMS, options)
+    assert [p for p in provinces if after[p] != before[p]] == ['PROV 1']
+
+    # Hari baru hanya untuk PROV 3: awal forecast bergeser untuk semua provinsi
+    extra = raw_rows[raw_rows['PROVINCE'] == 'PROV 3'].tail(1).assign(
+        Date=raw_rows['Date'].max() + pd.Timedelta(days=1))
+    shifted = province_fingerprints(build_cube(pd.concat([raw_rows, extra])), provinces,
+                                    FORECAST_PARAMS, options)
+    assert all(shifted[p] != before[p] for p in provinces)
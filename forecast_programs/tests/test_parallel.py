@@ -0,0 +1,46 @@
+"""Worker process: hasil sama dengan serial, cube dibagikan lewat mmap"""
+
+import numpy as np
+import pytest
+
+from forecast_core import forecast_level
+from forecast_core.parallel import attach_cube, run_parallel, share_cube, shared_cube
+from forecast_core.rng import entity_key, entity_noise
+
+KEYS = [entity_key('kabupaten', name) for name in ['KAB A', 'KAB B', 'KAB C', 'KAB D']]
+
+
+def entity_noise_row(key, days_ahead=30):
+    """Noise satu entity (level modul supaya bisa dipakai worker process)"""
+    return entity_noise([key], days_ahead)[0]
+
+
+def shared_forecast_row(name):
+    """Forecast satu kabupaten dari cube bersama di worker"""
+    return forecast_level(shared_cube(), 'kabupaten', names=[name], params={})[2][0]
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_entity_noise_independent_of_workers(workers):
+    rows = np.array(list(run_parallel(entity_noise_row, KEYS, workers=workers)))
+    np.testing.assert_array_equal(rows, entity_noise(KEYS, 30))
+
+
+def test_shared_cube_round_trip(cube, tmp_path):
+    shared, meta = share_cube(cube, cache_dir=tmp_path)
+    with shared as handle:
+        attached = attach_cube(handle, meta)
+        np.testing.assert_array_equal(attached.values, cube.values)
+        np.testing.assert_array_equal(attached.counts, cube.counts)
+        assert attached.dates.equals(cube.dates)
+        assert attached.nodes.equals(cube.nodes)
+    assert not list(tmp_path.rglob('*.npy'))
+
+
+def test_workers_forecast_from_shared_cube(cube, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    names, _, expected = forecast_level(cube, 'kabupaten', params={})
+
+    rows = np.array(list(run_parallel(shared_forecast_row, names, workers=2, cube=cube)))
+
+    np.testing.assert_allclose(rows, expected, rtol=1e-12)
@@ -0,0 +1,73 @@
+"""Rekonsiliasi hierarki: forecast koheren dan base forecast dari results store"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from forecast_core import LEVELS, forecast, reconcile as reconcile_module
+from forecast_core.cube import CUBE_METRICS, build_cube
+from forecast_core.reconcile import BOTTOM_LEVEL, METHODS, reconcile, stored_base, summing_matrix
+from forecast_core.results import write_results
+
+
+@pytest.fixture
+def small_cube():
+    """Cube 2 regional / 3 provinsi / 6 kabupaten × 90 hari"""
+    hierarchy = [('KAB A', 'PROV 1', 'REG X'), ('KAB B', 'PROV 1', 'REG X'),
+                 ('KAB C', 'PROV 2', 'REG X'), ('KAB D', 'PROV 2', 'REG X'),
+                 ('KAB E', 'PROV 3', 'REG Y'), ('KAB F', 'PROV 3', 'REG Y')]
+    dates = pd.date_range('2025-01-01', periods=90)
+    rng = np.random.default_rng(1)
+    rows = [{'KABUPATEN IOH': kab, 'PROVINCE': prov, 'REGION IOH': region, 'Date': date,
+             **{metric: rng.gamma(4.0, 10.0) for metric in CUBE_METRICS}}
+            for kab, prov, region in hierarchy for date in dates]
+    return build_cube(pd.DataFrame(rows))
+
+
+@pytest.fixture
+def store(cube, tmp_path, monkeypatch):
+    """Results store semua level di direktori sementara (RESULTS_DIR relatif)"""
+    monkeypatch.chdir(tmp_path)
+    forecasts = {level: forecast(level, horizon=14, cube=cube, params={}) for level in LEVELS}
+    for level, level_forecasts in forecasts.items():
+        write_results(level, level_forecasts)
+    return forecasts
+
+
+@pytest.mark.parametrize('dense', [False, True])
+@pytest.mark.parametrize('method', METHODS)
+def test_reconciled_forecast_is_coherent(small_cube, method, dense, monkeypatch):
+    if dense:
+        # Fallback tanpa scipy: summing matrix dan solve MinT dense
+        monkeypatch.setattr(reconcile_module, 'sparse', None)
+    rng = np.random.default_rng(2)
+    base = rng.gamma(4.0, 10.0, size=(len(small_cube.nodes), 14))
+    S = summing_matrix(small_cube)
+    weights = np.asarray(S.sum(axis=1)).ravel() * rng.uniform(0.5, 2.0, len(small_cube.nodes))
+
+    reconciled = reconcile(small_cube, base, method, S=S, weights=weights)
+
+    bottom = reconciled[small_cube.level_indices(BOTTOM_LEVEL)]
+    np.testing.assert_allclose(S @ bottom, reconciled, rtol=1e-10)
+    if method == 'bottom_up':
+        np.testing.assert_allclose(bottom, base[small_cube.level_indices(BOTTOM_LEVEL)])
+    if method == 'top_down':
+        np.testing.assert_allclose(reconciled[0], base[0])
+
+
+def test_stored_base_follows_cube_node_order(cube, store):
+    forecast_dates, base = stored_base(cube)
+
+    assert len(forecast_dates) == 14
+    for level, level_forecasts in store.items():
+        for name, df in level_forecasts.items():
+            np.testing.assert_array_equal(base[cube.index_of(level, name)],
+                                          df['Traffic_Total(TB)'].to_numpy())
+
+
+def test_stored_base_rejects_names_missing_from_cube(cube, store):
+    # Store dari data lama: kabupaten yang sudah tidak ada di workbook
+    write_results('kabupaten', {'KAB Z': store['kabupaten']['KAB A']}, replace=['KAB Z'])
+
+    with pytest.raises(ValueError, match=r"forecast_04_by_kabupaten\.py.*KAB Z"):
+        stored_base(cube)
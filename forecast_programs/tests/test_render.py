@@ -0,0 +1,98 @@
+"""Chart dari template yang dipakai ulang = chart dari figure baru (per pixel)"""
+
+from pathlib import Path
+
+import matplotlib
+import numpy as np
+import pytest
+from PIL import Image
+
+from forecast_core import forecast, render
+from forecast_core.render import (THUMBNAIL_WIDTH, ForecastChartTemplate, chart_outputs,
+                                  forecast_chart_spec, render_chart, render_charts, render_options,
+                                  save_figure)
+
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt  # noqa: E402
+
+NAMES = ['KAB A', 'KAB E', 'KAB F']
+
+
+def chart_specs(cube, options):
+    """Spesifikasi chart NAMES dari forecast cube test"""
+    forecasts = forecast('kabupaten', horizon=75, names=NAMES, cube=cube, params={})
+    return [forecast_chart_spec('kabupaten', name, cube.daily_frame('kabupaten', name, [render.METRIC]),
+                                forecasts[name], options=options)
+            for name in NAMES]
+
+
+def moved(spec, directory):
+    """Spesifikasi yang sama dengan file output di `directory`"""
+    return {**spec, 'path': str(directory / Path(spec['path']).name)}
+
+
+def fresh_render(spec, directory):
+    """Render referensi: figure baru untuk satu chart, disimpan lewat savefig()"""
+    directory.mkdir(exist_ok=True)
+    spec = moved(spec, directory)
+    template = ForecastChartTemplate(spec)
+    save_figure(template.fig, spec)
+    plt.close(template.fig)
+    return chart_outputs(spec)
+
+
+def pixels(path):
+    with Image.open(path) as image:
+        return np.asarray(image.convert('RGBA'))
+
+
+@pytest.mark.parametrize('profile, image_format, thumbnails', [
+    ('draft', 'png', False),
+    ('draft', 'webp', True),
+    ('report', 'png', False),
+])
+def test_template_render_matches_fresh_render(cube, tmp_path, monkeypatch,
+                                              profile, image_format, thumbnails):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(render, '_templates', {})
+    # dpi kecil supaya test cepat; bbox tight dan format tetap dari profil
+    options = {**render_options(profile, image_format, thumbnails), 'dpi': 40}
+    specs = chart_specs(cube, options)
+
+    # Urutan bolak-balik: template diisi ulang dengan data lebih besar/kecil
+    for spec in specs + specs[:1]:
+        render_chart(spec)
+        references = fresh_render(spec, tmp_path / 'fresh')
+        for output, reference in zip(chart_outputs(spec), references):
+            np.testing.assert_array_equal(pixels(output), pixels(reference), err_msg=str(output))
+
+
+def test_worker_render_matches_serial(cube, tmp_path):
+    options = {**render_options('draft'), 'dpi': 40}
+    specs = chart_specs(cube, options)
+    serial = [moved(spec, tmp_path / 'serial') for spec in specs]
+    pooled = [moved(spec, tmp_path / 'pooled') for spec in specs]
+
+    assert {Path(path) for _, path, _ in render_charts(serial)} == {Path(s['path']) for s in serial}
+    assert len(list(render_charts(pooled, workers=2))) == len(pooled)
+    for a, b in zip(serial, pooled):
+        np.testing.assert_array_equal(pixels(a['path']), pixels(b['path']), err_msg=b['path'])
+
+
+def test_optimized_png_and_thumbnails(cube, tmp_path):
+    spec = chart_specs(cube, {**render_options('draft'), 'dpi': 60})[0]
+    plain = moved(spec, tmp_path / 'png')
+    optimized = moved({**spec, **render_options('draft', 'png-optimized', thumbnails=True), 'dpi': 60},
+                      tmp_path / 'optimized')
+    list(render_charts([plain, optimized]))
+
+    path, thumbnail = chart_outputs(optimized)
+    with Image.open(path) as image:
+        assert image.mode == 'P' and len(image.getcolors(256)) <= 256
+    # Palet 256 warna tanpa dither: selisih per pixel kecil terhadap png biasa
+    difference = np.abs(pixels(path)[..., :3].astype(int) - pixels(plain['path'])[..., :3])
+    assert difference.mean() < 2.0
+
+    with Image.open(thumbnail) as small, Image.open(path) as large:
+        assert small.width == THUMBNAIL_WIDTH
+        assert small.height == round(large.height * THUMBNAIL_WIDTH / large.width)
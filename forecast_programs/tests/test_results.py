@@ -0,0 +1,68 @@
+"""Results store: isi yang dibaca ulang sama dengan CSV per entity versi awal"""
+
+import pandas as pd
+import pytest
+
+from forecast_core import forecast
+from forecast_core.results import (read_results, results_by_name, results_path, stored_names,
+                                   write_results)
+
+
+@pytest.fixture(params=['parquet', 'pickle'])
+def store_dir(request, tmp_path, monkeypatch):
+    if request.param == 'pickle':
+        monkeypatch.setattr('forecast_core.results._parquet_available', lambda: False)
+    elif results_path('kabupaten').suffix != '.parquet':
+        pytest.skip("pyarrow tidak terinstall")
+    return tmp_path
+
+
+@pytest.fixture
+def frames(cube):
+    return forecast('kabupaten', horizon=14, cube=cube, params={})
+
+
+def test_round_trip_matches_csv(store_dir, frames):
+    write_results('kabupaten', frames, results_dir=store_dir)
+    stored = results_by_name('kabupaten', results_dir=store_dir)
+
+    assert sorted(stored) == sorted(frames)
+    for name, df in frames.items():
+        assert stored[name].to_csv(index=False) == df.to_csv(index=False), name
+
+
+def test_replace_keeps_other_nodes(store_dir, frames):
+    write_results('kabupaten', frames, results_dir=store_dir)
+    changed = {'KAB A': frames['KAB A'].assign(**{'Traffic_Total(TB)': 1.0})}
+
+    # Node di `replace` tanpa forecast baru dihapus dari store
+    write_results('kabupaten', changed, replace=['KAB A', 'KAB B'], results_dir=store_dir)
+    stored = results_by_name('kabupaten', results_dir=store_dir)
+    assert stored_names('kabupaten', results_dir=store_dir) == set(frames) - {'KAB B'}
+    assert (stored['KAB A']['Traffic_Total(TB)'] == 1.0).all()
+    pd.testing.assert_frame_equal(stored['KAB C'], frames['KAB C'])
+
+    write_results('kabupaten', changed, replace_all=True, results_dir=store_dir)
+    assert stored_names('kabupaten', results_dir=store_dir) == {'KAB A'}
+
+    write_results('kabupaten', {}, replace_all=True, results_dir=store_dir)
+    assert not results_path('kabupaten', store_dir).exists()
+    assert stored_names('kabupaten', results_dir=store_dir) == set()
+
+
+def test_read_filters(store_dir, frames, cube):
+    write_results('kabupaten', frames, results_dir=store_dir)
+    write_results('provinsi', forecast('provinsi', horizon=14, cube=cube, params={}),
+                  results_dir=store_dir)
+    dates = frames['KAB A']['Date']
+
+    df = read_results('kabupaten', names=['KAB A', 'KAB C'], columns=['Upper_Bound'],
+                      start=dates.iat[3], end=dates.iat[9], results_dir=store_dir)
+    assert list(df.columns) == ['Level', 'Name', 'Date', 'Upper_Bound']
+    assert set(df['Name']) == {'KAB A', 'KAB C'}
+    assert df['Date'].min() == dates.iat[3] and df['Date'].max() == dates.iat[9]
+    assert len(df) == 2 * 7
+
+    both = read_results(['kabupaten', 'provinsi'], results_dir=store_dir)
+    assert set(both['Level']) == {'kabupaten', 'provinsi'}
+    assert read_results('regional', results_dir=store_dir).empty
@@ -0,0 +1,32 @@
+"""Stream random per entity: hasil tidak bergantung pada urutan atau entity lain"""
+
+import numpy as np
+
+from forecast_core import forecast_level
+from forecast_core.rng import entity_key, entity_noise
+
+
+def test_entity_noise_independent_of_key_order():
+    keys = [entity_key('kabupaten', name) for name in ['KAB A', 'KAB B', 'KAB C', 'KAB D']]
+    noise = entity_noise(keys, 30)
+    reversed_noise = entity_noise(keys[::-1], 30)
+    np.testing.assert_array_equal(reversed_noise, noise[::-1])
+    np.testing.assert_array_equal(entity_noise(keys[1:2], 30)[0], noise[1])
+    np.testing.assert_array_equal(entity_noise(keys, 30), noise)
+
+
+def test_entity_noise_depends_on_level_and_seed():
+    noise = entity_noise([entity_key('kabupaten', 'KAB A')], 30)
+    assert not np.array_equal(noise, entity_noise([entity_key('provinsi', 'KAB A')], 30))
+    assert not np.array_equal(noise, entity_noise([entity_key('kabupaten', 'KAB A')], 30, base_seed=7))
+
+
+def test_forecast_subset_matches_full_level(cube):
+    names, _, forecasts = forecast_level(cube, 'kabupaten', params={})
+    subset = ['KAB E', 'KAB B']
+    subset_names, _, subset_forecasts = forecast_level(cube, 'kabupaten', names=subset, params={})
+
+    # Noise identik; selisih hanya pembulatan matmul batch dengan jumlah baris berbeda
+    assert subset_names == sorted(subset)
+    np.testing.assert_allclose(subset_forecasts, forecasts[[names.index(n) for n in subset_names]],
+                               rtol=1e-12)
@@ -0,0 +1,53 @@
+"""State incremental (ingest harian) vs forecast ulang dari cube lengkap"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from forecast_core import LEVELS, build_cube, forecast_level, level_event_options
+from forecast_core.state import ForecastState, load_state, save_state
+
+# Parameter per node tidak seragam, supaya grouping parameter ikut teruji
+PARAMS = {
+    'kabupaten/KAB A': {'ma_window': 5, 'wma_window': 21, 'alpha': 0.5, 'damping': 0.2},
+    'provinsi/PROV 2': {'alpha': 0.1, 'damping': 1.0},
+    'total/TOTAL': {'ma_window': 14, 'wma_window': 7},
+}
+
+
+@pytest.mark.parametrize('params', [{}, PARAMS])
+@pytest.mark.parametrize('cutoff', ['2025-06-30', '2025-10-10'])
+def test_updated_state_matches_full_forecast(raw_rows, cube, params, cutoff):
+    before = raw_rows['Date'] <= pd.Timestamp(cutoff)
+    state = ForecastState.from_cube(build_cube(raw_rows[before]), params=params)
+    state.update_from_rows(raw_rows[~before])
+
+    for level in LEVELS:
+        options = level_event_options(level)
+        names, dates, forecasts = state.forecast(level, **options)
+        expected_names, expected_dates, expected = forecast_level(cube, level, params=params, **options)
+        assert names == expected_names
+        pd.testing.assert_index_equal(dates, expected_dates)
+        np.testing.assert_allclose(forecasts, expected, rtol=1e-9, err_msg=level)
+
+
+def test_total_uses_published_event_options(cube):
+    state = ForecastState.from_cube(cube, params={})
+    _, dates, published = state.forecast('total', **level_event_options('total'))
+    _, _, recent = state.forecast('total')
+    in_event = (dates >= '2025-12-25') & (dates <= '2026-01-07')
+    assert in_event.any()
+    assert not np.allclose(published[:, in_event], recent[:, in_event])
+    np.testing.assert_allclose(published[:, ~in_event], recent[:, ~in_event])
+
+
+def test_saved_state_round_trip(cube, tmp_path):
+    state = ForecastState.from_cube(cube, params=PARAMS, data_version='v1')
+    save_state(state, tmp_path)
+    loaded = load_state(tmp_path)
+
+    assert loaded.data_version == 'v1'
+    for level in LEVELS:
+        options = level_event_options(level)
+        np.testing.assert_array_equal(loaded.forecast(level, **options)[2],
+                                      state.forecast(level, **options)[2])
@@ -0,0 +1,83 @@
+"""Grid search parameter: skor cache = backtest engine, hasil sama serial vs worker"""
+
+import itertools
+
+import numpy as np
+import pytest
+
+from forecast_core.engine import ensemble_forecast
+from forecast_core.parallel import run_parallel
+from forecast_core.params import DEFAULT_PARAMS
+from forecast_core.tuning import SeriesBacktestCache, tune_node, tune_series
+
+HORIZON = 14
+SMALL_GRID = {'ma_window': [5, 7], 'wma_window': [7, 14], 'alpha': [0.3, 0.7], 'damping': [0.0, 1.0]}
+
+
+@pytest.fixture
+def kab_series(cube):
+    observed = cube.counts[cube.index_of('kabupaten', 'KAB A')] > 0
+    return cube.series('kabupaten', 'KAB A'), cube.dates[observed]
+
+
+def engine_mape(values, dates, origins, params):
+    """MAPE forecast ekspektasi ensemble_forecast() dari setiap origin (satu series)"""
+    calendar = dict(zip(dates, values))
+    errors = []
+    for origin in origins:
+        forecast_dates, forecasts = ensemble_forecast(
+            values[None, :origin], dates[:origin], HORIZON, noise=np.zeros((1, HORIZON)),
+            params={name: np.array([value]) for name, value in params.items()})
+        for date, predicted in zip(forecast_dates, forecasts[0]):
+            actual = calendar.get(date)
+            if actual:
+                errors.append(abs(predicted - actual) / abs(actual))
+    return 100 * np.mean(errors)
+
+
+@pytest.mark.parametrize('params', [
+    DEFAULT_PARAMS,
+    {'ma_window': 3, 'wma_window': 28, 'alpha': 0.1, 'damping': 1.0},
+    {'ma_window': 14, 'wma_window': 7, 'alpha': 0.7, 'damping': 0.0},
+])
+def test_cached_score_matches_engine_backtest(kab_series, params):
+    values, dates = kab_series
+    cache = SeriesBacktestCache(values, dates, horizon=HORIZON)
+    expected = engine_mape(values, dates, cache.origins, params)
+    assert cache.score(params) == pytest.approx(expected, rel=1e-9)
+
+
+def test_tune_series_picks_grid_minimum(kab_series):
+    values, dates = kab_series
+    cache = SeriesBacktestCache(values, dates, horizon=HORIZON)
+    scores = {combo: cache.score(dict(zip(SMALL_GRID, combo)))
+              for combo in itertools.product(*SMALL_GRID.values())}
+    best = min(scores, key=scores.get)
+
+    result = tune_series(values, dates, horizon=HORIZON, min_gain=0.0, grid=SMALL_GRID)
+    assert result['mape_tuned'] == pytest.approx(min(scores[best], cache.score(DEFAULT_PARAMS)))
+    assert result['mape_default'] == pytest.approx(cache.score(DEFAULT_PARAMS))
+    assert result['n_pairs'] == cache.n_pairs
+
+    # Perbaikan di bawah min_gain: parameter default dipertahankan
+    kept = tune_series(values, dates, horizon=HORIZON, min_gain=1e9, grid=SMALL_GRID)
+    assert kept['params'] == DEFAULT_PARAMS
+    assert kept['mape_tuned'] == kept['mape_default']
+
+
+def test_short_history_keeps_defaults(kab_series):
+    values, dates = kab_series
+    result = tune_series(values[:40], dates[:40], horizon=HORIZON)
+    assert result == {'params': DEFAULT_PARAMS, 'mape_default': None, 'mape_tuned': None, 'n_pairs': 0}
+
+
+def test_workers_match_serial_tuning(cube, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    tasks = [('kabupaten', name, HORIZON, 60, 0.5) for name in ['KAB A', 'KAB F']]
+    serial = []
+    for level, name, horizon, min_train, min_gain in tasks:
+        observed = cube.counts[cube.index_of(level, name)] > 0
+        serial.append(tune_series(cube.series(level, name), cube.dates[observed],
+                                  horizon=horizon, min_train=min_train, min_gain=min_gain))
+
+    assert list(run_parallel(tune_node, tasks, workers=2, cube=cube)) == serial
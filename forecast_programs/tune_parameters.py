@@ -0,0 +1,113 @@
+"""
+TUNE ENSEMBLE PARAMETERS
+========================
+Mencari parameter ensemble terbaik (window MA, window WMA, alpha ES,
+damping trend) untuk setiap node hierarki berdasarkan rolling-origin
+backtest, lalu menyimpannya untuk dipakai semua script forecast.
+
+Input:
+  - Traffic_VLR_Java_2024-2025.xlsx
+
+Output:
+  - forecast_params.json (parameter per node, dibaca forecast_core)
+  - forecast_results/05_analysis/tuning_results.csv (MAPE default vs tuned)
+
+Fungsi:
+  - Grid search 500 kombinasi per series, komponen di-cache per origin
+  - Node dibagi ke worker process (--workers)
+  - Parameter default dipertahankan jika perbaikan MAPE < --min-gain
+
+Penggunaan:
+  python forecast_programs/tune_parameters.py --workers 4
+  python forecast_programs/tune_parameters.py --reset   # kembali ke default
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from forecast_core import entity_key, load_cube, run_parallel
+from forecast_core.params import DEFAULT_PARAMS, PARAMS_FILE, save_params
+from forecast_core.tuning import PARAM_GRID, tune_node
+
+OUTPUT_FILE = Path("forecast_results/05_analysis/tuning_results.csv")
+
+def main(workers=1, horizon=75, min_train=60, min_gain=0.5):
+    """Main function"""
+    print("="*80)
+    print("  TUNING PARAMETER ENSEMBLE PER NODE")
+    print("="*80)
+
+    print("\nMembaca data...")
+    cube = load_cube()
+    nodes = list(cube.nodes[['level', 'name']].itertuples(index=False, name=None))
+    n_candidates = 1
+    for values in PARAM_GRID.values():
+        n_candidates *= len(values)
+    print(f"  {len(nodes)} node × {n_candidates} kombinasi parameter ({workers} worker)")
+
+    start = time.perf_counter()
+    tasks = [(level, name, horizon, min_train, min_gain) for level, name in nodes]
+    results = list(run_parallel(tune_node, tasks, workers=workers, cube=cube))
+    print(f"  Tuning selesai dalam {time.perf_counter() - start:.1f} detik")
+
+    rows = []
+    params = {}
+    for (level, name), result in zip(nodes, results):
+        rows.append({'Level': level, 'Name': name, **result['params'],
+                     'MAPE_Default': result['mape_default'], 'MAPE_Tuned': result['mape_tuned'],
+                     'N': result['n_pairs']})
+        if result['params'] != DEFAULT_PARAMS:
+            params[entity_key(level, name)] = result['params']
+    df_results = pd.DataFrame(rows)
+
+    save_params(params, horizon=horizon, min_train=min_train, min_gain=min_gain,
+                data_last_date=str(cube.dates.max().date()))
+    OUTPUT_FILE.parent.mkdir(parents=True, exist_ok=True)
+    df_results.to_csv(OUTPUT_FILE, index=False, float_format='%.4f')
+
+    print("\n" + "="*80)
+    print("  RINGKASAN PER LEVEL")
+    print("="*80)
+    print(f"\n{'Level':<12} {'Node':>6} {'Diubah':>8} {'MAPE default':>14} {'MAPE tuned':>12}")
+    print("-"*80)
+    for level, group in df_results.groupby('Level', sort=False):
+        changed = sum(entity_key(level, name) in params for name in group['Name'])
+        print(f"{level:<12} {len(group):>6} {changed:>8} "
+              f"{group['MAPE_Default'].mean():>13.2f}% {group['MAPE_Tuned'].mean():>11.2f}%")
+
+    print("\n" + "="*80)
+    print("✅ SELESAI!")
+    print("="*80)
+    print(f"\nParameter disimpan: {PARAMS_FILE} ({len(params)} node non-default)")
+    print(f"Detail tuning: {OUTPUT_FILE}")
+    print("\n💡 Jalankan run_all_forecasts.py untuk forecast dengan parameter baru")
+    print("="*80)
+
+def reset():
+    """Hapus hasil tuning: semua node kembali ke parameter default"""
+    path = Path(PARAMS_FILE)
+    if path.exists():
+        path.unlink()
+    print(f"✓ {PARAMS_FILE} dihapus, semua node memakai parameter default")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tuning parameter ensemble per node")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Jumlah worker process (default: 1, serial)")
+    parser.add_argument('--horizon', type=int, default=75,
+                        help="Horizon backtest per origin (default: 75 hari)")
+    parser.add_argument('--min-train', type=int, default=60,
+                        help="Jumlah hari history minimum sebelum origin pertama (default: 60)")
+    parser.add_argument('--min-gain', type=float, default=0.5,
+                        help="Perbaikan MAPE minimum (poin %%) untuk mengganti default (default: 0.5)")
+    parser.add_argument('--reset', action='store_true',
+                        help="Hapus hasil tuning dan kembali ke parameter default")
+    args = parser.parse_args()
+    if args.reset:
+        reset()
+    else:
+        main(workers=args.workers, horizon=args.horizon, min_train=args.min_train,
+             min_gain=args.min_gain)
@@ -7,7 +7,7 @@ main overview, tabel komparasi, dan kombinasi provinsi.
 Input:
   - forecast_results/01_main/forecast_data.csv
   - forecast_results/01_main/comparison_statistics_2025_vs_2026.csv
-  - forecast_results/03_provinsi/*.csv
+  - forecast_results/forecast_store/provinsi.parquet
   - Traffic_VLR_Java_2024-2025.xlsx
 
 Output:
@@ -31,6 +31,10 @@ import seaborn as sns
 from datetime import datetime, timedelta
 from pathlib import Path
 import warnings
+
+from forecast_core import TOTAL_NAME, load_cube
+from forecast_core.results import results_by_name
+
 warnings.filterwarnings('ignore')
 
 # Set style
@@ -42,13 +46,11 @@ def load_data():
     print("📂 Membaca data untuk visualisasi...")
     
     # Load historical data
-    df_historical = pd.read_excel("Traffic_VLR_Java_2024-2025.xlsx", sheet_name=0)
-    df_historical['Date'] = pd.to_datetime(df_historical['Date'])
-    daily_data = df_historical.groupby('Date').agg({
-        'Traffic_H3I (TB)': 'sum',
-        'Traffic_IM3 (TB)': 'sum',
-        'Traffic_Total(TB)': 'sum'
-    }).reset_index()
+    daily_data = load_cube().daily_frame('total', TOTAL_NAME, [
+        'Traffic_H3I (TB)',
+        'Traffic_IM3 (TB)',
+        'Traffic_Total(TB)'
+    ])
     
     # Load forecast data
     df_forecast = pd.read_csv("forecast_results/01_main/forecast_data.csv")
@@ -571,29 +573,25 @@ def create_combined_province_comparison():
         print("  💡 Jalankan '1b_run_forecast_by_province.py' terlebih dahulu")
         return
     
-    # Load raw data
-    df_raw = pd.read_excel("Traffic_VLR_Java_2024-2025.xlsx", sheet_name=0)
-    df_raw['Date'] = pd.to_datetime(df_raw['Date'])
+    # Load cube hierarki
+    cube = load_cube()
     
     # Get list of provinces
-    provinces = sorted(df_raw['PROVINCE'].unique())
+    provinces = cube.level_names('provinsi')
+    
+    # Forecast semua provinsi sekaligus dari store kolumnar
+    stored_forecasts = results_by_name('provinsi', names=provinces)
     
     province_forecasts = {}
     
     for province in provinces:
-        # Filter historical data by province
-        df_prov = df_raw[df_raw['PROVINCE'] == province].copy()
-        daily_historical = df_prov.groupby('Date')['Traffic_Total(TB)'].sum().reset_index()
-        daily_historical.columns = ['Date', 'Traffic_Total(TB)']
+        # Historical data province dari cube
+        daily_historical = cube.daily_frame('provinsi', province, ['Traffic_Total(TB)'])
         
-        # Load individual province forecast
-        province_filename = province.lower().replace(' ', '_')
-        forecast_file = province_forecast_dir / f"{province_filename}.csv"
+        # Individual province forecast
+        df_forecast = stored_forecasts.get(province)
         
-        if forecast_file.exists():
-            df_forecast = pd.read_csv(forecast_file)
-            df_forecast['Date'] = pd.to_datetime(df_forecast['Date'])
-            
+        if df_forecast is not None:
             province_forecasts[province] = {
                 'historical': daily_historical,
                 'forecast': df_forecast
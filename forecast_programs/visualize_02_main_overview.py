@@ -22,6 +22,8 @@ import matplotlib.pyplot as plt
 import matplotlib.gridspec as gridspec
 from pathlib import Path
 
+from forecast_core import TOTAL_NAME, load_cube
+
 def create_main_forecast_visualization():
     """Create visualization untuk forecast utama dengan format regional"""
     
@@ -31,12 +33,9 @@ def create_main_forecast_visualization():
     
     # Load historical data
     print("\n📂 Membaca data...")
-    df_raw = pd.read_excel("Traffic_VLR_Java_2024-2025.xlsx", sheet_name=0)
-    df_raw['Date'] = pd.to_datetime(df_raw['Date'])
     
-    # Aggregate daily
-    daily_historical = df_raw.groupby('Date')['Traffic_Total(TB)'].sum().reset_index()
-    daily_historical.columns = ['Date', 'Traffic_Total(TB)']
+    # Aggregate daily (node total dari cube hierarki)
+    daily_historical = load_cube().daily_frame('total', TOTAL_NAME, ['Traffic_Total(TB)'])
     
     # Load forecast data
     forecast_file = Path("forecast_results/01_main/forecast_data.csv")
@@ -5,7 +5,7 @@ Membuat summary comparison untuk semua provinsi dengan format regional:
 chart horizontal + statistics + distribution.
 
 Input:
-  - forecast_results/03_provinsi/*.csv
+  - forecast_results/forecast_store/provinsi.parquet
   - Traffic_VLR_Java_2024-2025.xlsx
 
 Output:
@@ -17,12 +17,14 @@ Fungsi:
   - Histogram distribusi forecast per provinsi
 """
 
-import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.gridspec as gridspec
 from pathlib import Path
 
+from forecast_core import load_cube
+from forecast_core.results import results_by_name
+
 def create_provinsi_summary_comparison():
     """Create summary comparison antar provinsi"""
     
@@ -33,25 +35,20 @@ def create_provinsi_summary_comparison():
         return
     
     # Load data
-    df = pd.read_excel("Traffic_VLR_Java_2024-2025.xlsx", sheet_name=0)
-    df['Date'] = pd.to_datetime(df['Date'])
-    provinces = sorted(df['PROVINCE'].unique())
+    cube = load_cube()
+    provinces = cube.level_names('provinsi')
+    stored_forecasts = results_by_name('provinsi', names=provinces)
     
     provinsi_forecasts = {}
     
     for province in provinces:
         # Load historical
-        df_prov = df[df['PROVINCE'] == province].copy()
-        daily_historical = df_prov.groupby('Date')['Traffic_Total(TB)'].sum().reset_index()
-        daily_historical.columns = ['Date', 'Traffic_Total(TB)']
+        daily_historical = cube.daily_frame('provinsi', province, ['Traffic_Total(TB)'])
         
-        # Load forecast
-        forecast_file = output_dir / f"{province.lower().replace(' ', '_')}.csv"
+        # Forecast dari store kolumnar
+        df_forecast = stored_forecasts.get(province)
         
-        if forecast_file.exists():
-            df_forecast = pd.read_csv(forecast_file)
-            df_forecast['Date'] = pd.to_datetime(df_forecast['Date'])
-            
+        if df_forecast is not None:
             provinsi_forecasts[province] = {
                 'historical': daily_historical,
                 'forecast': df_forecast
@@ -0,0 +1,81 @@
+"""
+VISUALIZE KABUPATEN CHARTS
+===========================
+Render chart forecast 119 kabupaten dari results store, terpisah dari
+proses forecast. Spesifikasi chart (array + label) dikirim ke pool
+worker render (backend Agg); hanya chart yang data atau kodenya berubah
+yang dirender ulang.
+
+Input:
+  - forecast_results/forecast_store/kabupaten.parquet
+  - Traffic_VLR_Java_2024-2025.xlsx
+
+Output:
+  - forecast_results/04_kabupaten/[nama_kabupaten]_forecast.png (119 files,
+    atau .webp; thumbnail di 04_kabupaten/thumbs/ dengan --thumbnails)
+  - .forecast_cache/logs/render_kabupaten.csv (waktu render per chart)
+
+Fungsi:
+  - Render paralel chart kabupaten (forecast_core.render)
+  - Profil render draft/report/print, format png/png-optimized/webp
+  - Laporan waktu render per chart
+"""
+
+import argparse
+import os
+
+import pandas as pd
+
+from forecast_core import load_cube
+from forecast_core.data import CACHE_DIR
+from forecast_core.render import add_render_arguments, render_level_charts, render_options
+
+REPORT_FILE = CACHE_DIR / "logs" / "render_kabupaten.csv"
+
+def main(workers=1, force=False, profile='print', image_format='png', thumbnails=False):
+    """Main function"""
+    workers = workers or os.cpu_count() or 1
+    options = render_options(profile, image_format, thumbnails)
+
+    print("="*80)
+    print(f"  RENDER CHART FORECAST KABUPATEN ({workers} worker)")
+    print("="*80)
+    print(f"  Profil: {profile} ({options['dpi']} dpi), format: {image_format}"
+          + (", + thumbnail" if thumbnails else "") + "\n")
+
+    cube = load_cube()
+
+    rows = []
+    for idx, (kabupaten, path, seconds) in enumerate(
+            render_level_charts(cube, 'kabupaten', workers=workers, force=force,
+                                options=options), 1):
+        rows.append({'Kabupaten': kabupaten, 'File': str(path), 'Seconds': seconds})
+        print(f"  [{idx}] {kabupaten:<35} {seconds:6.2f} detik  → {path}")
+
+    if not rows:
+        print("  Semua chart up-to-date, skip")
+        print("="*80)
+        return
+
+    report = pd.DataFrame(rows)
+    REPORT_FILE.parent.mkdir(parents=True, exist_ok=True)
+    report.to_csv(REPORT_FILE, index=False, float_format='%.3f')
+
+    print("\n" + "="*80)
+    print(f"✅ {len(report)} chart dirender")
+    print(f"   Waktu render: total {report['Seconds'].sum():.1f} detik, "
+          f"rata-rata {report['Seconds'].mean():.2f} detik/chart, "
+          f"terlama {report['Seconds'].max():.2f} detik")
+    print(f"📁 Laporan waktu render: {REPORT_FILE}")
+    print("="*80)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render chart forecast kabupaten dari results store")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Jumlah worker process render (default: 1, serial; 0 = semua CPU)")
+    parser.add_argument('--force', action='store_true',
+                        help="Render ulang semua chart walaupun data tidak berubah")
+    add_render_arguments(parser)
+    args = parser.parse_args()
+    main(workers=args.workers, force=args.force, profile=args.profile,
+         image_format=args.image_format, thumbnails=args.thumbnails)
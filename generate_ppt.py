@@ -1,7 +1,12 @@
 """
 GENERATE POWERPOINT PRESENTATION
 =================================
-Script untuk membuat presentasi PowerPoint dari hasil forecast
+Script untuk membuat presentasi PowerPoint dari hasil forecast.
+Chart kabupaten top 10 dirender on-demand dari store forecast jika
+belum ada (tidak perlu render 119 chart kabupaten lebih dulu).
+Gambar slide di-resample paralel ke dpi target (--dpi, --max-mb).
+Dengan --native-charts chart dibuat native (python-pptx) dari results store
+dan tabel analisis, tanpa gambar PNG sama sekali.
 
 Output: presentation_traffic_forecast.pptx
 
@@ -9,13 +14,23 @@ Author: Traffic Analysis Team
 Date: November 2025
 """
 
+import argparse
+import os
+import sys
 from pptx import Presentation
 from pptx.util import Inches, Pt
 from pathlib import Path
 import pandas as pd
 
-def create_slide_with_image(prs, image_path, title):
-    """Create a slide with an image"""
+# forecast_core ada di forecast_programs/ (chart kabupaten dirender on-demand)
+sys.path.insert(0, str(Path(__file__).resolve().parent / "forecast_programs"))
+from forecast_core.deck import CHART_PROFILE, DEFAULT_DPI, DeckBuilder, add_native_chart, native_charts
+from forecast_core.render import RENDER_PROFILES, chart_path, materialize_charts, render_options
+
+RENDER_WORKERS = os.cpu_count() or 1
+
+def create_titled_slide(prs, title):
+    """Create a blank slide with a title"""
     slide = prs.slides.add_slide(prs.slide_layouts[6])  # Blank layout
     
     # Add title
@@ -34,6 +49,12 @@ def create_slide_with_image(prs, image_path, title):
     p.font.bold = True
     p.font.name = 'Calibri'
     
+    return slide
+
+def create_slide_with_image(prs, image_path, title):
+    """Create a slide with an image"""
+    slide = create_titled_slide(prs, title)
+    
     # Add image
     left = Inches(0.5)
     top = Inches(1.1)
@@ -46,7 +67,13 @@ def create_slide_with_image(prs, image_path, title):
         print(f"  ⚠️  File tidak ditemukan: {image_path}")
         return False
 
-def get_regional_images():
+def create_slide_with_chart(prs, chart, title):
+    """Create a slide with a native chart (same area as the image)"""
+    slide = create_titled_slide(prs, title)
+    add_native_chart(slide, chart, Inches(0.5), Inches(1.1), Inches(9), Inches(6))
+    return True
+
+def get_regional_images(deck):
     """Get all regional forecast images"""
     regional_dir = Path("forecast_results/02_regional")
     images = []
@@ -54,12 +81,12 @@ def get_regional_images():
     regions = ['bali_nusra', 'central_java', 'east_java']
     for region in regions:
         img_path = regional_dir / f"{region}_forecast.png"
-        if img_path.exists():
+        if deck.available(img_path):
             images.append((img_path, region.replace('_', ' ').title()))
     
     return images
 
-def get_province_images():
+def get_province_images(deck):
     """Get all province forecast images"""
     province_dir = Path("forecast_results/03_provinsi")
     images = []
@@ -75,13 +102,26 @@ def get_province_images():
     
     for province in provinces:
         img_path = province_dir / f"{province}_forecast.png"
-        if img_path.exists():
+        if deck.available(img_path):
             title = province.replace('_', ' ').title()
             images.append((img_path, title))
     
     return images
 
-def get_top10_absolute_kabupatens():
+def kabupaten_chart_paths(names, deck):
+    """Path chart kabupaten yang diminta; chart yang belum ada/berubah dirender on-demand"""
+    if deck.native:
+        # Chart native menggantikan gambar, tidak ada yang perlu dirender
+        return {name: chart_path('kabupaten', name) for name in names
+                if deck.available(chart_path('kabupaten', name))}
+    paths, rendered = materialize_charts('kabupaten', names, workers=deck.workers,
+                                          options=deck.chart_options)
+    if rendered:
+        print(f"  🖼️  {len(rendered)} chart kabupaten dirender on-demand "
+              f"({sum(seconds for *_, seconds in rendered):.1f} detik render)")
+    return paths
+
+def get_top10_absolute_kabupatens(deck):
     """Get top 10 kabupaten by absolute change"""
     excel_file = Path("forecast_results/05_analysis/top10_kabupaten_by_absolute_change.xlsx")
     
@@ -91,18 +131,20 @@ def get_top10_absolute_kabupatens():
     
     df = pd.read_excel(excel_file, sheet_name='Top 10 Absolute')
     
+    # Hanya 10 chart ini yang dibutuhkan deck; dirender jika belum ada
+    chart_paths = kabupaten_chart_paths(df['Kabupaten'], deck)
+    
     kabupatens = []
     for idx, row in df.iterrows():
-        kabupaten_name = row['Kabupaten'].lower().replace(' ', '_')
-        img_path = Path(f"forecast_results/04_kabupaten/{kabupaten_name}_forecast.png")
+        img_path = chart_paths.get(row['Kabupaten'])
         
-        if img_path.exists():
+        if img_path is not None:
             title = f"#{idx+1}: {row['Kabupaten']} ({row['Region']})"
             kabupatens.append((img_path, title))
     
     return kabupatens
 
-def get_top10_percentage_kabupatens():
+def get_top10_percentage_kabupatens(deck):
     """Get top 10 kabupaten by percentage growth"""
     excel_file = Path("forecast_results/05_analysis/top10_kabupaten_individual_forecast.xlsx")
     
@@ -112,19 +154,22 @@ def get_top10_percentage_kabupatens():
     
     df = pd.read_excel(excel_file, sheet_name='Top 10')
     
+    # Hanya 10 chart ini yang dibutuhkan deck; dirender jika belum ada
+    chart_paths = kabupaten_chart_paths(df['Kabupaten'], deck)
+    
     kabupatens = []
     for idx, row in df.iterrows():
-        kabupaten_name = row['Kabupaten'].lower().replace(' ', '_')
-        img_path = Path(f"forecast_results/04_kabupaten/{kabupaten_name}_forecast.png")
+        img_path = chart_paths.get(row['Kabupaten'])
         
-        if img_path.exists():
+        if img_path is not None:
             growth_rate = row['Growth_Rate']  # Column name is Growth_Rate, not Growth %
             title = f"#{idx+1}: {row['Kabupaten']} (+{growth_rate:.2f}%)"
             kabupatens.append((img_path, title))
     
     return kabupatens
 
-def create_presentation():
+def create_presentation(dpi=DEFAULT_DPI, max_mb=None, workers=RENDER_WORKERS, native=False,
+                        profile=CHART_PROFILE):
     """Create PowerPoint presentation"""
     
     print("="*80)
@@ -134,77 +179,86 @@ def create_presentation():
     prs = Presentation()
     prs.slide_width = Inches(10)
     prs.slide_height = Inches(7.5)
+    charts = native_charts() if native else None
+    deck = DeckBuilder(prs, create_slide_with_image, dpi=dpi, budget_mb=max_mb, workers=workers,
+                       charts=charts, add_chart_slide=create_slide_with_chart,
+                       chart_options=render_options(profile))
     
     slide_count = 0
     
     # 1. Traffic Forecast Lengkap
     print("\n📊 Slide 1: Traffic Forecast Lengkap")
     img_path = "forecast_results/01_main/03_traffic_forecast_lengkap.png"
-    if create_slide_with_image(prs, img_path, "Traffic Forecast Lengkap: Historical + Forecast"):
+    if deck.add(img_path, "Traffic Forecast Lengkap: Historical + Forecast"):
         slide_count += 1
         print(f"  ✓ Slide {slide_count} ditambahkan")
     
     # 2. Main Forecast Overview
     print("\n📊 Slide 2: Main Forecast Overview")
     img_path = "forecast_results/01_main/00_main_forecast_overview.png"
-    if create_slide_with_image(prs, img_path, "Main Forecast Overview: Total Java"):
+    if deck.add(img_path, "Main Forecast Overview: Total Java"):
         slide_count += 1
         print(f"  ✓ Slide {slide_count} ditambahkan")
     
     # 3. Regional Forecasts
     print("\n📊 Slides 3-5: Forecast Regional")
-    regional_images = get_regional_images()
+    regional_images = get_regional_images(deck)
     for img_path, title in regional_images:
-        if create_slide_with_image(prs, img_path, f"Forecast Regional: {title}"):
+        if deck.add(img_path, f"Forecast Regional: {title}"):
             slide_count += 1
             print(f"  ✓ Slide {slide_count} ditambahkan: {title}")
     
     # 4. Province Forecasts
     print("\n📊 Slides 6-11: Forecast Provinsi")
-    province_images = get_province_images()
+    province_images = get_province_images(deck)
     for img_path, title in province_images:
-        if create_slide_with_image(prs, img_path, f"Forecast Provinsi: {title}"):
+        if deck.add(img_path, f"Forecast Provinsi: {title}"):
             slide_count += 1
             print(f"  ✓ Slide {slide_count} ditambahkan: {title}")
     
     # 5. Top 10 Kabupaten Absolute - Summary
     print("\n📊 Slide: Top 10 Kabupaten by Absolute Change")
     img_path = "forecast_results/05_analysis/top10_kabupaten_by_absolute_change.png"
-    if create_slide_with_image(prs, img_path, "Top 10 Kabupaten: Peningkatan Absolut (TB)"):
+    if deck.add(img_path, "Top 10 Kabupaten: Peningkatan Absolut (TB)"):
         slide_count += 1
         print(f"  ✓ Slide {slide_count} ditambahkan")
     
     # 6. Top 10 Kabupaten Absolute - Individual
     print("\n📊 Slides: Top 10 Kabupaten Individual (Absolute)")
-    top10_absolute = get_top10_absolute_kabupatens()
+    top10_absolute = get_top10_absolute_kabupatens(deck)
     for img_path, title in top10_absolute:
-        if create_slide_with_image(prs, img_path, f"Top 10 Absolute: {title}"):
+        if deck.add(img_path, f"Top 10 Absolute: {title}"):
             slide_count += 1
             print(f"  ✓ Slide {slide_count} ditambahkan")
     
     # 7. Top 10 Kabupaten Percentage - Summary
     print("\n📊 Slide: Top 10 Kabupaten by Percentage Growth")
     img_path = "forecast_results/05_analysis/top10_kabupaten_individual_forecast.png"
-    if create_slide_with_image(prs, img_path, "Top 10 Kabupaten: Growth Percentage (%)"):
+    if deck.add(img_path, "Top 10 Kabupaten: Growth Percentage (%)"):
         slide_count += 1
         print(f"  ✓ Slide {slide_count} ditambahkan")
     
     # 8. Top 10 Kabupaten Percentage - Individual
     print("\n📊 Slides: Top 10 Kabupaten Individual (Percentage)")
-    top10_percentage = get_top10_percentage_kabupatens()
+    top10_percentage = get_top10_percentage_kabupatens(deck)
     for img_path, title in top10_percentage:
-        if create_slide_with_image(prs, img_path, f"Top 10 Percentage: {title}"):
+        if deck.add(img_path, f"Top 10 Percentage: {title}"):
             slide_count += 1
             print(f"  ✓ Slide {slide_count} ditambahkan")
     
     # Save presentation
     output_file = "presentation_traffic_forecast.pptx"
-    prs.save(output_file)
+    stats = deck.save(output_file)
     
     print("\n" + "="*80)
     print("✅ PRESENTASI BERHASIL DIBUAT!")
     print("="*80)
-    print(f"\n📁 File: {output_file}")
+    print(f"\n📁 File: {output_file} ({stats['file_bytes'] / 1e6:.1f} MB)")
+    if stats['charts']:
+        print(f"📈 Chart native: {stats['charts']} slide")
+    if stats['images']:
+        print(f"🖼️  Gambar: {stats['images']} unik untuk {stats['slides'] - stats['charts']} slide, "
+              f"{stats['dpi']} dpi ({stats['image_bytes'] / 1e6:.1f} MB)")
     print(f"📊 Total Slides: {slide_count}")
     print("\nStruktur Presentasi:")
     print("  1. Traffic Forecast Lengkap")
@@ -217,14 +271,29 @@ def create_presentation():
     print(f"  24-33. Top 10 Kabupaten by Percentage (Individual - {len(top10_percentage)} slides)")
     print("\n" + "="*80)
 
-def main():
+def main(dpi=DEFAULT_DPI, max_mb=None, workers=RENDER_WORKERS, native=False, profile=CHART_PROFILE):
     """Main function"""
     try:
-        create_presentation()
+        create_presentation(dpi=dpi, max_mb=max_mb, workers=workers, native=native,
+                            profile=profile)
     except Exception as e:
         print(f"\n❌ Error: {e}")
         import traceback
         traceback.print_exc()
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Generate presentasi PowerPoint dari hasil forecast")
+    parser.add_argument('--dpi', type=int, default=DEFAULT_DPI,
+                        help=f"Resolusi gambar di slide, lebar 9 inch (default: {DEFAULT_DPI})")
+    parser.add_argument('--max-mb', type=float, default=None,
+                        help="Budget ukuran gambar presentasi (MB); dpi diturunkan sampai muat")
+    parser.add_argument('--workers', type=int, default=RENDER_WORKERS,
+                        help="Jumlah worker process render chart dan persiapan gambar (default: semua CPU)")
+    parser.add_argument('--profile', choices=list(RENDER_PROFILES), default=CHART_PROFILE,
+                        help=f"Profil chart kabupaten yang perlu dirender on-demand (default: {CHART_PROFILE}); "
+                             "chart yang masih up-to-date dipakai ulang apa pun profilnya")
+    parser.add_argument('--native-charts', action='store_true',
+                        help="Chart PowerPoint native dari data forecast, tanpa gambar PNG")
+    args = parser.parse_args()
+    main(dpi=args.dpi, max_mb=args.max_mb, workers=args.workers, native=args.native_charts,
+         profile=args.profile)
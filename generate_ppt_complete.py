@@ -1,24 +1,35 @@
 """
 Generate Complete PowerPoint Presentation
 Mencakup SEMUA hasil forecast dan analysis
+(chart kabupaten yang belum ada/berubah dirender on-demand dari store forecast)
+(gambar slide di-resample paralel ke dpi target, opsi --dpi dan --max-mb)
+(--native-charts: chart PowerPoint native dari data forecast, tanpa gambar PNG)
 """
 
+import argparse
 import os
+import sys
 from pathlib import Path
 from pptx import Presentation
 from pptx.util import Inches, Pt
 from pptx.enum.text import PP_ALIGN
 import pandas as pd
 
+# forecast_core ada di forecast_programs/ (chart kabupaten dirender on-demand)
+sys.path.insert(0, str(Path(__file__).resolve().parent / "forecast_programs"))
+from forecast_core.deck import CHART_PROFILE, DEFAULT_DPI, DeckBuilder, add_native_chart, native_charts
+from forecast_core.render import RENDER_PROFILES, chart_path, materialize_charts, render_options
+from forecast_core.results import stored_names
+
 # Directories
 MAIN_DIR = Path("forecast_results/01_main")
 REGIONAL_DIR = Path("forecast_results/02_regional")
 PROVINSI_DIR = Path("forecast_results/03_provinsi")
-KABUPATEN_DIR = Path("forecast_results/04_kabupaten")
 ANALYSIS_DIR = Path("forecast_results/05_analysis")
+RENDER_WORKERS = os.cpu_count() or 1
 
-def create_slide_with_image(prs, image_path, title_text):
-    """Create a slide with an image and title"""
+def create_titled_slide(prs, title_text):
+    """Create a blank slide with a centered title"""
     # Use blank layout
     blank_slide_layout = prs.slide_layouts[6]
     slide = prs.slides.add_slide(blank_slide_layout)
@@ -39,6 +50,12 @@ def create_slide_with_image(prs, image_path, title_text):
     p.font.size = Pt(24)
     p.font.bold = True
     
+    return slide
+
+def create_slide_with_image(prs, image_path, title_text):
+    """Create a slide with an image and title"""
+    slide = create_titled_slide(prs, title_text)
+    
     # Add image
     if Path(image_path).exists():
         img_left = Inches(0.5)
@@ -50,19 +67,33 @@ def create_slide_with_image(prs, image_path, title_text):
     
     return slide
 
-def get_all_kabupaten_images():
-    """Get all kabupaten forecast images sorted alphabetically"""
-    kabupatens = []
-    
-    if KABUPATEN_DIR.exists():
-        for img_file in sorted(KABUPATEN_DIR.glob("*_forecast.png")):
-            # Extract kabupaten name from filename
-            kabupaten_name = img_file.stem.replace("_forecast", "").replace("_", " ").upper()
-            kabupatens.append((img_file, kabupaten_name))
-    
-    return kabupatens
+def create_slide_with_chart(prs, chart, title_text):
+    """Create a slide with a native chart (same area as the image) and title"""
+    slide = create_titled_slide(prs, title_text)
+    add_native_chart(slide, chart, Inches(0.5), Inches(1), Inches(9), Inches(6.2))
+    return slide
+
+def kabupaten_chart_paths(names, deck):
+    """Path chart kabupaten yang diminta; chart yang belum ada/berubah dirender on-demand"""
+    if deck.native:
+        # Chart native menggantikan gambar, tidak ada yang perlu dirender
+        return {name: chart_path('kabupaten', name) for name in names
+                if deck.available(chart_path('kabupaten', name))}
+    paths, rendered = materialize_charts('kabupaten', names, workers=deck.workers,
+                                          options=deck.chart_options)
+    if rendered:
+        print(f"  🖼️  {len(rendered)} chart kabupaten dirender on-demand "
+              f"({sum(seconds for *_, seconds in rendered):.1f} detik render)")
+    return paths
+
+def get_all_kabupaten_images(deck):
+    """Get all kabupaten forecast images sorted alphabetically (dari store forecast)"""
+    chart_paths = kabupaten_chart_paths(stored_names('kabupaten'), deck)
+    return [(img_file, kabupaten_name)
+            for kabupaten_name, img_file in sorted(chart_paths.items(), key=lambda item: item[1].name)]
 
-def create_presentation():
+def create_presentation(dpi=DEFAULT_DPI, max_mb=None, workers=RENDER_WORKERS, native=False,
+                        profile=CHART_PROFILE):
     """Create Complete PowerPoint presentation"""
     
     print("="*80)
@@ -72,6 +103,10 @@ def create_presentation():
     prs = Presentation()
     prs.slide_width = Inches(10)
     prs.slide_height = Inches(7.5)
+    charts = native_charts() if native else None
+    deck = DeckBuilder(prs, create_slide_with_image, dpi=dpi, budget_mb=max_mb, workers=workers,
+                       charts=charts, add_chart_slide=create_slide_with_chart,
+                       chart_options=render_options(profile))
     
     slide_count = 0
     
@@ -83,15 +118,15 @@ def create_presentation():
     
     # Slide: Traffic Forecast Lengkap (Combined provinces)
     img_path = PROVINSI_DIR / "04_combined_province_comparison.png"
-    if img_path.exists():
-        create_slide_with_image(prs, img_path, "Traffic Forecast Lengkap - Perbandingan Provinsi")
+    if deck.available(img_path):
+        deck.add(img_path, "Traffic Forecast Lengkap - Perbandingan Provinsi")
         slide_count += 1
         print(f"  ✓ Slide {slide_count}: Traffic Forecast Lengkap")
     
     # Slide: Main Forecast Overview
     img_path = MAIN_DIR / "00_main_forecast_overview.png"
-    if img_path.exists():
-        create_slide_with_image(prs, img_path, "Main Forecast Overview - Total Traffic")
+    if deck.available(img_path):
+        deck.add(img_path, "Main Forecast Overview - Total Traffic")
         slide_count += 1
         print(f"  ✓ Slide {slide_count}: Main Forecast Overview")
     
@@ -109,8 +144,8 @@ def create_presentation():
     
     for csv_file, title in regions:
         img_path = REGIONAL_DIR / csv_file.replace(".csv", "_forecast.png")
-        if img_path.exists():
-            create_slide_with_image(prs, img_path, title)
+        if deck.available(img_path):
+            deck.add(img_path, title)
             slide_count += 1
             print(f"  ✓ Slide {slide_count}: {title}")
     
@@ -131,8 +166,8 @@ def create_presentation():
     
     for csv_file, title in provinces:
         img_path = PROVINSI_DIR / csv_file.replace(".csv", "_forecast.png")
-        if img_path.exists():
-            create_slide_with_image(prs, img_path, title)
+        if deck.available(img_path):
+            deck.add(img_path, title)
             slide_count += 1
             print(f"  ✓ Slide {slide_count}: {title}")
     
@@ -142,11 +177,11 @@ def create_presentation():
     print("\n📊 SECTION 4: Kabupaten Forecasts (119 kabupatens)")
     print("-" * 80)
     
-    kabupatens = get_all_kabupaten_images()
+    kabupatens = get_all_kabupaten_images(deck)
     print(f"  📍 Total kabupaten ditemukan: {len(kabupatens)}")
     
     for img_path, kabupaten_name in kabupatens:
-        create_slide_with_image(prs, img_path, f"Forecast Kabupaten: {kabupaten_name}")
+        deck.add(img_path, f"Forecast Kabupaten: {kabupaten_name}")
         slide_count += 1
         if slide_count % 10 == 0:
             print(f"  ✓ Progress: {slide_count} slides (kabupaten ke-{slide_count - 11})")
@@ -161,8 +196,8 @@ def create_presentation():
     
     # Summary slide
     img_path = ANALYSIS_DIR / "top10_kabupaten_absolute_summary.png"
-    if img_path.exists():
-        create_slide_with_image(prs, img_path, "Top 10 Kabupaten - Absolute Traffic Increase")
+    if deck.available(img_path):
+        deck.add(img_path, "Top 10 Kabupaten - Absolute Traffic Increase")
         slide_count += 1
         print(f"  ✓ Slide {slide_count}: Top 10 Summary (Absolute)")
     
@@ -170,15 +205,15 @@ def create_presentation():
     excel_file = ANALYSIS_DIR / "top10_kabupaten_absolute.xlsx"
     if excel_file.exists():
         df = pd.read_excel(excel_file, sheet_name='Top 10')
+        chart_paths = kabupaten_chart_paths(df['Kabupaten'], deck)
         for idx, row in df.iterrows():
-            kabupaten_name = row['Kabupaten'].lower().replace(' ', '_')
-            img_path = KABUPATEN_DIR / f"{kabupaten_name}_forecast.png"
+            img_path = chart_paths.get(row['Kabupaten'])
             
-            if img_path.exists():
+            if img_path is not None:
                 change_tb = row['Change_TB']
                 growth_pct = row['Growth_%']
                 title = f"Top #{idx+1} (Absolute): {row['Kabupaten']} (+{change_tb:.2f} TB, +{growth_pct:.2f}%)"
-                create_slide_with_image(prs, img_path, title)
+                deck.add(img_path, title)
                 slide_count += 1
         
         print(f"  ✓ 10 kabupaten individual (absolute) ditambahkan")
@@ -191,8 +226,8 @@ def create_presentation():
     
     # Summary slide
     img_path = ANALYSIS_DIR / "top10_kabupaten_percentage_summary.png"
-    if img_path.exists():
-        create_slide_with_image(prs, img_path, "Top 10 Kabupaten - Highest Growth Percentage")
+    if deck.available(img_path):
+        deck.add(img_path, "Top 10 Kabupaten - Highest Growth Percentage")
         slide_count += 1
         print(f"  ✓ Slide {slide_count}: Top 10 Summary (Percentage)")
     
@@ -200,14 +235,14 @@ def create_presentation():
     excel_file = ANALYSIS_DIR / "top10_kabupaten_individual_forecast.xlsx"
     if excel_file.exists():
         df = pd.read_excel(excel_file, sheet_name='Top 10')
+        chart_paths = kabupaten_chart_paths(df['Kabupaten'], deck)
         for idx, row in df.iterrows():
-            kabupaten_name = row['Kabupaten'].lower().replace(' ', '_')
-            img_path = KABUPATEN_DIR / f"{kabupaten_name}_forecast.png"
+            img_path = chart_paths.get(row['Kabupaten'])
             
-            if img_path.exists():
+            if img_path is not None:
                 growth_rate = row['Growth_Rate']
                 title = f"Top #{idx+1} (Percentage): {row['Kabupaten']} (+{growth_rate:.2f}%)"
-                create_slide_with_image(prs, img_path, title)
+                deck.add(img_path, title)
                 slide_count += 1
         
         print(f"  ✓ 10 kabupaten individual (percentage) ditambahkan")
@@ -216,12 +251,17 @@ def create_presentation():
     # SAVE PRESENTATION
     # ========================================================================
     output_file = "presentation_traffic_forecast_COMPLETE.pptx"
-    prs.save(output_file)
+    stats = deck.save(output_file)
     
     print("\n" + "="*80)
     print("✅ PRESENTASI LENGKAP BERHASIL DIBUAT!")
     print("="*80)
-    print(f"\n📁 File: {output_file}")
+    print(f"\n📁 File: {output_file} ({stats['file_bytes'] / 1e6:.1f} MB)")
+    if stats['charts']:
+        print(f"📈 Chart native: {stats['charts']} slide")
+    if stats['images']:
+        print(f"🖼️  Gambar: {stats['images']} unik untuk {stats['slides'] - stats['charts']} slide, "
+              f"{stats['dpi']} dpi ({stats['image_bytes'] / 1e6:.1f} MB)")
     print(f"📊 Total Slides: {slide_count}")
     print(f"\n📋 Breakdown:")
     print(f"  • Main Forecasts: 2 slides")
@@ -232,14 +272,29 @@ def create_presentation():
     print(f"  • Top 10 Percentage: 11 slides (1 summary + 10 individual)")
     print("="*80)
 
-def main():
+def main(dpi=DEFAULT_DPI, max_mb=None, workers=RENDER_WORKERS, native=False, profile=CHART_PROFILE):
     """Main function"""
     try:
-        create_presentation()
+        create_presentation(dpi=dpi, max_mb=max_mb, workers=workers, native=native,
+                            profile=profile)
     except Exception as e:
         print(f"\n❌ Error: {e}")
         import traceback
         traceback.print_exc()
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Generate presentasi PowerPoint dari hasil forecast")
+    parser.add_argument('--dpi', type=int, default=DEFAULT_DPI,
+                        help=f"Resolusi gambar di slide, lebar 9 inch (default: {DEFAULT_DPI})")
+    parser.add_argument('--max-mb', type=float, default=None,
+                        help="Budget ukuran gambar presentasi (MB); dpi diturunkan sampai muat")
+    parser.add_argument('--workers', type=int, default=RENDER_WORKERS,
+                        help="Jumlah worker process render chart dan persiapan gambar (default: semua CPU)")
+    parser.add_argument('--profile', choices=list(RENDER_PROFILES), default=CHART_PROFILE,
+                        help=f"Profil chart kabupaten yang perlu dirender on-demand (default: {CHART_PROFILE}); "
+                             "chart yang masih up-to-date dipakai ulang apa pun profilnya")
+    parser.add_argument('--native-charts', action='store_true',
+                        help="Chart PowerPoint native dari data forecast, tanpa gambar PNG")
+    args = parser.parse_args()
+    main(dpi=args.dpi, max_mb=args.max_mb, workers=args.workers, native=args.native_charts,
+         profile=args.profile)